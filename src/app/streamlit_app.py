@@ -9,7 +9,7 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.models.prediction_utils import predict_match, load_trained_model
+from src.models.prediction_utils import get_predictor, predict_match, load_trained_model
 from src.config import CLEANED_DATA_FILE, FEATURE_IMPORTANCE_CSV
 
 st.set_page_config(page_title="EPL Match Outcome Predictor", layout="wide", initial_sidebar_state="expanded")
@@ -215,8 +215,32 @@ if predict_button:
         )
         st.plotly_chart(fig, use_container_width=True)
         
+        explanation = get_predictor().explain(home_team, away_team, datetime.combine(match_date, datetime.min.time()))
+        predicted = explanation["predicted_outcome"]
+        contributions = explanation["contributions"].drop(index="bias").head(10).reset_index(names="feature")
+        
+        st.subheader("Why this prediction")
+        fig = px.bar(
+            contributions,
+            x=predicted,
+            y="feature",
+            orientation="h",
+            labels={predicted: f"Contribution to {predicted} (log-odds)", "feature": "Feature"},
+            color=predicted,
+            color_continuous_scale="RdBu"
+        )
+        fig.update_layout(
+            height=400,
+            showlegend=False,
+            yaxis=dict(autorange="reversed", tickfont=dict(color="#e0e0e0")),
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+            font=dict(family="Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif", size=11, color="#e0e0e0")
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
     except FileNotFoundError as e:
-        if "xgboost_epl_match_outcome.pkl" in str(e):
+        if "Model file not found" in str(e):
             st.error("Model file not found")
             st.markdown("""
             <div style='background-color: #1a1a1a; padding: 1.5rem; border-radius: 8px; margin-top: 1rem;'>
@@ -21,10 +21,62 @@ CLEANED_DATA_FILE = INTERIM_DATA_DIR / "epl_matches_cleaned.csv"
 
 X_FEATURES_FILE = PROCESSED_DATA_DIR / "X_features.parquet"
 Y_TARGET_FILE = PROCESSED_DATA_DIR / "y_target.parquet"
+MATCH_KEYS_FILE = PROCESSED_DATA_DIR / "X_features.keys.parquet"
+X_FEATURES_WIDE_FILE = PROCESSED_DATA_DIR / "X_features_wide.parquet"
+FEATURE_STORE_FILE = PROCESSED_DATA_DIR / "feature_store_state.json"
 
 MODEL_FILE = MODELS_DIR / "xgboost_epl_match_outcome.pkl"
+MODEL_NATIVE_FILE = MODELS_DIR / "xgboost_epl_match_outcome.ubj"
+MODEL_METADATA_FILE = MODELS_DIR / "xgboost_epl_match_outcome.meta.json"
+MODEL_ARRAYS_FILE = MODELS_DIR / "xgboost_epl_match_outcome.npz"
+MODEL_KEYS_FILE = MODELS_DIR / "xgboost_epl_match_outcome.keys.parquet"
+PAIRWISE_PROBABILITIES_FILE = MODELS_DIR / "pairwise_probabilities.npy"
+PAIRWISE_INDEX_FILE = MODELS_DIR / "pairwise_probabilities.json"
+EXPLANATIONS_FILE = MODELS_DIR / "explanations.npz"
 FEATURE_IMPORTANCE_CSV = REPORTS_DIR / "feature_importances.csv"
 FEATURE_IMPORTANCE_PNG = REPORTS_DIR / "feature_importances.png"
+PERMUTATION_IMPORTANCE_CSV = REPORTS_DIR / "permutation_importances.csv"
+CONFUSION_MATRIX_PNG = REPORTS_DIR / "confusion_matrix.png"
+METRICS_JSON = REPORTS_DIR / "metrics.json"
+BACKTEST_METRICS_CSV = REPORTS_DIR / "backtest_metrics.csv"
+TUNING_TRIALS_CSV = REPORTS_DIR / "tuning_trials.csv"
+BEST_PARAMS_FILE = MODELS_DIR / "best_params.json"
+PIPELINE_STATE_FILE = DATA_DIR / "pipeline_state.json"
+
+SEASON_START_MONTH = 7
+
+PARQUET_ROW_GROUP_SIZE = 65536
+
+EXPLANATIONS_MAX_ROWS = 20000
+EXPLANATIONS_FLUSH_ROWS = 256
+
+INGEST_BLOCK_SIZE = 16 << 20
+
+# football-data.co.uk division code of the league the model is trained on
+LEAGUE = "E0"
 
 ROLLING_WINDOW = 5
+ROLLING_WINDOWS = [3, 5, 10, 20]
+EWM_HALFLIVES = [3, 10]
+
+ELO_INITIAL_RATING = 1500.0
+ELO_K_FACTOR = 20.0
+ELO_HOME_ADVANTAGE = 60.0
+
+REFRESH_ROUNDS = 20
+REFRESH_MAX_ROUNDS = 400
+REFRESH_DRIFT_THRESHOLD = 0.1
+REFRESH_MIN_DRIFT_MATCHES = 50
+REFRESH_MAX_NEW_FRACTION = 0.25
 
+XGB_PARAMS = {
+    "objective": "multi:softprob",
+    "num_class": 3,
+    "n_estimators": 200,
+    "learning_rate": 0.1,
+    "max_depth": 6,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "random_state": RANDOM_SEED,
+    "eval_metric": "mlogloss"
+}
@@ -1,48 +1,122 @@
 """Clean and standardize raw EPL match data from multiple sources."""
 
 import logging
+import tempfile
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional, Sequence, Tuple
 
 from src.config import (
-    RAW_DATA_FILE,
-    SCRAPED_BS4_FILE,
-    SCRAPED_SELENIUM_FILE,
     CLEANED_DATA_FILE,
-    INTERIM_DATA_DIR
+    INTERIM_DATA_DIR,
+    INGEST_BLOCK_SIZE,
+    LEAGUE
 )
+from src.data_preprocessing.ingest import COLUMN_MAPPING, SourceSpec, discover_source_files, iter_source_batches
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CLEANED_COLUMNS = ["match_date", "home_team", "away_team", "home_goals", "away_goals", "result"]
+MATCH_KEY = ["match_date", "home_team", "away_team"]
+CLEANED_DATE_FORMAT = "%Y-%m-%d"
+
 
 def standardize_column_names(df: pd.DataFrame, source: str) -> pd.DataFrame:
     """Standardize column names across different data sources."""
-    column_mapping = {
-        "date": "match_date",
-        "Date": "match_date",
-        "datetime": "match_date",
-        "home": "home_team",
-        "HomeTeam": "home_team",
-        "Home": "home_team",
-        "away": "away_team",
-        "AwayTeam": "away_team",
-        "Away": "away_team",
-        "FTHG": "home_goals",
-        "HG": "home_goals",
-        "home_score": "home_goals",
-        "FTAG": "away_goals",
-        "AG": "away_goals",
-        "away_score": "away_goals",
-        "FTR": "result",
-        "Result": "result",
-        "Res": "result"
-    }
-    
-    df = df.rename(columns=column_mapping)
+    df = df.rename(columns=COLUMN_MAPPING)
     return df
 
 
+def _spill_source(
+    index: int,
+    spec: SourceSpec,
+    path: Path,
+    spill_dir: Path,
+    block_size: int,
+    league: Optional[str],
+    use_threads: bool
+) -> int:
+    """Stream one raw file into per-year Parquet parts named by file and block order; returns its row count."""
+    n_rows = 0
+    for block, table in enumerate(iter_source_batches(spec, path, block_size, use_threads)):
+        if league is not None:
+            table = table.filter(pc.equal(table["league"], league))
+        years = pc.year(table["match_date"])
+        for year in pc.unique(years).to_pylist():
+            year_dir = spill_dir / str(year)
+            year_dir.mkdir(exist_ok=True)
+            pq.write_table(table.filter(pc.equal(years, year)), year_dir / f"{index:05d}-{block:06d}.parquet")
+        n_rows += table.num_rows
+    logger.debug(f"Read {n_rows} {spec.name} matches from {path}")
+    return n_rows
+
+
+def clean_raw_files(
+    files: Optional[Sequence[Tuple[SourceSpec, Path]]] = None,
+    output_file: Path = CLEANED_DATA_FILE,
+    block_size: int = INGEST_BLOCK_SIZE,
+    n_workers: Optional[int] = None,
+    league: Optional[str] = LEAGUE
+) -> int:
+    """
+    Clean every raw source into one date-sorted CSV with bounded memory.
+    
+    Raw files are streamed concurrently by a thread pool, one file per
+    thread and `block_size` bytes at a time, through the source registry
+    into MATCH_SCHEMA. A lone file is parsed with Arrow's multithreaded
+    reader instead. Only matches of `league` are kept, so other divisions
+    under football-data/ never reach the model, and the rows are spilled to
+    per-year Parquet parts. The years are then merged one at a time: parts
+    are read in file and block order, kick-off times are dropped, duplicates
+    of (match_date, home_team, away_team) keep their first occurrence, and
+    the year is sorted and appended to `output_file` with CLEANED_DATE_FORMAT,
+    so every year is written with the same date format. Peak memory is set by the block size and the
+    largest year, not the input size.
+    
+    Args:
+        files: (spec, path) pairs in priority order; defaults to every file discovered under RAW_DATA_DIR
+        output_file: Cleaned CSV to write
+        block_size: Bytes of raw CSV parsed per block
+        n_workers: Parser threads
+        league: Division code to keep; None keeps every league
+    
+    Returns:
+        Number of cleaned matches written
+    """
+    files = discover_source_files() if files is None else list(files)
+    if not files:
+        logger.warning("No raw data files found. Creating empty DataFrame.")
+        return 0
+    
+    with tempfile.TemporaryDirectory() as spill_dir:
+        spill_dir = Path(spill_dir)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            initial_rows = sum(executor.map(
+                lambda item: _spill_source(item[0], *item[1], spill_dir, block_size, league, len(files) == 1),
+                enumerate(files)
+            ))
+        
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        final_rows = 0
+        pd.DataFrame(columns=CLEANED_COLUMNS).to_csv(output_file, index=False)
+        for year_dir in sorted(spill_dir.iterdir(), key=lambda path: int(path.name)):
+            parts = [pq.read_table(part) for part in sorted(year_dir.glob("*.parquet"))]
+            df_year = pa.concat_tables(parts).select(CLEANED_COLUMNS).to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+            df_year["match_date"] = df_year["match_date"].dt.normalize()
+            df_year = df_year.drop_duplicates(subset=MATCH_KEY, keep="first").sort_values("match_date", kind="stable")
+            df_year.to_csv(output_file, mode="a", header=False, index=False, date_format=CLEANED_DATE_FORMAT)
+            final_rows += len(df_year)
+    
+    logger.info(f"Cleaned data from {len(files)} files: {initial_rows} -> {final_rows} rows")
+    logger.info(f"Saved cleaned data to {output_file}")
+    return final_rows
+
+
 def clean_raw_data() -> pd.DataFrame:
     """
     Load and clean raw data from all sources.
@@ -52,64 +126,14 @@ def clean_raw_data() -> pd.DataFrame:
     """
     INTERIM_DATA_DIR.mkdir(parents=True, exist_ok=True)
     
-    all_dataframes = []
-    
-    if RAW_DATA_FILE.exists():
-        logger.info(f"Loading public dataset from {RAW_DATA_FILE}")
-        df_public = pd.read_csv(RAW_DATA_FILE)
-        df_public = standardize_column_names(df_public, "public")
-        all_dataframes.append(df_public)
-    
-    if SCRAPED_BS4_FILE.exists():
-        logger.info(f"Loading BeautifulSoup scraped data from {SCRAPED_BS4_FILE}")
-        df_bs4 = pd.read_csv(SCRAPED_BS4_FILE)
-        df_bs4 = standardize_column_names(df_bs4, "bs4")
-        all_dataframes.append(df_bs4)
-    
-    if SCRAPED_SELENIUM_FILE.exists():
-        logger.info(f"Loading Selenium scraped data from {SCRAPED_SELENIUM_FILE}")
-        df_selenium = pd.read_csv(SCRAPED_SELENIUM_FILE)
-        df_selenium = standardize_column_names(df_selenium, "selenium")
-        all_dataframes.append(df_selenium)
-    
-    if not all_dataframes:
-        logger.warning("No raw data files found. Creating empty DataFrame.")
-        return pd.DataFrame(columns=["match_date", "home_team", "away_team", "home_goals", "away_goals", "result"])
-    
-    df_combined = pd.concat(all_dataframes, ignore_index=True)
-    
-    df_combined["match_date"] = pd.to_datetime(df_combined["match_date"], errors="coerce")
-    
-    df_combined["home_goals"] = pd.to_numeric(df_combined["home_goals"], errors="coerce")
-    df_combined["away_goals"] = pd.to_numeric(df_combined["away_goals"], errors="coerce")
-    
-    if "result" not in df_combined.columns or df_combined["result"].isna().all():
-        df_combined["result"] = df_combined.apply(
-            lambda row: "H" if row["home_goals"] > row["away_goals"]
-            else "A" if row["away_goals"] > row["home_goals"]
-            else "D" if pd.notna(row["home_goals"]) and pd.notna(row["away_goals"]) and row["home_goals"] == row["away_goals"]
-            else None,
-            axis=1
-        )
-    
-    initial_rows = len(df_combined)
-    
-    df_combined = df_combined.dropna(subset=["match_date", "home_team", "away_team"])
-    
-    df_combined = df_combined.drop_duplicates(subset=["match_date", "home_team", "away_team"], keep="first")
-    
-    df_combined = df_combined.sort_values("match_date").reset_index(drop=True)
-    
-    final_rows = len(df_combined)
-    logger.info(f"Cleaned data: {initial_rows} -> {final_rows} rows")
-    
-    df_combined.to_csv(CLEANED_DATA_FILE, index=False)
-    logger.info(f"Saved cleaned data to {CLEANED_DATA_FILE}")
+    if clean_raw_files() == 0:
+        return pd.DataFrame(columns=CLEANED_COLUMNS)
     
+    df_combined = pd.read_csv(CLEANED_DATA_FILE)
+    df_combined["match_date"] = pd.to_datetime(df_combined["match_date"], format="ISO8601")
     return df_combined
 
 
 if __name__ == "__main__":
     df = clean_raw_data()
     logger.info(f"Cleaned dataset contains {len(df)} matches")
-
@@ -1,11 +1,31 @@
 """Feature engineering for EPL match outcome prediction."""
 
 import logging
+import shutil
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from pathlib import Path
+from typing import List, Optional, Tuple
 
-from src.config import ROLLING_WINDOW, X_FEATURES_FILE, Y_TARGET_FILE, PROCESSED_DATA_DIR
+from src.config import (
+    CLEANED_DATA_FILE,
+    PARQUET_ROW_GROUP_SIZE,
+    ROLLING_WINDOW,
+    ROLLING_WINDOWS,
+    EWM_HALFLIVES,
+    X_FEATURES_FILE,
+    X_FEATURES_WIDE_FILE,
+    Y_TARGET_FILE,
+    PROCESSED_DATA_DIR
+)
+from src.data_preprocessing.form_engine import (
+    compute_form_features,
+    compute_multi_window_features,
+    encode_targets
+)
+from src.data_preprocessing.feature_store import match_keys, match_keys_path
+from src.data_preprocessing.parallel_features import compute_form_features_parallel
+from src.data_preprocessing.ratings import compute_rating_features
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -91,68 +111,48 @@ def calculate_rolling_stats(df: pd.DataFrame, team: str, is_home: bool, date: pd
     }
 
 
-def build_feature_matrix(clean_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+def build_feature_matrix(
+    clean_data: pd.DataFrame,
+    include_ratings: bool = False,
+    n_jobs: int = 1
+) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Build feature matrix and target vector from cleaned data.
     
+    Each row's match key is saved beside the matrix, so later steps can tell
+    matches apart by identity rather than row position.
+    
     Args:
         clean_data: DataFrame with columns match_date, home_team, away_team, home_goals, away_goals, result
+        include_ratings: Append pre-match Elo rating columns to the form features
+        n_jobs: Worker processes for season-partitioned building; 1 builds serially, -1 uses every core
     
     Returns:
         Tuple of (feature_matrix, target_vector)
     """
     PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
     
-    features_list = []
-    targets = []
-    
     df_sorted = clean_data.sort_values("match_date").reset_index(drop=True)
+    valid = df_sorted["result"].isin(["H", "D", "A"]).to_numpy()
     
-    for idx, row in df_sorted.iterrows():
-        if pd.isna(row["result"]) or row["result"] not in ["H", "D", "A"]:
-            continue
-        
-        match_date = row["match_date"]
-        home_team = row["home_team"]
-        away_team = row["away_team"]
-        
-        home_stats = calculate_rolling_stats(df_sorted, home_team, True, match_date)
-        away_stats = calculate_rolling_stats(df_sorted, away_team, False, match_date)
-        
-        feature_dict = {
-            "home_goals_scored_avg": home_stats["goals_scored"],
-            "home_goals_conceded_avg": home_stats["goals_conceded"],
-            "home_points_avg": home_stats["points"],
-            "home_home_goals_scored_avg": home_stats["home_goals_scored"],
-            "home_home_goals_conceded_avg": home_stats["home_goals_conceded"],
-            "home_home_points_avg": home_stats["home_points"],
-            "away_goals_scored_avg": away_stats["goals_scored"],
-            "away_goals_conceded_avg": away_stats["goals_conceded"],
-            "away_points_avg": away_stats["points"],
-            "away_away_goals_scored_avg": away_stats["away_goals_scored"],
-            "away_away_goals_conceded_avg": away_stats["away_goals_conceded"],
-            "away_away_points_avg": away_stats["away_points"],
-            "goals_scored_diff": home_stats["goals_scored"] - away_stats["goals_scored"],
-            "goals_conceded_diff": home_stats["goals_conceded"] - away_stats["goals_conceded"],
-            "points_diff": home_stats["points"] - away_stats["points"]
-        }
-        
-        features_list.append(feature_dict)
-        
-        if row["result"] == "H":
-            target = 2
-        elif row["result"] == "D":
-            target = 1
-        else:
-            target = 0
-        
-        targets.append(target)
+    if n_jobs == 1:
+        features = compute_form_features(df_sorted, ROLLING_WINDOW)
+    else:
+        features = compute_form_features_parallel(df_sorted, ROLLING_WINDOW, n_jobs)
+    if include_ratings:
+        features = pd.concat([features, compute_rating_features(df_sorted)], axis=1)
+    
+    X = features[valid].reset_index(drop=True)
+    y = encode_targets(df_sorted.loc[valid, "result"])
     
-    X = pd.DataFrame(features_list)
-    y = pd.Series(targets, name="result")
+    keys = pd.DataFrame({"match_key": match_keys(df_sorted[valid]).to_numpy()})
     
-    X.to_parquet(X_FEATURES_FILE, index=False)
-    y.to_frame().to_parquet(Y_TARGET_FILE, index=False)
+    for path in (X_FEATURES_FILE, Y_TARGET_FILE, match_keys_path(X_FEATURES_FILE)):
+        if path.is_dir():
+            shutil.rmtree(path)
+    X.to_parquet(X_FEATURES_FILE, index=False, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    y.to_frame().to_parquet(Y_TARGET_FILE, index=False, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    keys.to_parquet(match_keys_path(X_FEATURES_FILE), index=False, row_group_size=PARQUET_ROW_GROUP_SIZE)
     
     logger.info(f"Built feature matrix: {X.shape[0]} samples, {X.shape[1]} features")
     logger.info(f"Saved features to {X_FEATURES_FILE}")
@@ -161,6 +161,52 @@ def build_feature_matrix(clean_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Ser
     return X, y
 
 
+def build_feature_matrix_from_file(cleaned_file: Path = CLEANED_DATA_FILE) -> Tuple[pd.DataFrame, pd.Series]:
+    """Build and save the feature matrix from the cleaned matches CSV."""
+    df_clean = pd.read_csv(cleaned_file)
+    df_clean["match_date"] = pd.to_datetime(df_clean["match_date"])
+    return build_feature_matrix(df_clean)
+
+
+def build_wide_feature_matrix(
+    clean_data: pd.DataFrame,
+    windows: Optional[List[int]] = None,
+    halflives: Optional[List[float]] = None
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Build a feature matrix with several rolling windows and EWMA half-lives at once.
+    
+    Rows line up with build_feature_matrix, so the saved Y_TARGET_FILE applies
+    to both matrices.
+    
+    Args:
+        clean_data: DataFrame with columns match_date, home_team, away_team, home_goals, away_goals, result
+        windows: Rolling window lengths, in matches; defaults to ROLLING_WINDOWS
+        halflives: EWMA half-lives, in matches; defaults to EWM_HALFLIVES
+    
+    Returns:
+        Tuple of (feature_matrix, target_vector)
+    """
+    windows = list(windows) if windows is not None else list(ROLLING_WINDOWS)
+    halflives = list(halflives) if halflives is not None else list(EWM_HALFLIVES)
+    PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    
+    df_sorted = clean_data.sort_values("match_date").reset_index(drop=True)
+    valid = df_sorted["result"].isin(["H", "D", "A"]).to_numpy()
+    
+    features = compute_multi_window_features(df_sorted, windows, halflives)
+    
+    X = features[valid].reset_index(drop=True)
+    y = encode_targets(df_sorted.loc[valid, "result"])
+    
+    X.to_parquet(X_FEATURES_WIDE_FILE, index=False, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    
+    logger.info(f"Built wide feature matrix: {X.shape[0]} samples, {X.shape[1]} features")
+    logger.info(f"Saved features to {X_FEATURES_WIDE_FILE}")
+    
+    return X, y
+
+
 if __name__ == "__main__":
     from src.data_preprocessing.clean_raw_data import clean_raw_data
     
@@ -0,0 +1,385 @@
+"""Incremental feature store that appends new matches to the feature matrix."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import (
+    PARQUET_ROW_GROUP_SIZE,
+    ROLLING_WINDOW,
+    X_FEATURES_FILE,
+    Y_TARGET_FILE,
+    FEATURE_STORE_FILE,
+    PROCESSED_DATA_DIR
+)
+from src.data_preprocessing.form_engine import (
+    BASE_STATS,
+    STAT_NAMES,
+    build_team_long_table,
+    encode_targets,
+    match_feature_frame
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VALID_RESULTS = ["H", "D", "A"]
+MATCH_KEY_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class TeamFormState:
+    """
+    A team's recent matches, oldest first.
+
+    Holds the last `window` matches, plus the `window` matches before the
+    team's earliest pending fixture so that fixture can still be featurized
+    when its result arrives.
+    """
+
+    __slots__ = ("window", "recent")
+
+    def __init__(self, window: int = ROLLING_WINDOW):
+        self.window = window
+        self.recent: List[tuple] = []
+
+    def push(
+        self,
+        match_date: pd.Timestamp,
+        is_home: bool,
+        scored: float,
+        conceded: float,
+        points: float,
+        key: Optional[str] = None,
+        pending: bool = False
+    ):
+        """Record a match, keeping the stored matches in date order."""
+        record = (pd.Timestamp(match_date), bool(is_home), float(scored), float(conceded), float(points), key, bool(pending))
+        position = len(self.recent)
+        while position and self.recent[position - 1][0] > record[0]:
+            position -= 1
+        self.recent.insert(position, record)
+
+        first_pending = next((i for i, stored in enumerate(self.recent) if stored[6]), len(self.recent))
+        del self.recent[:max(0, first_pending - self.window)]
+
+    def discard(self, key: str):
+        """Drop the record of a match, such as a pending fixture whose result has arrived."""
+        self.recent = [record for record in self.recent if record[5] != key]
+
+    def stats(self, before: pd.Timestamp) -> Dict[str, float]:
+        """Rolling averages over the last `window` stored matches played strictly before `before`."""
+        sums = dict.fromkeys(STAT_NAMES, 0.0)
+        counts = {"": 0, "home_": 0, "away_": 0}
+
+        prior = [record for record in self.recent if record[0] < before][-self.window:]
+        for match_date, is_home, scored, conceded, points, _, _ in prior:
+            side = "home_" if is_home else "away_"
+            for prefix in ("", side):
+                sums[f"{prefix}goals_scored"] += scored
+                sums[f"{prefix}goals_conceded"] += conceded
+                sums[f"{prefix}points"] += points
+                counts[prefix] += 1
+
+        return {
+            f"{prefix}{stat}": sums[f"{prefix}{stat}"] / counts[prefix] if counts[prefix] else 0.0
+            for prefix in ("", "home_", "away_")
+            for stat in BASE_STATS
+        }
+
+
+class FeatureStore:
+    """
+    Per-team rolling state that lets new matches be featurized without
+    touching the rest of the history.
+
+    Fixtures without a result count in the rolling window as 0-point matches,
+    as they do in build_feature_matrix, and stay pending until their result
+    arrives. Only rows dated on or after the watermark can change the state,
+    so match keys are kept from the watermark on, not for the whole history.
+    """
+
+    def __init__(self, window: int = ROLLING_WINDOW):
+        self.window = window
+        self.teams: Dict[str, TeamFormState] = {}
+        self.last_match_date: Optional[pd.Timestamp] = None
+        self.seen: Set[str] = set()
+        self.pending: Dict[str, pd.Timestamp] = {}
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        """Earliest date a new batch can still add to: the last result or the oldest pending fixture."""
+        dates = list(self.pending.values())
+        if self.last_match_date is not None:
+            dates.append(self.last_match_date)
+        return min(dates) if dates else None
+
+    @classmethod
+    def from_history(cls, clean_data: pd.DataFrame, window: int = ROLLING_WINDOW) -> "FeatureStore":
+        """Seed the store with each team's recent matches from the full history."""
+        store = cls(window)
+        if clean_data.empty:
+            return store
+
+        df_sorted = clean_data.assign(match_date=pd.to_datetime(clean_data["match_date"]))
+        df_sorted = df_sorted.sort_values("match_date", kind="stable").reset_index(drop=True)
+        keys = match_keys(df_sorted).to_numpy()
+        finished = df_sorted["result"].isin(VALID_RESULTS).to_numpy()
+
+        long = build_team_long_table(df_sorted)
+        long["match_key"] = keys[long["match_idx"].to_numpy()]
+        long["pending"] = ~finished[long["match_idx"].to_numpy()]
+
+        for team, rows in long.groupby("team", sort=False):
+            pending_rows = np.flatnonzero(rows["pending"].to_numpy())
+            first_pending = pending_rows[0] if len(pending_rows) else len(rows)
+            state = TeamFormState(window)
+            for row in rows.iloc[max(0, first_pending - window):].itertuples(index=False):
+                state.push(row.match_date, row.is_home, row.goals_scored, row.goals_conceded, row.points, row.match_key, row.pending)
+            store.teams[team] = state
+
+        if finished.any():
+            store.last_match_date = pd.Timestamp(df_sorted.loc[finished, "match_date"].max())
+        store.pending = dict(zip(keys[~finished], df_sorted.loc[~finished, "match_date"]))
+        store.seen = set(keys[finished])
+        store._prune()
+        return store
+
+    def _team(self, team: str) -> TeamFormState:
+        if team not in self.teams:
+            self.teams[team] = TeamFormState(self.window)
+        return self.teams[team]
+
+    def _prune(self):
+        """Forget match keys dated before the watermark; later batches skip those rows."""
+        if self.watermark is not None:
+            cutoff = f"{self.watermark:{MATCH_KEY_DATE_FORMAT}}"
+            self.seen = {key for key in self.seen if key >= cutoff}
+
+    def update(self, new_matches: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Featurize a batch of new matches and fold them into the state.
+
+        Rows dated before the watermark are already covered and skipped, as
+        are matches already in the store by (match_date, home_team,
+        away_team), so the same cleaned file can be fed in repeatedly.
+        Fixtures without a result get no feature row but count in later
+        windows, as in a full rebuild. When a pending fixture's result
+        arrives, its placeholder is replaced and the match is featurized from
+        the stored matches before it.
+
+        Args:
+            new_matches: DataFrame with columns match_date, home_team, away_team, home_goals, away_goals, result
+
+        Returns:
+            Tuple of (feature_rows, targets) for the new matches with a valid result
+        """
+        X_new, y_new, _ = self._featurize(new_matches)
+        return X_new, y_new
+
+    def _featurize(self, new_matches: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
+        """`update`, also returning the match key of each feature row."""
+        batch = new_matches.assign(match_date=pd.to_datetime(new_matches["match_date"]))
+        if self.watermark is not None:
+            batch = batch[(batch["match_date"] >= self.watermark).to_numpy()]
+
+        keys = match_keys(batch)
+        finished = batch["result"].isin(VALID_RESULTS)
+        fresh = ~(keys.isin(self.seen) | keys.duplicated()) & (finished | ~keys.isin(list(self.pending)))
+        if not fresh.all():
+            logger.info(f"Skipping {int((~fresh).sum())} matches already in the feature store")
+        batch = (
+            batch[fresh.to_numpy()]
+            .assign(match_key=keys[fresh], finished=finished[fresh])
+            .sort_values("match_date", kind="stable")
+            .reset_index(drop=True)
+        )
+
+        long = build_team_long_table(batch)
+        match_idx = long["match_idx"].to_numpy()
+        long["match_key"] = batch["match_key"].to_numpy()[match_idx]
+        long["pending"] = ~batch["finished"].to_numpy(dtype=bool)[match_idx]
+        records_by_day = dict(tuple(long.groupby("match_date", sort=False)))
+
+        home_rows, away_rows, results, row_keys = [], [], [], []
+        for match_date, day in batch.groupby("match_date", sort=True):
+            for row in day[day["finished"]].itertuples(index=False):
+                home_rows.append(self._team(row.home_team).stats(match_date))
+                away_rows.append(self._team(row.away_team).stats(match_date))
+                results.append(row.result)
+                row_keys.append(row.match_key)
+
+            for record in records_by_day[match_date].itertuples(index=False):
+                state = self._team(record.team)
+                if record.match_key in self.pending:
+                    state.discard(record.match_key)
+                state.push(
+                    record.match_date, record.is_home, record.goals_scored, record.goals_conceded, record.points,
+                    record.match_key, record.pending
+                )
+            for key in day.loc[day["finished"], "match_key"]:
+                self.pending.pop(key, None)
+
+        played = batch[batch["finished"]]
+        unplayed = batch[~batch["finished"]]
+        self.seen.update(played["match_key"])
+        self.pending.update(zip(unplayed["match_key"], unplayed["match_date"]))
+        if len(played):
+            batch_last = pd.Timestamp(played["match_date"].max())
+            self.last_match_date = batch_last if self.last_match_date is None else max(self.last_match_date, batch_last)
+        self._prune()
+
+        home_stats = {stat: np.array([s[stat] for s in home_rows], dtype=float) for stat in STAT_NAMES}
+        away_stats = {stat: np.array([s[stat] for s in away_rows], dtype=float) for stat in STAT_NAMES}
+        X_new = match_feature_frame(home_stats, away_stats)
+        y_new = encode_targets(pd.Series(results, dtype=object))
+
+        return X_new, y_new, row_keys
+
+    def append(
+        self,
+        new_matches: pd.DataFrame,
+        x_path: Path = X_FEATURES_FILE,
+        y_path: Path = Y_TARGET_FILE,
+        state_path: Path = FEATURE_STORE_FILE
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Featurize new matches, append them to the parquet outputs and persist the state.
+
+        The rows' match keys are appended to the keys file beside `x_path`
+        when the matrix has one, keeping it aligned row for row.
+        """
+        X_new, y_new, row_keys = self._featurize(new_matches)
+
+        if len(X_new):
+            append_parquet(X_new, x_path)
+            append_parquet(y_new.to_frame(), y_path)
+            if match_keys_path(x_path).exists():
+                append_parquet(pd.DataFrame({"match_key": row_keys}), match_keys_path(x_path))
+        self.save(state_path)
+
+        logger.info(f"Appended {len(X_new)} feature rows to {x_path}")
+        return X_new, y_new
+
+    def save(self, path: Path = FEATURE_STORE_FILE):
+        """Persist the per-team state, pending fixtures and match keys from the watermark on as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "window": self.window,
+            "last_match_date": self.last_match_date.isoformat() if self.last_match_date is not None else None,
+            "matches": sorted(self.seen),
+            "pending": {key: match_date.isoformat() for key, match_date in self.pending.items()},
+            "teams": {
+                team: [[record[0].isoformat(), *record[1:]] for record in state.recent]
+                for team, state in self.teams.items()
+            }
+        }
+        path.write_text(json.dumps(payload))
+
+    @classmethod
+    def load(cls, path: Path = FEATURE_STORE_FILE) -> "FeatureStore":
+        """Load a store previously written by `save`."""
+        payload = json.loads(path.read_text())
+        store = cls(payload["window"])
+        if payload["last_match_date"] is not None:
+            store.last_match_date = pd.Timestamp(payload["last_match_date"])
+        store.seen = set(payload["matches"])
+        store.pending = {key: pd.Timestamp(match_date) for key, match_date in payload.get("pending", {}).items()}
+        for team, records in payload["teams"].items():
+            state = TeamFormState(store.window)
+            for record in records:
+                state.push(*record)
+            store.teams[team] = state
+        return store
+
+
+def match_keys(matches: pd.DataFrame) -> pd.Series:
+    """One "date|home|away" string per match, identifying it across refreshes."""
+    dates = pd.to_datetime(matches["match_date"]).dt.strftime(MATCH_KEY_DATE_FORMAT)
+    return dates + "|" + matches["home_team"].astype(str) + "|" + matches["away_team"].astype(str)
+
+
+def match_keys_path(x_path: Path) -> Path:
+    """The file beside a feature matrix holding each row's match key: its name with a .keys.parquet suffix."""
+    return x_path.with_suffix(".keys.parquet")
+
+
+def read_match_keys(x_path: Path, n_rows: Optional[int] = None) -> Optional[pd.Series]:
+    """
+    The match key of each row of a feature matrix.
+
+    None when the matrix has no keys file, or when the keys do not line up
+    with its `n_rows` rows.
+    """
+    path = match_keys_path(x_path)
+    if not path.exists():
+        return None
+    keys = pd.read_parquet(path)["match_key"]
+    if n_rows is not None and len(keys) != n_rows:
+        logger.warning(f"Ignoring {len(keys)} match keys for a feature matrix of {n_rows} rows")
+        return None
+    return keys
+
+
+def parquet_parts(path: Path) -> List[Path]:
+    """Files of a Parquet output in row order: the file itself, or a directory's part files."""
+    return sorted(path.glob("part-*.parquet")) if path.is_dir() else [path]
+
+
+def append_parquet(frame: pd.DataFrame, path: Path):
+    """
+    Append rows as a new part file, so the cost depends on the batch, not the history.
+
+    A single-file output is first moved into a directory of the same name as
+    its first part; pandas and pyarrow read the directory as one table.
+    """
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if path.is_file():
+        staging = path.with_name(path.name + ".tmp")
+        staging.mkdir()
+        path.rename(staging / "part-00000.parquet")
+        staging.rename(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    parts = parquet_parts(path)
+    if parts:
+        table = table.cast(pq.read_schema(parts[0]))
+    part_file = path / f"part-{len(parts):05d}.parquet"
+    pq.write_table(table, part_file.with_suffix(".tmp"), row_group_size=PARQUET_ROW_GROUP_SIZE)
+    part_file.with_suffix(".tmp").rename(part_file)
+
+
+def refresh_feature_store(clean_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Bring the feature matrix up to date with the cleaned data.
+
+    The first run builds the full matrix and seeds the store; later runs only
+    hand the store rows dated on or after its watermark, so their cost grows
+    with the new batch rather than the history.
+    """
+    if FEATURE_STORE_FILE.exists() and X_FEATURES_FILE.exists() and Y_TARGET_FILE.exists():
+        store = FeatureStore.load(FEATURE_STORE_FILE)
+        if store.watermark is not None:
+            clean_data = clean_data[(pd.to_datetime(clean_data["match_date"]) >= store.watermark).to_numpy()]
+        return store.append(clean_data, X_FEATURES_FILE, Y_TARGET_FILE, FEATURE_STORE_FILE)
+
+    from src.data_preprocessing.feature_engineering import build_feature_matrix
+
+    PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    X, y = build_feature_matrix(clean_data)
+    FeatureStore.from_history(clean_data).save(FEATURE_STORE_FILE)
+    return X, y
+
+
+if __name__ == "__main__":
+    from src.config import CLEANED_DATA_FILE
+
+    df_clean = pd.read_csv(CLEANED_DATA_FILE)
+    df_clean["match_date"] = pd.to_datetime(df_clean["match_date"])
+    X_new, y_new = refresh_feature_store(df_clean)
+    logger.info(f"Feature store refresh complete: {len(X_new)} new samples")
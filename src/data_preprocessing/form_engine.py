@@ -0,0 +1,348 @@
+"""Vectorized rolling-form engine for EPL team statistics."""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from src.config import ROLLING_WINDOW
+
+FEATURE_COLUMNS = [
+    "home_goals_scored_avg",
+    "home_goals_conceded_avg",
+    "home_points_avg",
+    "home_home_goals_scored_avg",
+    "home_home_goals_conceded_avg",
+    "home_home_points_avg",
+    "away_goals_scored_avg",
+    "away_goals_conceded_avg",
+    "away_points_avg",
+    "away_away_goals_scored_avg",
+    "away_away_goals_conceded_avg",
+    "away_away_points_avg",
+    "goals_scored_diff",
+    "goals_conceded_diff",
+    "points_diff"
+]
+
+BASE_STATS = ["goals_scored", "goals_conceded", "points"]
+
+STAT_NAMES = (
+    BASE_STATS
+    + [f"home_{stat}" for stat in BASE_STATS]
+    + [f"away_{stat}" for stat in BASE_STATS]
+)
+
+TARGET_MAP = {"A": 0, "D": 1, "H": 2}
+
+
+def build_team_long_table(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reshape matches into one row per team per match.
+
+    Args:
+        matches: DataFrame with columns match_date, home_team, away_team, home_goals, away_goals, result
+
+    Returns:
+        DataFrame sorted by team and match date (original row order breaks ties) with columns
+        team, team_code, match_date, match_idx, is_home, goals_scored, goals_conceded, points
+    """
+    n_matches = len(matches)
+
+    home_goals = pd.to_numeric(matches["home_goals"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    away_goals = pd.to_numeric(matches["away_goals"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    result = matches["result"].to_numpy(dtype=object)
+
+    home_points = np.select([result == "H", result == "D"], [3.0, 1.0], 0.0)
+    away_points = np.select([result == "A", result == "D"], [3.0, 1.0], 0.0)
+
+    teams = np.concatenate([
+        matches["home_team"].to_numpy(dtype=object),
+        matches["away_team"].to_numpy(dtype=object)
+    ])
+    team_codes, _ = pd.factorize(teams)
+    dates = np.tile(pd.to_datetime(matches["match_date"]).to_numpy(dtype="datetime64[ns]"), 2)
+    match_idx = np.tile(np.arange(n_matches), 2)
+
+    order = np.lexsort((match_idx, dates, team_codes))
+
+    long = pd.DataFrame({
+        "team": teams[order],
+        "team_code": team_codes[order],
+        "match_date": dates[order],
+        "match_idx": match_idx[order],
+        "is_home": np.repeat([True, False], n_matches)[order],
+        "goals_scored": np.concatenate([home_goals, away_goals])[order],
+        "goals_conceded": np.concatenate([away_goals, home_goals])[order],
+        "points": np.concatenate([home_points, away_points])[order]
+    })
+
+    return long
+
+
+def prefix_sums(long: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Cumulative sums of every per-team statistic over the long table.
+
+    Each array has len(long) + 1 entries, so the sum over rows [start, end)
+    is prefix[end] - prefix[start].
+    """
+    is_home = long["is_home"].to_numpy(dtype=bool)
+
+    values = {
+        "count": np.ones(len(long)),
+        "home_count": is_home.astype(float),
+        "away_count": (~is_home).astype(float)
+    }
+    for stat in BASE_STATS:
+        stat_values = long[stat].to_numpy(dtype=float)
+        values[stat] = stat_values
+        values[f"home_{stat}"] = np.where(is_home, stat_values, 0.0)
+        values[f"away_{stat}"] = np.where(is_home, 0.0, stat_values)
+
+    return {key: np.concatenate(([0.0], np.cumsum(arr))) for key, arr in values.items()}
+
+
+def window_means(prefix: Dict[str, np.ndarray], start: np.ndarray, end: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Average every statistic over the long-table rows [start, end).
+
+    Home-only and away-only averages are taken over the home and away matches
+    inside the same window; empty windows give 0.0.
+    """
+    stats = {}
+    for stat in STAT_NAMES:
+        if stat.startswith("home_"):
+            count_key = "home_count"
+        elif stat.startswith("away_"):
+            count_key = "away_count"
+        else:
+            count_key = "count"
+
+        count = prefix[count_key][end] - prefix[count_key][start]
+        total = prefix[stat][end] - prefix[stat][start]
+        stats[stat] = np.divide(total, count, out=np.zeros(len(total)), where=count > 0)
+
+    return stats
+
+
+def team_and_day_starts(long: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For every long-table row, the position of the team's first row and of the
+    team's first row on the same match date.
+    """
+    n_rows = len(long)
+    positions = np.arange(n_rows)
+    if n_rows == 0:
+        return positions, positions
+
+    codes = long["team_code"].to_numpy()
+    dates = long["match_date"].to_numpy()
+
+    new_team = np.ones(n_rows, dtype=bool)
+    new_team[1:] = codes[1:] != codes[:-1]
+    new_day = new_team.copy()
+    new_day[1:] |= dates[1:] != dates[:-1]
+
+    team_start = np.maximum.accumulate(np.where(new_team, positions, 0))
+    day_start = np.maximum.accumulate(np.where(new_day, positions, 0))
+    return team_start, day_start
+
+
+def prior_window_bounds(long: pd.DataFrame, window: int = ROLLING_WINDOW) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bounds of each row's pre-match window in the long table.
+
+    The window holds the team's last `window` matches played strictly before
+    the row's match date.
+    """
+    team_start, end = team_and_day_starts(long)
+    start = np.maximum(team_start, end - window)
+    return start, end
+
+
+def ewm_prior_means(long: pd.DataFrame, team_start: np.ndarray, end: np.ndarray, halflife: float) -> Dict[str, np.ndarray]:
+    """
+    Exponentially weighted averages of the base statistics over each row's
+    prior matches, with weights halving every `halflife` matches.
+    """
+    smoothed = (
+        long.groupby("team_code", sort=False)[BASE_STATS]
+        .ewm(halflife=halflife)
+        .mean()
+        .reset_index(level=0, drop=True)
+        .sort_index()
+    )
+
+    has_prior = end > team_start
+    previous = np.maximum(end - 1, 0)
+    return {
+        stat: np.where(has_prior, smoothed[stat].to_numpy()[previous], 0.0) if len(long) else np.zeros(0)
+        for stat in BASE_STATS
+    }
+
+
+def match_rows(long: pd.DataFrame, n_matches: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Long-table positions of each match's home-side and away-side rows."""
+    is_home = long["is_home"].to_numpy(dtype=bool)
+    match_idx = long["match_idx"].to_numpy()
+    home_rows = np.empty(n_matches, dtype=np.int64)
+    away_rows = np.empty(n_matches, dtype=np.int64)
+    home_rows[match_idx[is_home]] = np.flatnonzero(is_home)
+    away_rows[match_idx[~is_home]] = np.flatnonzero(~is_home)
+    return home_rows, away_rows
+
+
+def match_feature_frame(home_stats: Dict, away_stats: Dict) -> pd.DataFrame:
+    """Assemble the model feature columns from home- and away-side statistics."""
+    home = {key: np.atleast_1d(value) for key, value in home_stats.items()}
+    away = {key: np.atleast_1d(value) for key, value in away_stats.items()}
+
+    return pd.DataFrame({
+        "home_goals_scored_avg": home["goals_scored"],
+        "home_goals_conceded_avg": home["goals_conceded"],
+        "home_points_avg": home["points"],
+        "home_home_goals_scored_avg": home["home_goals_scored"],
+        "home_home_goals_conceded_avg": home["home_goals_conceded"],
+        "home_home_points_avg": home["home_points"],
+        "away_goals_scored_avg": away["goals_scored"],
+        "away_goals_conceded_avg": away["goals_conceded"],
+        "away_points_avg": away["points"],
+        "away_away_goals_scored_avg": away["away_goals_scored"],
+        "away_away_goals_conceded_avg": away["away_goals_conceded"],
+        "away_away_points_avg": away["away_points"],
+        "goals_scored_diff": home["goals_scored"] - away["goals_scored"],
+        "goals_conceded_diff": home["goals_conceded"] - away["goals_conceded"],
+        "points_diff": home["points"] - away["points"]
+    }, columns=FEATURE_COLUMNS)
+
+
+def compute_form_features(matches: pd.DataFrame, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Compute pre-match rolling form features for every match in one grouped pass.
+
+    Args:
+        matches: Chronologically sorted match DataFrame
+        window: Number of previous matches to average over
+
+    Returns:
+        DataFrame of FEATURE_COLUMNS with one row per match, in the order of `matches`
+    """
+    long = build_team_long_table(matches)
+    prefix = prefix_sums(long)
+    start, end = prior_window_bounds(long, window)
+    stats = window_means(prefix, start, end)
+
+    home_rows, away_rows = match_rows(long, len(matches))
+    home_stats = {stat: values[home_rows] for stat, values in stats.items()}
+    away_stats = {stat: values[away_rows] for stat, values in stats.items()}
+
+    return match_feature_frame(home_stats, away_stats)
+
+
+def form_stats_as_of(
+    history: pd.DataFrame,
+    teams: pd.Series,
+    as_of_dates: pd.Series,
+    window: int = ROLLING_WINDOW
+) -> Dict[str, np.ndarray]:
+    """
+    Rolling statistics for many (team, date) queries with one as-of join.
+
+    Each query sees only the team's matches played strictly before its date,
+    so results on or after the date never leak in. Teams without history get 0.0.
+
+    Args:
+        history: Finished matches with columns match_date, home_team, away_team, home_goals, away_goals, result
+        teams: Team name per query
+        as_of_dates: Date per query
+
+    Returns:
+        Dictionary of STAT_NAMES arrays aligned with the queries
+    """
+    df_sorted = history.sort_values("match_date").reset_index(drop=True)
+    long = build_team_long_table(df_sorted)
+    prefix = prefix_sums(long)
+    team_start, _ = team_and_day_starts(long)
+
+    queries = pd.DataFrame({
+        "team": teams.to_numpy(dtype=object),
+        "match_date": pd.to_datetime(as_of_dates).to_numpy(dtype="datetime64[ns]"),
+        "query": np.arange(len(teams))
+    }).sort_values("match_date", kind="stable")
+    rows = pd.DataFrame({
+        "team": long["team"].to_numpy(dtype=object),
+        "match_date": long["match_date"].to_numpy(dtype="datetime64[ns]"),
+        "row": np.arange(len(long))
+    }).sort_values("match_date", kind="stable")
+
+    joined = pd.merge_asof(
+        queries,
+        rows,
+        on="match_date",
+        by="team",
+        direction="backward",
+        allow_exact_matches=False
+    ).sort_values("query")
+
+    last_row = joined["row"].to_numpy()
+    found = ~np.isnan(last_row)
+    last_row = np.where(found, last_row, 0).astype(np.int64)
+
+    end = np.where(found, last_row + 1, 0)
+    start = np.where(found, np.maximum(team_start[last_row] if len(long) else 0, end - window), 0)
+
+    return window_means(prefix, start, end)
+
+
+def compute_multi_window_features(
+    matches: pd.DataFrame,
+    windows: List[int],
+    halflives: List[float]
+) -> pd.DataFrame:
+    """
+    Compute rolling form features for several windows plus EWMA form in one pass.
+
+    All windows share one long table and one set of prefix sums; each window
+    only changes where its slice starts. Columns are named
+    `<feature>_w<window>` for every FEATURE_COLUMNS entry, and
+    `home_<stat>_ewm_h<halflife>`, `away_<stat>_ewm_h<halflife>` and
+    `<stat>_diff_ewm_h<halflife>` for goals_scored, goals_conceded and points.
+
+    Args:
+        matches: Chronologically sorted match DataFrame
+        windows: Rolling window lengths, in matches
+        halflives: EWMA half-lives, in matches
+
+    Returns:
+        DataFrame with one row per match, in the order of `matches`
+    """
+    long = build_team_long_table(matches)
+    prefix = prefix_sums(long)
+    team_start, end = team_and_day_starts(long)
+    home_rows, away_rows = match_rows(long, len(matches))
+
+    frames = []
+    for window in windows:
+        stats = window_means(prefix, np.maximum(team_start, end - window), end)
+        frame = match_feature_frame(
+            {stat: values[home_rows] for stat, values in stats.items()},
+            {stat: values[away_rows] for stat, values in stats.items()}
+        )
+        frames.append(frame.add_suffix(f"_w{window}"))
+
+    for halflife in halflives:
+        stats = ewm_prior_means(long, team_start, end, halflife)
+        columns = {}
+        for stat in BASE_STATS:
+            home, away = stats[stat][home_rows], stats[stat][away_rows]
+            columns[f"home_{stat}_ewm_h{halflife}"] = home
+            columns[f"away_{stat}_ewm_h{halflife}"] = away
+            columns[f"{stat}_diff_ewm_h{halflife}"] = home - away
+        frames.append(pd.DataFrame(columns))
+
+    return pd.concat(frames, axis=1)
+
+
+def encode_targets(results: pd.Series) -> pd.Series:
+    """Map H/D/A results to the model's integer classes."""
+    return pd.Series(results.map(TARGET_MAP).to_numpy(dtype=np.int64), name="result")
@@ -0,0 +1,134 @@
+"""In-memory per-team form index for fast point-in-time feature lookups."""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence
+
+from src.config import ROLLING_WINDOW
+from src.data_preprocessing.form_engine import BASE_STATS, STAT_NAMES, build_team_long_table
+
+COUNT_KEYS = ["count", "home_count", "away_count"]
+CUMULATIVE_KEYS = COUNT_KEYS + STAT_NAMES
+
+EMPTY_STATS = dict.fromkeys(STAT_NAMES, 0.0)
+
+
+class TeamFormRecord:
+    """A team's sorted match dates and running totals of every statistic."""
+
+    __slots__ = ("dates", "cumulative")
+
+    def __init__(self, dates: np.ndarray, cumulative: np.ndarray):
+        self.dates = dates
+        self.cumulative = cumulative
+
+    def stats(self, as_of: np.datetime64, window: int) -> Dict[str, float]:
+        """Rolling averages over the last `window` matches played strictly before `as_of`."""
+        n_matches = len(self.dates)
+        if n_matches and as_of > self.dates[-1]:
+            end = n_matches
+        else:
+            end = int(np.searchsorted(self.dates, as_of, side="left"))
+        if end == 0:
+            return dict(EMPTY_STATS)
+
+        totals = self.cumulative[end] - self.cumulative[max(0, end - window)]
+        result = {}
+        for offset, prefix in enumerate(("", "home_", "away_")):
+            count = totals[offset]
+            for i, stat in enumerate(BASE_STATS):
+                value = totals[3 + 3 * offset + i]
+                result[f"{prefix}{stat}"] = float(value / count) if count else 0.0
+        return result
+
+
+class FormIndex:
+    """
+    One compact record per team, built once from the cleaned history.
+
+    Lookups for any date after the last stored match are O(1); earlier dates
+    binary-search the team's match dates.
+    """
+
+    def __init__(self, historical_data: pd.DataFrame, window: int = ROLLING_WINDOW):
+        self.window = window
+        self.records: Dict[str, TeamFormRecord] = {}
+
+        if historical_data.empty:
+            return
+
+        df_sorted = historical_data.sort_values("match_date").reset_index(drop=True)
+        long = build_team_long_table(df_sorted)
+
+        is_home = long["is_home"].to_numpy(dtype=bool)
+        columns = [np.ones(len(long)), is_home.astype(float), (~is_home).astype(float)]
+        for side in ("", "home_", "away_"):
+            mask = np.ones(len(long), dtype=bool) if side == "" else (is_home if side == "home_" else ~is_home)
+            for stat in BASE_STATS:
+                columns.append(np.where(mask, long[stat].to_numpy(dtype=float), 0.0))
+        values = np.column_stack(columns)
+
+        dates = long["match_date"].to_numpy()
+        codes = long["team_code"].to_numpy()
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(long)]))
+
+        for start, end in zip(starts, ends):
+            cumulative = np.vstack([np.zeros(values.shape[1]), np.cumsum(values[start:end], axis=0)])
+            self.records[long["team"].iat[start]] = TeamFormRecord(dates[start:end].copy(), cumulative)
+
+    @property
+    def teams(self) -> List[str]:
+        return sorted(self.records)
+
+    def team_stats(self, team: str, as_of) -> Dict[str, float]:
+        """
+        Rolling statistics for a team as of a date.
+
+        Args:
+            team: Team name
+            as_of: Only matches played strictly before this date are used
+
+        Returns:
+            Dictionary with the same keys as calculate_rolling_stats
+        """
+        record = self.records.get(team)
+        if record is None:
+            return dict(EMPTY_STATS)
+        return record.stats(np.datetime64(pd.Timestamp(as_of), "ns"), self.window)
+
+    def stats_as_of(self, teams: Sequence[str], as_of: Sequence) -> Dict[str, np.ndarray]:
+        """
+        Rolling statistics for many (team, date) queries, one binary search per team.
+
+        Args:
+            teams: Team name per query
+            as_of: Date per query; only matches played strictly before it are used
+
+        Returns:
+            Dictionary of STAT_NAMES arrays aligned with the queries
+        """
+        dates = pd.to_datetime(pd.Series(as_of)).to_numpy(dtype="datetime64[ns]")
+        codes, unique_teams = pd.factorize(pd.Series(teams, dtype=object))
+        totals = np.zeros((len(codes), len(CUMULATIVE_KEYS)))
+
+        for code, rows in pd.Series(np.arange(len(codes))).groupby(codes).indices.items():
+            record = self.records.get(unique_teams[code]) if code >= 0 else None
+            if record is None:
+                continue
+            end = np.searchsorted(record.dates, dates[rows], side="left")
+            totals[rows] = record.cumulative[end] - record.cumulative[np.maximum(end - self.window, 0)]
+
+        result = {}
+        for offset, prefix in enumerate(("", "home_", "away_")):
+            count = totals[:, offset]
+            for i, stat in enumerate(BASE_STATS):
+                value = totals[:, 3 + 3 * offset + i]
+                result[f"{prefix}{stat}"] = np.divide(value, count, out=np.zeros(len(count)), where=count > 0)
+        return result
+
+
+def build_form_index(historical_data: pd.DataFrame, window: int = ROLLING_WINDOW) -> FormIndex:
+    """Build a FormIndex from cleaned match data."""
+    return FormIndex(historical_data, window)
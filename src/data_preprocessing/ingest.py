@@ -0,0 +1,327 @@
+"""Concurrent ingestion of raw match files into one typed Arrow schema."""
+
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from src.config import INGEST_BLOCK_SIZE, LEAGUE, RAW_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+MATCH_SCHEMA = pa.schema([
+    ("match_date", pa.timestamp("ns")),
+    ("home_team", pa.string()),
+    ("away_team", pa.string()),
+    ("home_goals", pa.int64()),
+    ("away_goals", pa.int64()),
+    ("result", pa.string()),
+    ("league", pa.string()),
+    ("source", pa.string())
+])
+
+COLUMN_MAPPING = {
+    "date": "match_date",
+    "Date": "match_date",
+    "datetime": "match_date",
+    "home": "home_team",
+    "HomeTeam": "home_team",
+    "Home": "home_team",
+    "away": "away_team",
+    "AwayTeam": "away_team",
+    "Away": "away_team",
+    "FTHG": "home_goals",
+    "HG": "home_goals",
+    "home_score": "home_goals",
+    "FTAG": "away_goals",
+    "AG": "away_goals",
+    "away_score": "away_goals",
+    "FTR": "result",
+    "Result": "result",
+    "Res": "result"
+}
+
+ISO_DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]
+# Two-digit years first: "%Y" would read "01/08/20" as the year 20
+DAY_FIRST_DATE_FORMATS = ["%d/%m/%y", "%d/%m/%Y"]
+# Non-negative decimals, so pandas' "2.0" scores parse; "1.5" is later rejected as non-integral
+GOALS_PATTERN = r"^\s*(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?\s*$"
+
+
+def _candidates(mapping: Dict[str, str]) -> Dict[str, List[str]]:
+    """Standard column -> raw names that map to it, the standard name itself first."""
+    candidates = {name: [name] for name in ("match_date", "home_team", "away_team", "home_goals", "away_goals", "result")}
+    for raw, standard in mapping.items():
+        candidates[standard].append(raw)
+    return candidates
+
+
+class SourceSpec:
+    """
+    How to find and read one kind of raw file.
+
+    `pattern` is a glob relative to the raw data directory; a file is read
+    with the first spec in the registry that matches it. `columns` maps each
+    standard column to the raw names it may appear under, and the first
+    non-null among them wins. The league comes from `league_column` when the
+    file has one, otherwise from `league`.
+    """
+
+    __slots__ = ("name", "pattern", "columns", "date_formats", "league", "league_column")
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        columns: Dict[str, Sequence[str]],
+        date_formats: Sequence[str],
+        league: Optional[str] = None,
+        league_column: Optional[str] = None
+    ):
+        self.name = name
+        self.pattern = pattern
+        self.columns = {standard: list(raw) for standard, raw in columns.items()}
+        self.date_formats = list(date_formats)
+        self.league = league
+        self.league_column = league_column
+
+    @property
+    def raw_columns(self) -> List[str]:
+        names = [raw for raw_names in self.columns.values() for raw in raw_names]
+        if self.league_column:
+            names.append(self.league_column)
+        return list(dict.fromkeys(names))
+
+
+FOOTBALL_DATA_COLUMNS = {
+    "match_date": ["Date"],
+    "home_team": ["HomeTeam", "Home"],
+    "away_team": ["AwayTeam", "Away"],
+    "home_goals": ["FTHG", "HG"],
+    "away_goals": ["FTAG", "AG"],
+    "result": ["FTR", "Res"]
+}
+
+SOURCE_REGISTRY = [
+    SourceSpec("public", "epl_matches_raw.csv", _candidates(COLUMN_MAPPING), DAY_FIRST_DATE_FORMATS + ISO_DATE_FORMATS, league=LEAGUE),
+    SourceSpec("football_data", "football-data/**/*.csv", FOOTBALL_DATA_COLUMNS, DAY_FIRST_DATE_FORMATS, league_column="Div"),
+    SourceSpec("scraped_bs4", "scraped_matches_bs4.csv", _candidates({}), ISO_DATE_FORMATS, league=LEAGUE),
+    SourceSpec("scraped_selenium", "scraped_matches_selenium.csv", _candidates({}), ISO_DATE_FORMATS, league=LEAGUE),
+    SourceSpec("other", "**/*.csv", _candidates(COLUMN_MAPPING), DAY_FIRST_DATE_FORMATS + ISO_DATE_FORMATS, league=LEAGUE, league_column="Div")
+]
+
+
+def discover_source_files(
+    raw_dir: Path = RAW_DATA_DIR,
+    registry: Optional[Sequence[SourceSpec]] = None
+) -> List[Tuple[SourceSpec, Path]]:
+    """Raw files paired with the first spec matching them, in registry then path order; SOURCE_REGISTRY by default."""
+    registry = registry if registry is not None else SOURCE_REGISTRY
+    claimed = set()
+    files = []
+    for spec in registry:
+        for path in sorted(Path(raw_dir).glob(spec.pattern)):
+            if path.is_file() and path not in claimed:
+                claimed.add(path)
+                files.append((spec, path))
+    return files
+
+
+def _parse_dates(values: pa.Array, formats: Sequence[str]) -> pa.Array:
+    parsed = [pc.strptime(values, format=date_format, unit="s", error_is_null=True) for date_format in formats]
+    return pc.coalesce(*parsed).cast(pa.timestamp("ns")) if parsed else pa.nulls(len(values), pa.timestamp("ns"))
+
+
+def _parse_goals(values: pa.Array) -> pa.Array:
+    """Whole-number scores as int64, accepting "2" and "2.0"; anything else is null."""
+    is_number = pc.fill_null(pc.match_substring_regex(values, GOALS_PATTERN), False)
+    numbers = pc.cast(pc.if_else(is_number, pc.utf8_trim_whitespace(values), "0"), pa.float64(), safe=False)
+    is_integral = pc.and_(is_number, pc.and_(pc.equal(pc.floor(numbers), numbers), pc.less_equal(numbers, 2.0 ** 53)))
+    return pc.if_else(is_integral, pc.cast(pc.if_else(is_integral, numbers, 0.0), pa.int64()), pa.scalar(None, pa.int64()))
+
+
+def derive_results(home_goals: pa.Array, away_goals: pa.Array) -> pa.Array:
+    """Full-time result codes from the scores; null where either score is missing."""
+    return pc.if_else(
+        pc.greater(home_goals, away_goals),
+        "H",
+        pc.if_else(pc.less(home_goals, away_goals), "A", "D")
+    )
+
+
+def standardize_table(spec: SourceSpec, raw: pa.Table) -> pa.Table:
+    """
+    Map raw string columns to MATCH_SCHEMA.
+
+    Dates are parsed with the spec's explicit formats, tried in order.
+    Missing results are derived from the scores. Rows without a date or
+    both teams are dropped.
+    """
+    def first_present(standard: str) -> pa.Array:
+        columns = [raw.column(name).combine_chunks() for name in spec.columns.get(standard, [])]
+        return pc.coalesce(*columns) if columns else pa.nulls(raw.num_rows, pa.string())
+
+    home_goals = _parse_goals(first_present("home_goals"))
+    away_goals = _parse_goals(first_present("away_goals"))
+    if spec.league_column:
+        league = pc.coalesce(raw.column(spec.league_column).combine_chunks(), pa.scalar(spec.league, pa.string()))
+    else:
+        league = pa.array([spec.league] * raw.num_rows, pa.string())
+
+    table = pa.Table.from_arrays([
+        _parse_dates(first_present("match_date"), spec.date_formats),
+        first_present("home_team"),
+        first_present("away_team"),
+        home_goals,
+        away_goals,
+        pc.coalesce(first_present("result"), derive_results(home_goals, away_goals)),
+        league,
+        pa.array([spec.name] * raw.num_rows, pa.string())
+    ], schema=MATCH_SCHEMA)
+
+    valid = pc.and_(pc.is_valid(table["match_date"]), pc.and_(pc.is_valid(table["home_team"]), pc.is_valid(table["away_team"])))
+    return table.filter(valid)
+
+
+def _csv_options(spec: SourceSpec, block_size: int, use_threads: bool):
+    return (
+        pacsv.ReadOptions(block_size=block_size, use_threads=use_threads),
+        pacsv.ConvertOptions(
+            include_columns=spec.raw_columns,
+            include_missing_columns=True,
+            column_types={name: pa.string() for name in spec.raw_columns},
+            strings_can_be_null=True
+        )
+    )
+
+
+def read_source_file(
+    spec: SourceSpec,
+    path: Path,
+    block_size: int = INGEST_BLOCK_SIZE,
+    use_threads: bool = False
+) -> pa.Table:
+    """
+    Read a whole raw file into MATCH_SCHEMA; only the spec's columns are parsed.
+
+    `use_threads` parses the file's blocks on Arrow's own thread pool, for
+    when it is not already one of many files read side by side.
+    """
+    read_options, convert_options = _csv_options(spec, block_size, use_threads)
+    raw = pacsv.read_csv(path, read_options=read_options, convert_options=convert_options)
+    return standardize_table(spec, raw)
+
+
+def iter_source_batches(
+    spec: SourceSpec,
+    path: Path,
+    block_size: int = INGEST_BLOCK_SIZE,
+    use_threads: bool = False
+) -> Iterator[pa.Table]:
+    """Stream a raw file block by block as MATCH_SCHEMA tables, for files too large to read at once."""
+    read_options, convert_options = _csv_options(spec, block_size, use_threads)
+    with pacsv.open_csv(path, read_options=read_options, convert_options=convert_options) as reader:
+        for batch in reader:
+            yield standardize_table(spec, pa.Table.from_batches([batch]))
+
+
+def ingest_raw_data(
+    files: Optional[Sequence[Tuple[SourceSpec, Path]]] = None,
+    n_workers: Optional[int] = None
+) -> pa.Table:
+    """
+    Read every raw file concurrently into one MATCH_SCHEMA table.
+
+    pyarrow's CSV parser releases the GIL, so a thread pool parses files
+    in parallel, one file per thread, without pickling tables between
+    processes. A lone file is parsed with Arrow's multithreaded reader
+    instead.
+
+    Args:
+        files: (spec, path) pairs; defaults to every file discovered under RAW_DATA_DIR
+        n_workers: Threads; defaults to ThreadPoolExecutor's default
+
+    Returns:
+        Table of all matches in discovery order, not yet deduplicated
+    """
+    files = discover_source_files() if files is None else files
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        tables = list(executor.map(lambda item: read_source_file(*item, use_threads=len(files) == 1), files))
+    logger.info(f"Ingested {sum(table.num_rows for table in tables)} matches from {len(files)} files")
+    return pa.concat_tables(tables) if tables else MATCH_SCHEMA.empty_table()
+
+
+def benchmark_ingestion(n_seasons: int = 25, n_leagues: int = 5, n_workers: Optional[int] = None):
+    """
+    Time sequential pandas loading against threaded Arrow ingestion.
+
+    Generates one football-data style file (with 40 odds columns) per league
+    and season, 380 matches each.
+    """
+    import tempfile
+    import time
+
+    import numpy as np
+    import pandas as pd
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        rng = np.random.default_rng(0)
+        for league in range(n_leagues):
+            league_dir = Path(work_dir) / "football-data" / f"L{league}"
+            league_dir.mkdir(parents=True)
+            for season in range(n_seasons):
+                n_matches = 380
+                dates = pd.Timestamp(f"{1995 + season}-08-01") + pd.to_timedelta(rng.integers(0, 300, n_matches), unit="D")
+                frame = pd.DataFrame({
+                    "Div": f"L{league}",
+                    "Date": dates.strftime("%d/%m/%Y"),
+                    "HomeTeam": rng.integers(0, 20, n_matches).astype(str),
+                    "AwayTeam": rng.integers(0, 20, n_matches).astype(str),
+                    "FTHG": rng.integers(0, 5, n_matches),
+                    "FTAG": rng.integers(0, 5, n_matches),
+                    "FTR": "H"
+                })
+                for i in range(40):
+                    frame[f"odds_{i}"] = rng.random(n_matches).round(2)
+                frame.to_csv(league_dir / f"{1995 + season}.csv", index=False)
+
+        files = discover_source_files(Path(work_dir))
+
+        start = time.perf_counter()
+        frames = []
+        for _, path in files:
+            frame = pd.read_csv(path).rename(columns=COLUMN_MAPPING)
+            frame["match_date"] = pd.to_datetime(frame["match_date"], errors="coerce", dayfirst=True)
+            frames.append(frame)
+        pd.concat(frames, ignore_index=True)
+        results.append({"method": "pandas_sequential", "files": len(files), "seconds": time.perf_counter() - start})
+
+        start = time.perf_counter()
+        table = ingest_raw_data(files, n_workers)
+        results.append({"method": "arrow_threads", "files": len(files), "seconds": time.perf_counter() - start})
+
+    logger.info(f"Benchmarked {table.num_rows} matches")
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Ingest every raw match file under the raw data directory.")
+    parser.add_argument("--workers", type=int, default=None, help="Parser threads")
+    parser.add_argument("--benchmark", action="store_true", help="Compare against sequential pandas loading on synthetic files")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        logger.info("\n" + benchmark_ingestion(n_workers=args.workers).to_string(index=False))
+    else:
+        for spec, path in discover_source_files():
+            logger.info(f"{spec.name}: {path}")
+        table = ingest_raw_data(n_workers=args.workers)
+        logger.info("\n" + table.group_by(["source", "league"]).aggregate([("match_date", "count")]).to_pandas().to_string(index=False))
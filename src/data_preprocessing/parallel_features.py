@@ -0,0 +1,98 @@
+"""Season-partitioned parallel feature building."""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import ROLLING_WINDOW, SEASON_START_MONTH
+from src.data_preprocessing.form_engine import build_team_long_table, compute_form_features
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def match_seasons(match_dates: pd.Series) -> np.ndarray:
+    """Season start year for each match date (e.g. 2023 for the 2023-24 season)."""
+    dates = pd.to_datetime(match_dates)
+    years = dates.dt.year.to_numpy()
+    return np.where(dates.dt.month.to_numpy() >= SEASON_START_MONTH, years, years - 1)
+
+
+def season_partitions(df_sorted: pd.DataFrame, window: int = ROLLING_WINDOW) -> List[Tuple[pd.DataFrame, int]]:
+    """
+    Split chronologically sorted matches into per-season partitions.
+
+    Each partition starts with a warm-up tail: every team's last `window`
+    matches before the season, which is all the history the season's rolling
+    features can reach.
+
+    Returns:
+        List of (partition, n_warmup_rows) in season order
+    """
+    if df_sorted.empty:
+        return []
+
+    seasons = match_seasons(df_sorted["match_date"])
+    boundaries = np.flatnonzero(np.diff(seasons)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(df_sorted)]))
+
+    long = build_team_long_table(df_sorted)
+    codes = long["team_code"].to_numpy()
+    team_bounds = np.flatnonzero(np.diff(codes)) + 1
+    team_match_idx = np.split(long["match_idx"].to_numpy(), team_bounds)
+
+    partitions = []
+    for start, end in zip(starts, ends):
+        warmup = []
+        for idx in team_match_idx:
+            k = np.searchsorted(idx, start)
+            warmup.append(idx[max(0, k - window):k])
+        warmup_idx = np.unique(np.concatenate(warmup))
+        rows = np.concatenate((warmup_idx, np.arange(start, end)))
+        partitions.append((df_sorted.iloc[rows].reset_index(drop=True), len(warmup_idx)))
+
+    return partitions
+
+
+def _partition_features(partition: pd.DataFrame, n_warmup: int, window: int) -> pd.DataFrame:
+    return compute_form_features(partition, window).iloc[n_warmup:]
+
+
+def compute_form_features_parallel(
+    df_sorted: pd.DataFrame,
+    window: int = ROLLING_WINDOW,
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Compute rolling form features season by season across a process pool.
+
+    Args:
+        df_sorted: Chronologically sorted match DataFrame
+        window: Number of previous matches to average over
+        n_jobs: Worker processes; None or -1 uses every core
+
+    Returns:
+        The same DataFrame compute_form_features(df_sorted, window) returns
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+
+    partitions = season_partitions(df_sorted, window)
+    if len(partitions) <= 1 or n_jobs == 1:
+        return compute_form_features(df_sorted, window)
+
+    logger.info(f"Building features for {len(partitions)} seasons on {n_jobs} workers")
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(partitions))) as executor:
+        frames = list(executor.map(
+            _partition_features,
+            [partition for partition, _ in partitions],
+            [n_warmup for _, n_warmup in partitions],
+            [window] * len(partitions)
+        ))
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,142 @@
+"""Online Elo team ratings for EPL match outcome prediction."""
+
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from src.config import ELO_INITIAL_RATING, ELO_K_FACTOR, ELO_HOME_ADVANTAGE
+
+RATING_COLUMNS = ["home_elo", "away_elo", "elo_diff", "home_elo_expected"]
+
+RESULT_SCORES = {"H": 1.0, "D": 0.5, "A": 0.0}
+
+
+class EloRatings:
+    """
+    Elo ratings for every team, stored in an array indexed by integer team ID.
+
+    After `process` has walked the history, the same object answers
+    prediction-time lookups: current ratings for upcoming matches, or the
+    rating a team held on any past date.
+    """
+
+    def __init__(
+        self,
+        k_factor: float = ELO_K_FACTOR,
+        home_advantage: float = ELO_HOME_ADVANTAGE,
+        initial_rating: float = ELO_INITIAL_RATING
+    ):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_rating = initial_rating
+        self.team_ids: Dict[str, int] = {}
+        self.ratings = np.full(32, initial_rating)
+        self.history_dates: List[List[np.datetime64]] = []
+        self.history_ratings: List[List[float]] = []
+
+    def team_id(self, team: str) -> int:
+        """Integer ID for a team, registering it on first sight."""
+        team_id = self.team_ids.get(team)
+        if team_id is None:
+            team_id = len(self.team_ids)
+            self.team_ids[team] = team_id
+            if team_id >= len(self.ratings):
+                self.ratings = np.concatenate([self.ratings, np.full(len(self.ratings), self.initial_rating)])
+            self.history_dates.append([])
+            self.history_ratings.append([])
+        return team_id
+
+    def expected_home_score(self, home_rating: float, away_rating: float) -> float:
+        """Probability-like expected score of the home side."""
+        return 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - self.home_advantage) / 400.0))
+
+    def update(self, home_id: int, away_id: int, home_score: float) -> float:
+        """Apply one match result and return the home side's rating change."""
+        expected = self.expected_home_score(self.ratings[home_id], self.ratings[away_id])
+        delta = self.k_factor * (home_score - expected)
+        self.ratings[home_id] += delta
+        self.ratings[away_id] -= delta
+        return delta
+
+    def process(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """
+        Walk matches in date order, recording pre-match ratings and updating after each date.
+
+        Matches played on the same date all see the ratings from before that date.
+
+        Args:
+            matches: DataFrame with columns match_date, home_team, away_team, result
+
+        Returns:
+            DataFrame of RATING_COLUMNS aligned with the rows of `matches`
+        """
+        n_matches = len(matches)
+        dates = pd.to_datetime(matches["match_date"]).to_numpy(dtype="datetime64[ns]")
+        order = np.argsort(dates, kind="stable")
+        home_ids = np.array([self.team_id(team) for team in matches["home_team"]], dtype=np.int64)
+        away_ids = np.array([self.team_id(team) for team in matches["away_team"]], dtype=np.int64)
+        scores = matches["result"].map(RESULT_SCORES).to_numpy(dtype=float)
+
+        home_elo = np.empty(n_matches)
+        away_elo = np.empty(n_matches)
+        pending = []
+
+        for position, i in enumerate(order):
+            if pending and dates[i] != dates[order[position - 1]]:
+                self._apply(pending)
+                pending = []
+
+            home_elo[i] = self.ratings[home_ids[i]]
+            away_elo[i] = self.ratings[away_ids[i]]
+            if not np.isnan(scores[i]):
+                pending.append((home_ids[i], away_ids[i], scores[i], dates[i]))
+
+        self._apply(pending)
+
+        return pd.DataFrame({
+            "home_elo": home_elo,
+            "away_elo": away_elo,
+            "elo_diff": home_elo - away_elo,
+            "home_elo_expected": 1.0 / (1.0 + 10.0 ** ((away_elo - home_elo - self.home_advantage) / 400.0))
+        }, columns=RATING_COLUMNS)
+
+    def _apply(self, pending: List):
+        for home_id, away_id, score, match_date in pending:
+            self.update(home_id, away_id, score)
+            for team_id in (home_id, away_id):
+                self.history_dates[team_id].append(match_date)
+                self.history_ratings[team_id].append(float(self.ratings[team_id]))
+
+    def rating(self, team: str, as_of=None) -> float:
+        """A team's rating, optionally as it stood before a given date."""
+        team_id = self.team_ids.get(team)
+        if team_id is None:
+            return self.initial_rating
+        if as_of is None:
+            return float(self.ratings[team_id])
+
+        dates = self.history_dates[team_id]
+        as_of = np.datetime64(pd.Timestamp(as_of), "ns")
+        if not dates or as_of > dates[-1]:
+            return float(self.ratings[team_id])
+        position = bisect_left(dates, as_of)
+        return self.history_ratings[team_id][position - 1] if position else self.initial_rating
+
+    def rating_features(self, home_team: str, away_team: str, as_of=None) -> Dict[str, float]:
+        """Pre-match rating features for a single fixture."""
+        home_elo = self.rating(home_team, as_of)
+        away_elo = self.rating(away_team, as_of)
+        return {
+            "home_elo": home_elo,
+            "away_elo": away_elo,
+            "elo_diff": home_elo - away_elo,
+            "home_elo_expected": self.expected_home_score(home_elo, away_elo)
+        }
+
+
+def compute_rating_features(matches: pd.DataFrame, ratings: Optional[EloRatings] = None) -> pd.DataFrame:
+    """Pre-match Elo features for every match, in the order of `matches`."""
+    ratings = ratings if ratings is not None else EloRatings()
+    return ratings.process(matches)
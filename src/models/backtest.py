@@ -0,0 +1,188 @@
+"""Season-by-season walk-forward backtesting of the match outcome model."""
+
+import argparse
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    BACKTEST_METRICS_CSV,
+    CLEANED_DATA_FILE,
+    REPORTS_DIR,
+    X_FEATURES_FILE,
+    Y_TARGET_FILE
+)
+from src.data_preprocessing.parallel_features import match_seasons
+from src.models.tune import load_training_params
+
+logger = logging.getLogger(__name__)
+
+N_CLASSES = 3
+
+
+def feature_row_seasons(clean_data: pd.DataFrame) -> np.ndarray:
+    """
+    Season of each feature-matrix row.
+
+    Follows build_feature_matrix: matches sorted by date, keeping only rows
+    with a known result.
+    """
+    df_sorted = clean_data.sort_values("match_date").reset_index(drop=True)
+    valid = df_sorted["result"].isin(["H", "D", "A"]).to_numpy()
+    return match_seasons(df_sorted["match_date"])[valid]
+
+
+def walk_forward_folds(
+    seasons: np.ndarray,
+    mode: str = "expanding",
+    window: Optional[int] = None,
+    min_train_seasons: int = 1
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Row ranges for training on past seasons and testing on the next one.
+
+    Args:
+        seasons: Season of each row, in chronological order
+        mode: "expanding" trains on every earlier season, "sliding" on the last `window`
+        window: Number of training seasons in sliding mode
+        min_train_seasons: Earliest fold needs at least this many training seasons
+
+    Returns:
+        List of (test_season, train_start, train_end, test_end); the test rows
+        are train_end:test_end
+    """
+    if mode not in ("expanding", "sliding"):
+        raise ValueError(f"Unknown backtest mode: {mode}")
+    if mode == "sliding" and not window:
+        raise ValueError("Sliding backtests need a window of training seasons")
+
+    boundaries = np.flatnonzero(np.diff(seasons)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(seasons)]))
+
+    folds = []
+    for i in range(max(min_train_seasons, 1), len(starts)):
+        first = max(0, i - window) if mode == "sliding" else 0
+        folds.append((int(seasons[starts[i]]), int(starts[first]), int(starts[i]), int(ends[i])))
+    return folds
+
+
+def multiclass_brier(y_true: np.ndarray, probabilities: np.ndarray) -> float:
+    """Mean squared distance between the predicted distribution and the one-hot outcome."""
+    one_hot = np.eye(probabilities.shape[1])[y_true]
+    return float(np.mean(np.sum((probabilities - one_hot) ** 2, axis=1)))
+
+
+def _run_fold(
+    x_path: str,
+    y_path: str,
+    fold: Tuple[int, int, int, int],
+    params: Dict,
+    nthread: int
+) -> Dict:
+    """Train on one fold's past seasons and score its test season."""
+    import xgboost as xgb
+    from sklearn.metrics import accuracy_score, log_loss
+
+    season, train_start, train_end, test_end = fold
+    X = np.load(x_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+
+    model = xgb.XGBClassifier(**{**params, "n_jobs": nthread})
+    model.fit(X[train_start:train_end], y[train_start:train_end], verbose=False)
+
+    y_test = np.asarray(y[train_end:test_end])
+    probabilities = model.predict_proba(X[train_end:test_end])
+
+    return {
+        "season": season,
+        "n_train": train_end - train_start,
+        "n_test": test_end - train_end,
+        "accuracy": accuracy_score(y_test, probabilities.argmax(axis=1)),
+        "log_loss": log_loss(y_test, probabilities, labels=list(range(N_CLASSES))),
+        "brier": multiclass_brier(y_test, probabilities)
+    }
+
+
+def run_backtest(
+    X: Optional[pd.DataFrame] = None,
+    y: Optional[pd.Series] = None,
+    seasons: Optional[np.ndarray] = None,
+    mode: str = "expanding",
+    window: Optional[int] = None,
+    n_jobs: int = -1,
+    nthread: int = 1,
+    params: Optional[Dict] = None
+) -> pd.DataFrame:
+    """
+    Retrain season by season and score each following season.
+
+    The feature matrix is written once to a .npy file that every worker
+    memory-maps read-only, so folds only receive row ranges.
+
+    Args:
+        X: Feature matrix in chronological order; defaults to X_FEATURES_FILE
+        y: Encoded targets aligned with X; defaults to Y_TARGET_FILE
+        seasons: Season of each row; defaults to the seasons of the cleaned data
+        mode: "expanding" or "sliding" training window
+        window: Number of training seasons in sliding mode
+        n_jobs: Worker processes for the folds; 1 runs them in this process, -1 uses every core
+        nthread: XGBoost threads per fold
+        params: XGBClassifier parameters; defaults to the training parameters
+
+    Returns:
+        DataFrame with one row per test season: season, n_train, n_test,
+        accuracy, log_loss and brier
+    """
+    if X is None:
+        X = pd.read_parquet(X_FEATURES_FILE)
+    if y is None:
+        y = pd.read_parquet(Y_TARGET_FILE).iloc[:, 0]
+    if seasons is None:
+        seasons = feature_row_seasons(pd.read_csv(CLEANED_DATA_FILE, parse_dates=["match_date"]))
+    if not len(X) == len(y) == len(seasons):
+        raise ValueError(f"Feature rows ({len(X)}), targets ({len(y)}) and seasons ({len(seasons)}) differ in length")
+
+    params = params if params is not None else load_training_params()
+    folds = walk_forward_folds(np.asarray(seasons), mode, window)
+    if not folds:
+        raise ValueError("Backtesting needs at least two seasons of data")
+
+    with tempfile.TemporaryDirectory() as shared_dir:
+        x_path = str(Path(shared_dir) / "X.npy")
+        y_path = str(Path(shared_dir) / "y.npy")
+        np.save(x_path, np.ascontiguousarray(X.to_numpy(dtype=np.float32)))
+        np.save(y_path, np.asarray(y, dtype=np.int64))
+
+        if n_jobs == 1:
+            results = [_run_fold(x_path, y_path, fold, params, nthread) for fold in folds]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs if n_jobs > 0 else None) as executor:
+                futures = [executor.submit(_run_fold, x_path, y_path, fold, params, nthread) for fold in folds]
+                results = [future.result() for future in futures]
+
+    metrics = pd.DataFrame(results)
+    logger.info(f"Backtested {len(folds)} seasons ({mode} window)")
+    return metrics
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Walk-forward backtest, one test season per fold.")
+    parser.add_argument("--mode", choices=["expanding", "sliding"], default="expanding")
+    parser.add_argument("--window", type=int, default=None, help="Training seasons in sliding mode")
+    parser.add_argument("--jobs", type=int, default=-1, help="Worker processes, one fold each")
+    parser.add_argument("--nthread", type=int, default=1, help="XGBoost threads per fold")
+    args = parser.parse_args()
+
+    metrics = run_backtest(mode=args.mode, window=args.window, n_jobs=args.jobs, nthread=args.nthread)
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    metrics.to_csv(BACKTEST_METRICS_CSV, index=False)
+    logger.info("\n" + metrics.to_string(index=False))
+    logger.info(f"Backtest metrics saved to {BACKTEST_METRICS_CSV}")
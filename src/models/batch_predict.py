@@ -0,0 +1,80 @@
+"""Score a fixtures file in chunks and write the predicted probabilities."""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from src.models.prediction_utils import Predictor, predict_matches
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_COLUMNS = ["home_team", "away_team", "match_date"]
+
+
+def read_fixture_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield fixtures from a CSV or Parquet file, `chunk_size` rows at a time."""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=FIXTURE_COLUMNS):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=FIXTURE_COLUMNS, chunksize=chunk_size)
+
+
+def predict_fixtures_file(
+    fixtures_path: Path,
+    output_path: Path,
+    chunk_size: int = 50000,
+    predictor: Optional[Predictor] = None
+) -> int:
+    """
+    Predict every fixture in a file and stream the results to `output_path`.
+
+    The output format (CSV or Parquet) follows the output file's suffix.
+
+    Returns:
+        Number of fixtures scored
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    n_scored = 0
+
+    try:
+        for i, chunk in enumerate(read_fixture_chunks(fixtures_path, chunk_size)):
+            predictions = predict_matches(chunk, predictor)
+
+            if output_path.suffix == ".parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(predictions, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            else:
+                predictions.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+            n_scored += len(predictions)
+            logger.info(f"Scored {n_scored} fixtures")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_scored
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Predict outcomes for a fixtures CSV or Parquet file.")
+    parser.add_argument("fixtures", type=Path, help="File with home_team, away_team and match_date columns")
+    parser.add_argument("output", type=Path, help="Output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Fixtures scored per batch")
+    args = parser.parse_args()
+
+    n_scored = predict_fixtures_file(args.fixtures, args.output, args.chunk_size)
+    logger.info(f"Wrote {n_scored} predictions to {args.output}")
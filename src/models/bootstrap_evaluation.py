@@ -0,0 +1,307 @@
+"""Bootstrap confidence intervals for match outcome metrics."""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from math import exp, factorial
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.config import RANDOM_SEED
+from src.models.model_io import CLASS_NAMES
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_CHUNK_SIZE = 64
+WEIGHT_TABLE_BITS = 16
+PROBABILITY_FLOOR = 1e-15
+METRIC_NAMES = ["accuracy", "balanced_accuracy", "log_loss", "brier", "rps"]
+
+
+def poisson_weight_table(bits: int = WEIGHT_TABLE_BITS) -> np.ndarray:
+    """Poisson(1) quantiles at 2**bits evenly spaced levels, for turning random bits into weights."""
+    cdf = np.cumsum([exp(-1.0) / factorial(k) for k in range(20)])
+    levels = (np.arange(2 ** bits) + 0.5) / 2 ** bits
+    return np.searchsorted(cdf, levels).astype(np.float32)
+
+
+_WEIGHT_TABLE = poisson_weight_table()
+
+
+def bootstrap_weights(n: int, n_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Poisson bootstrap weights, one row per resample.
+
+    Each match gets an independent Poisson(1) count instead of a multinomial
+    draw, which matches the multinomial bootstrap for large n and needs only
+    16 random bits per weight.
+    """
+    rng = np.random.default_rng(seed)
+    n_words = -(-n_resamples * n // 4)
+    bits = rng.bit_generator.random_raw(n_words).view(np.uint16)[:n_resamples * n]
+    return _WEIGHT_TABLE[bits.reshape(n_resamples, n)]
+
+
+def bootstrap_sums(
+    columns: np.ndarray,
+    n_resamples: int,
+    seed: int = RANDOM_SEED,
+    n_jobs: int = 1,
+    chunk_size: int = BOOTSTRAP_CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Weighted column sums for every resample, as one weights-matrix product per chunk.
+
+    Args:
+        columns: Per-match values, shape (n_matches, n_columns)
+        n_resamples: Number of bootstrap resamples
+        seed: Seed; results do not depend on n_jobs or the order chunks finish
+        n_jobs: Threads computing chunks concurrently (NumPy releases the GIL)
+        chunk_size: Resamples per weights matrix
+
+    Returns:
+        Array of shape (n_resamples, n_columns)
+    """
+    columns = np.ascontiguousarray(columns, dtype=np.float32)
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    def chunk_sums(i: int) -> np.ndarray:
+        return bootstrap_weights(len(columns), sizes[i], seeds[i]) @ columns
+
+    if n_jobs == 1:
+        sums = [chunk_sums(i) for i in range(len(sizes))]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs if n_jobs > 0 else None) as executor:
+            sums = list(executor.map(chunk_sums, range(len(sizes))))
+    return np.concatenate(sums).astype(np.float64)
+
+
+def per_match_scores(y_true: np.ndarray, probabilities: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-match correctness, log-loss, Brier score and ranked probability score.
+
+    RPS treats the classes as ordered (away win < draw < home win), so
+    predicting a draw for a home win costs less than predicting an away win.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n_classes = probabilities.shape[1]
+    one_hot = np.eye(n_classes)[y_true]
+    cumulative_error = np.cumsum(probabilities, axis=1)[:, :-1] - np.cumsum(one_hot, axis=1)[:, :-1]
+
+    return {
+        "correct": (probabilities.argmax(axis=1) == y_true).astype(float),
+        "log_loss": -np.log(np.clip(probabilities[np.arange(len(y_true)), y_true], PROBABILITY_FLOOR, 1.0)),
+        "brier": np.sum((probabilities - one_hot) ** 2, axis=1),
+        "rps": np.sum(cumulative_error ** 2, axis=1) / (n_classes - 1)
+    }
+
+
+def _metric_columns(y_true: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """Columns whose weighted sums determine every metric: weight, scores, then per-class hits and counts."""
+    y_true = np.asarray(y_true, dtype=np.int64)
+    scores = per_match_scores(y_true, probabilities)
+    is_class = np.eye(probabilities.shape[1])[y_true]
+    return np.column_stack([
+        np.ones(len(y_true)),
+        scores["correct"],
+        scores["log_loss"],
+        scores["brier"],
+        scores["rps"],
+        is_class * scores["correct"][:, None],
+        is_class
+    ])
+
+
+def _metrics_from_sums(sums: np.ndarray, n_classes: int) -> Dict[str, np.ndarray]:
+    sums = np.atleast_2d(sums)
+    weight = sums[:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        recalls = sums[:, 5:5 + n_classes] / sums[:, 5 + n_classes:5 + 2 * n_classes]
+        present = np.isfinite(recalls)
+        balanced_accuracy = np.where(present, recalls, 0.0).sum(axis=1) / present.sum(axis=1)
+    return {
+        "accuracy": sums[:, 1] / weight,
+        "balanced_accuracy": balanced_accuracy,
+        "log_loss": sums[:, 2] / weight,
+        "brier": sums[:, 3] / weight,
+        "rps": sums[:, 4] / weight
+    }
+
+
+def _interval(samples: np.ndarray, confidence: float):
+    alpha = (1.0 - confidence) / 2.0
+    return np.nanquantile(samples, [alpha, 1.0 - alpha], axis=0)
+
+
+def bootstrap_metrics(
+    y_true: np.ndarray,
+    probabilities: np.ndarray,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = RANDOM_SEED,
+    n_jobs: int = 1
+) -> pd.DataFrame:
+    """
+    Accuracy, balanced accuracy, log-loss, Brier score and RPS with percentile intervals.
+
+    Args:
+        y_true: Encoded outcomes (0 away win, 1 draw, 2 home win)
+        probabilities: Predicted class probabilities, shape (n_matches, 3)
+        n_resamples: Number of bootstrap resamples
+        confidence: Width of the confidence interval
+        seed: Random seed
+        n_jobs: Threads for the resampling
+
+    Returns:
+        DataFrame indexed by metric with estimate, lower and upper columns
+    """
+    probabilities = np.asarray(probabilities)
+    columns = _metric_columns(y_true, probabilities)
+    n_classes = probabilities.shape[1]
+
+    estimates = _metrics_from_sums(columns.sum(axis=0), n_classes)
+    resampled = _metrics_from_sums(bootstrap_sums(columns, n_resamples, seed, n_jobs), n_classes)
+
+    rows = []
+    for name in METRIC_NAMES:
+        lower, upper = _interval(resampled[name], confidence)
+        rows.append({"metric": name, "estimate": estimates[name][0], "lower": lower, "upper": upper})
+    return pd.DataFrame(rows).set_index("metric")
+
+
+def compare_models(
+    y_true: np.ndarray,
+    probabilities_a: np.ndarray,
+    probabilities_b: np.ndarray,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = RANDOM_SEED,
+    n_jobs: int = 1
+) -> pd.DataFrame:
+    """
+    Paired bootstrap comparison of two models scored on the same matches.
+
+    Both models are evaluated on identical resamples, so the interval of the
+    difference reflects only the models, not which matches were drawn.
+
+    Returns:
+        DataFrame indexed by metric with model_a, model_b, difference (b - a),
+        lower, upper and a two-sided bootstrap p_value for a zero difference
+    """
+    probabilities_a, probabilities_b = np.asarray(probabilities_a), np.asarray(probabilities_b)
+    n_classes = probabilities_a.shape[1]
+    columns_a = _metric_columns(y_true, probabilities_a)
+    columns_b = _metric_columns(y_true, probabilities_b)
+    width = columns_a.shape[1]
+
+    sums = bootstrap_sums(np.hstack([columns_a, columns_b]), n_resamples, seed, n_jobs)
+    resampled_a = _metrics_from_sums(sums[:, :width], n_classes)
+    resampled_b = _metrics_from_sums(sums[:, width:], n_classes)
+    estimates_a = _metrics_from_sums(columns_a.sum(axis=0), n_classes)
+    estimates_b = _metrics_from_sums(columns_b.sum(axis=0), n_classes)
+
+    rows = []
+    for name in METRIC_NAMES:
+        differences = resampled_b[name] - resampled_a[name]
+        lower, upper = _interval(differences, confidence)
+        p_value = min(1.0, 2.0 * min(np.nanmean(differences <= 0), np.nanmean(differences >= 0)))
+        rows.append({
+            "metric": name,
+            "model_a": estimates_a[name][0],
+            "model_b": estimates_b[name][0],
+            "difference": estimates_b[name][0] - estimates_a[name][0],
+            "lower": lower,
+            "upper": upper,
+            "p_value": p_value
+        })
+    return pd.DataFrame(rows).set_index("metric")
+
+
+def calibration_bins(
+    y_true: np.ndarray,
+    probabilities: np.ndarray,
+    n_bins: int = 10,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = RANDOM_SEED,
+    n_jobs: int = 1
+) -> pd.DataFrame:
+    """
+    One-vs-rest reliability table per class with intervals on the observed frequency.
+
+    Returns:
+        DataFrame with class, bin_lower, bin_upper, count, mean_predicted,
+        observed_frequency, lower and upper; empty bins are dropped
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n_classes = probabilities.shape[1]
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    bins = np.clip(np.digitize(probabilities, edges[1:-1]), 0, n_bins - 1)
+
+    in_bin = (bins[:, :, None] == np.arange(n_bins)).astype(float)
+    outcome = (y_true[:, None] == np.arange(n_classes)).astype(float)
+    columns = np.concatenate([
+        in_bin.reshape(len(y_true), -1),
+        (in_bin * probabilities[:, :, None]).reshape(len(y_true), -1),
+        (in_bin * outcome[:, :, None]).reshape(len(y_true), -1)
+    ], axis=1)
+
+    size = n_classes * n_bins
+    totals = columns.sum(axis=0)
+    sums = bootstrap_sums(columns, n_resamples, seed, n_jobs)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        resampled_frequency = sums[:, 2 * size:] / sums[:, :size]
+    lower, upper = _interval(resampled_frequency, confidence)
+
+    class_idx, bin_idx = np.divmod(np.arange(size), n_bins)
+    table = pd.DataFrame({
+        "class": np.asarray(CLASS_NAMES, dtype=object)[class_idx] if n_classes == len(CLASS_NAMES) else class_idx,
+        "bin_lower": edges[bin_idx],
+        "bin_upper": edges[bin_idx + 1],
+        "count": totals[:size].astype(int),
+        "mean_predicted": totals[size:2 * size] / np.maximum(totals[:size], 1),
+        "observed_frequency": totals[2 * size:] / np.maximum(totals[:size], 1),
+        "lower": lower,
+        "upper": upper
+    })
+    return table[table["count"] > 0].reset_index(drop=True)
+
+
+def benchmark_bootstrap(n_matches: int = 100000, n_resamples: int = 10000, n_jobs: int = -1) -> float:
+    """Seconds to bootstrap every metric for random predictions of the given size."""
+    rng = np.random.default_rng(0)
+    probabilities = rng.dirichlet(np.ones(3), size=n_matches)
+    y_true = rng.integers(0, 3, size=n_matches)
+    start = time.perf_counter()
+    bootstrap_metrics(y_true, probabilities, n_resamples, n_jobs=n_jobs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    from src.config import X_FEATURES_FILE, Y_TARGET_FILE
+    from src.models.model_io import load_model
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Bootstrap evaluation of the trained model.")
+    parser.add_argument("--resamples", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=-1, help="Threads for the resampling")
+    parser.add_argument("--benchmark", action="store_true", help="Time 10k resamples over 100k random predictions")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        logger.info(f"Bootstrapped 100000 predictions x {args.resamples} resamples in "
+                    f"{benchmark_bootstrap(100000, args.resamples, args.jobs):.2f}s")
+    else:
+        X = pd.read_parquet(X_FEATURES_FILE)
+        y = pd.read_parquet(Y_TARGET_FILE).iloc[:, 0].to_numpy()
+        split_idx = int(len(X) * 0.8)
+        probabilities = load_model().predict_proba(X.iloc[split_idx:])
+        logger.info("\n" + bootstrap_metrics(y[split_idx:], probabilities, args.resamples, n_jobs=args.jobs).to_string())
+        logger.info("\n" + calibration_bins(y[split_idx:], probabilities, 5, args.resamples, n_jobs=args.jobs).to_string())
@@ -1,11 +1,8 @@
 """Evaluate trained XGBoost model performance."""
 
 import logging
-import joblib
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.metrics import (
     accuracy_score,
     balanced_accuracy_score,
@@ -13,65 +10,98 @@ from sklearn.metrics import (
     classification_report
 )
 from pathlib import Path
+from typing import Dict
 
 from src.config import (
     X_FEATURES_FILE,
     Y_TARGET_FILE,
-    MODEL_FILE,
+    CONFUSION_MATRIX_PNG,
     REPORTS_DIR
 )
+from src.models.bootstrap_evaluation import bootstrap_metrics
+from src.models.model_io import CLASS_NAMES, load_model
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def evaluate_model():
-    """Evaluate model and generate performance reports."""
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    
-    logger.info("Loading model and data")
-    model = joblib.load(MODEL_FILE)
-    X = pd.read_parquet(X_FEATURES_FILE)
-    y = pd.read_parquet(Y_TARGET_FILE)
-    
+def compute_evaluation_metrics(model, X: pd.DataFrame, y: pd.DataFrame) -> Dict:
+    """
+    Score the model on the chronological validation split.
+
+    Args:
+        model: Trained classifier with predict_proba
+        X: Full feature matrix
+        y: Full target frame
+
+    Returns:
+        Dictionary of JSON-serializable metrics, bootstrap intervals and the confusion matrix
+    """
     split_idx = int(len(X) * 0.8)
     X_val = X.iloc[split_idx:]
-    y_val = y.iloc[split_idx:]
-    
-    y_pred = model.predict(X_val)
+    y_val = y.iloc[split_idx:, 0].to_numpy()
+
     y_pred_proba = model.predict_proba(X_val)
-    
-    accuracy = accuracy_score(y_val, y_pred)
-    balanced_acc = balanced_accuracy_score(y_val, y_pred)
-    
-    logger.info(f"Accuracy: {accuracy:.4f}")
-    logger.info(f"Balanced Accuracy: {balanced_acc:.4f}")
-    
-    cm = confusion_matrix(y_val, y_pred)
-    
-    class_names = ["Away Win", "Draw", "Home Win"]
-    report = classification_report(y_val, y_pred, target_names=class_names)
-    logger.info("\nClassification Report:\n" + report)
-    
+    y_pred = y_pred_proba.argmax(axis=1)
+
+    return {
+        "n_validation": len(X_val),
+        "accuracy": accuracy_score(y_val, y_pred),
+        "balanced_accuracy": balanced_accuracy_score(y_val, y_pred),
+        "bootstrap": bootstrap_metrics(y_val, y_pred_proba).to_dict(orient="index"),
+        "confusion_matrix": confusion_matrix(y_val, y_pred, labels=[0, 1, 2]).tolist(),
+        "class_names": CLASS_NAMES,
+        "classification_report": classification_report(
+            y_val, y_pred, labels=[0, 1, 2], target_names=CLASS_NAMES, output_dict=True, zero_division=0
+        )
+    }
+
+
+def plot_confusion_matrix(cm: np.ndarray, path: Path = CONFUSION_MATRIX_PNG):
+    """Render the confusion matrix heatmap with the non-interactive Agg backend."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.figure(figsize=(8, 6))
     sns.heatmap(
         cm,
         annot=True,
         fmt="d",
         cmap="Blues",
-        xticklabels=class_names,
-        yticklabels=class_names
+        xticklabels=CLASS_NAMES,
+        yticklabels=CLASS_NAMES
     )
     plt.title("Confusion Matrix")
     plt.ylabel("True Label")
     plt.xlabel("Predicted Label")
     plt.tight_layout()
-    plt.savefig(REPORTS_DIR / "confusion_matrix.png", dpi=300)
-    logger.info(f"Confusion matrix saved to {REPORTS_DIR / 'confusion_matrix.png'}")
+    plt.savefig(path, dpi=300)
+    logger.info(f"Confusion matrix saved to {path}")
     plt.close()
 
 
+def evaluate_model() -> Dict:
+    """Evaluate model and generate performance reports."""
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    logger.info("Loading model and data")
+    model = load_model()
+    X = pd.read_parquet(X_FEATURES_FILE)
+    y = pd.read_parquet(Y_TARGET_FILE)
+
+    metrics = compute_evaluation_metrics(model, X, y)
+
+    logger.info(f"Accuracy: {metrics['accuracy']:.4f}")
+    logger.info(f"Balanced Accuracy: {metrics['balanced_accuracy']:.4f}")
+    logger.info("\nBootstrap 95% intervals:\n" + pd.DataFrame(metrics["bootstrap"]).T.to_string())
+    logger.info("\nClassification Report:\n" + pd.DataFrame(metrics["classification_report"]).T.to_string())
+
+    plot_confusion_matrix(np.asarray(metrics["confusion_matrix"]))
+    return metrics
+
+
 if __name__ == "__main__":
     evaluate_model()
     logger.info("Evaluation complete")
-
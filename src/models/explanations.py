@@ -0,0 +1,266 @@
+"""Per-match feature contributions from the booster, cached by model version and feature row."""
+
+import argparse
+import atexit
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import EXPLANATIONS_FILE, EXPLANATIONS_FLUSH_ROWS, EXPLANATIONS_MAX_ROWS
+from src.models.model_io import CLASS_NAMES, hash_files, load_model, resolve_model_file
+
+logger = logging.getLogger(__name__)
+
+BIAS_NAME = "bias"
+
+
+def feature_row_keys(X: pd.DataFrame) -> List[str]:
+    """Content hash of each feature row, as float64 in column order."""
+    values = np.ascontiguousarray(X.to_numpy(dtype=np.float64)) + 0.0
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in values]
+
+
+def compute_contributions(booster, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    SHAP contributions of every feature to every class margin, in one batched call.
+
+    Args:
+        booster: Trained multi-class xgboost Booster
+        X: Feature rows in the booster's feature order
+
+    Returns:
+        Tuple of contributions shaped (rows, classes, features + 1), the last
+        entry being the bias, and the class probabilities they sum to
+    """
+    import xgboost as xgb
+
+    contributions = booster.predict(xgb.DMatrix(X), pred_contribs=True).astype(np.float32)
+    margins = contributions.sum(axis=2, dtype=np.float64)
+    probabilities = np.exp(margins - margins.max(axis=1, keepdims=True))
+    return contributions, probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def explanation_frame(contributions: np.ndarray, feature_names: List[str]) -> pd.DataFrame:
+    """One match's contributions as a features x classes table, largest effect on the predicted class first."""
+    frame = pd.DataFrame(contributions.T, index=feature_names + [BIAS_NAME], columns=CLASS_NAMES)
+    predicted = CLASS_NAMES[int(contributions.sum(axis=1).argmax())]
+    order = frame.loc[feature_names, predicted].abs().sort_values(ascending=False).index
+    return frame.loc[list(order) + [BIAS_NAME]]
+
+
+class ExplanationCache:
+    """
+    Contributions and probabilities of explained feature rows for one model version.
+
+    Rows live in a ring buffer of at most `max_rows` slots and are found
+    through a dictionary of row keys, so a lookup costs one hash of the
+    feature row and adding rows costs the size of the batch. Past
+    `max_rows` the oldest rows are overwritten.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        feature_names: List[str],
+        keys: Optional[List[str]] = None,
+        contributions: Optional[np.ndarray] = None,
+        probabilities: Optional[np.ndarray] = None,
+        max_rows: int = EXPLANATIONS_MAX_ROWS
+    ):
+        self.max_rows = max_rows
+        self.model_version = model_version
+        self.feature_names = list(feature_names)
+        self.contributions = np.empty((0, len(CLASS_NAMES), len(feature_names) + 1), dtype=np.float32)
+        self.probabilities = np.empty((0, len(CLASS_NAMES)))
+        self.slot_keys: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        self.n_added = 0
+        if keys:
+            self.add(keys, contributions, probabilities)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Contributions and probabilities of a cached row, or None."""
+        i = self.index.get(key)
+        return None if i is None else (self.contributions[i], self.probabilities[i])
+
+    def _reserve(self, n_rows: int):
+        """Grow the buffers, doubling up to `max_rows`, so `n_rows` slots exist."""
+        capacity = len(self.contributions)
+        if n_rows <= capacity:
+            return
+        capacity = min(self.max_rows, max(n_rows, 2 * capacity))
+        extra = capacity - len(self.contributions)
+        self.contributions = np.concatenate((self.contributions, np.empty((extra,) + self.contributions.shape[1:], dtype=np.float32)))
+        self.probabilities = np.concatenate((self.probabilities, np.empty((extra, len(CLASS_NAMES)))))
+        self.slot_keys.extend([None] * extra)
+
+    def add(self, keys: List[str], contributions: np.ndarray, probabilities: np.ndarray):
+        """Add newly explained rows, overwriting the oldest past `max_rows`; keys already cached are ignored."""
+        new: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key not in self.index and key not in new:
+                new[key] = i
+        if not new:
+            return
+        new_keys = list(new)[-self.max_rows:]
+        rows = [new[key] for key in new_keys]
+
+        self._reserve(min(self.max_rows, self.n_added + len(rows)))
+        slots = (self.n_added + np.arange(len(rows))) % self.max_rows
+        self.contributions[slots] = contributions[rows]
+        self.probabilities[slots] = probabilities[rows]
+        for key, slot in zip(new_keys, slots.tolist()):
+            evicted = self.slot_keys[slot]
+            if evicted is not None:
+                del self.index[evicted]
+            self.slot_keys[slot] = key
+            self.index[key] = slot
+        self.n_added += len(rows)
+
+    def save(self, path: Path = EXPLANATIONS_FILE):
+        """Write the cache as .npz next to the model, oldest row first, replacing the file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        slots = list(self.index.values())
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as f:
+            np.savez(
+                f,
+                model_version=np.asarray(self.model_version),
+                feature_names=np.asarray(self.feature_names, dtype=str),
+                keys=np.asarray(list(self.index), dtype=str),
+                contributions=self.contributions[slots],
+                probabilities=self.probabilities[slots]
+            )
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(
+        cls,
+        model_version: str,
+        path: Path = EXPLANATIONS_FILE,
+        max_rows: int = EXPLANATIONS_MAX_ROWS
+    ) -> Optional["ExplanationCache"]:
+        """The persisted cache, or None if it is missing or belongs to another model version."""
+        if not path.exists():
+            return None
+        with np.load(path) as arrays:
+            if str(arrays["model_version"]) != model_version:
+                return None
+            return cls(
+                model_version,
+                arrays["feature_names"].tolist(),
+                arrays["keys"].tolist()[-max_rows:],
+                arrays["contributions"][-max_rows:],
+                arrays["probabilities"][-max_rows:],
+                max_rows
+            )
+
+
+class MatchExplainer:
+    """
+    Explains predictions for a model file, computing contributions in batches.
+
+    Rows that are already cached for the current model version are answered
+    from the cache; the rest are explained together in one `pred_contribs`
+    call. New rows are written back to `cache_file` once `flush_rows` of them
+    have accumulated, on `flush`, and at interpreter exit, so a single-match
+    miss does not rewrite the whole file.
+    """
+
+    def __init__(
+        self,
+        model_file: Optional[Path] = None,
+        cache_file: Path = EXPLANATIONS_FILE,
+        max_rows: int = EXPLANATIONS_MAX_ROWS,
+        flush_rows: int = EXPLANATIONS_FLUSH_ROWS
+    ):
+        self.model_file = model_file if model_file is not None else resolve_model_file()
+        self.cache_file = cache_file
+        self.max_rows = max_rows
+        self.flush_rows = flush_rows
+        self.n_unsaved = 0
+        self.model_version = hash_files(self.model_file)
+        self._booster = None
+        self.cache = ExplanationCache.load(self.model_version, cache_file, max_rows)
+        atexit.register(self.flush)
+
+    @property
+    def booster(self):
+        if self._booster is None:
+            self._booster = load_model(self.model_file).get_booster()
+        return self._booster
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.cache.feature_names if self.cache is not None else list(self.booster.feature_names or [])
+
+    def explain_rows(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Contributions and probabilities for feature rows, explaining cache misses in one batch.
+
+        Returns:
+            Arrays shaped (rows, classes, features + 1) and (rows, classes)
+        """
+        X = X[self.feature_names] if self.feature_names else X
+        if self.cache is None:
+            self.cache = ExplanationCache(self.model_version, list(X.columns), max_rows=self.max_rows)
+
+        keys = feature_row_keys(X)
+        cached = [i for i, key in enumerate(keys) if key in self.cache.index]
+        contributions = np.empty((len(keys),) + self.cache.contributions.shape[1:], dtype=np.float32)
+        probabilities = np.empty((len(keys), len(CLASS_NAMES)))
+        rows = [self.cache.index[keys[i]] for i in cached]
+        contributions[cached] = self.cache.contributions[rows]
+        probabilities[cached] = self.cache.probabilities[rows]
+
+        missing = {key: i for i, key in enumerate(keys) if key not in self.cache.index}
+        if missing:
+            new_contributions, new_probabilities = compute_contributions(self.booster, X.iloc[list(missing.values())])
+            position = {key: n for n, key in enumerate(missing)}
+            uncached = [i for i, key in enumerate(keys) if key in position]
+            contributions[uncached] = new_contributions[[position[keys[i]] for i in uncached]]
+            probabilities[uncached] = new_probabilities[[position[keys[i]] for i in uncached]]
+            # Cached rows may be pruned by this add, so the answer is assembled first
+            self.cache.add(list(missing), new_contributions, new_probabilities)
+            self.n_unsaved += len(missing)
+            if self.n_unsaved >= self.flush_rows:
+                self.flush()
+            logger.info(f"Explained {len(missing)} new feature rows, {len(set(keys)) - len(missing)} from cache")
+
+        return contributions, probabilities
+
+    def flush(self):
+        """Write rows explained since the last save to `cache_file`."""
+        if self.n_unsaved and self.cache is not None:
+            self.cache.save(self.cache_file)
+            self.n_unsaved = 0
+
+    def close(self):
+        """Flush the cache and stop tracking this explainer for interpreter exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Explain a gameweek of fixtures and cache the contributions.")
+    parser.add_argument("fixtures", type=Path, help="CSV with home_team, away_team, match_date")
+    parser.add_argument("--top", type=int, default=5, help="Features to show per match")
+    args = parser.parse_args()
+
+    from src.models.prediction_utils import get_predictor
+
+    for explanation in get_predictor().explain_many(pd.read_csv(args.fixtures)):
+        logger.info(
+            f"{explanation['home_team']} vs {explanation['away_team']}: {explanation['predicted_outcome']}\n"
+            + explanation["contributions"].head(args.top).to_string()
+        )
@@ -1,68 +1,79 @@
 """Extract and visualize feature importances from trained XGBoost model."""
 
 import logging
-import joblib
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from src.config import (
-    MODEL_FILE,
-    X_FEATURES_FILE,
     FEATURE_IMPORTANCE_CSV,
     FEATURE_IMPORTANCE_PNG,
     REPORTS_DIR
 )
+from src.models.model_io import load_model
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def extract_feature_importances() -> pd.DataFrame:
+def extract_feature_importances(model=None, output_file: Path = FEATURE_IMPORTANCE_CSV) -> pd.DataFrame:
     """
     Extract feature importances from trained model.
     
+    Args:
+        model: Trained model; loaded from disk when omitted
+        output_file: CSV the importances are written to
+    
     Returns:
         DataFrame with features and importance scores
     """
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    
-    logger.info("Loading trained model")
-    model = joblib.load(MODEL_FILE)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    X = pd.read_parquet(X_FEATURES_FILE)
-    
-    importances = model.feature_importances_
+    if model is None:
+        logger.info("Loading trained model")
+        model = load_model()
     
     feature_importance_df = pd.DataFrame({
-        "feature": X.columns,
-        "importance": importances
+        "feature": model.feature_names,
+        "importance": model.feature_importances_
     }).sort_values("importance", ascending=False)
     
-    feature_importance_df.to_csv(FEATURE_IMPORTANCE_CSV, index=False)
-    logger.info(f"Feature importances saved to {FEATURE_IMPORTANCE_CSV}")
+    feature_importance_df.to_csv(output_file, index=False)
+    logger.info(f"Feature importances saved to {output_file}")
     
     return feature_importance_df
 
 
-def plot_feature_importances(top_n: int = 15):
+def plot_feature_importances(
+    top_n: int = 15,
+    df: Optional[pd.DataFrame] = None,
+    path: Path = FEATURE_IMPORTANCE_PNG
+) -> pd.DataFrame:
     """Plot top N feature importances."""
-    df = extract_feature_importances()
+    if df is None:
+        df = extract_feature_importances()
     
     top_features = df.head(top_n)
     
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     plt.figure(figsize=(10, 8))
     sns.barplot(data=top_features, y="feature", x="importance", palette="viridis")
     plt.title(f"Top {top_n} Feature Importances")
     plt.xlabel("Importance Score")
     plt.ylabel("Feature")
     plt.tight_layout()
-    plt.savefig(FEATURE_IMPORTANCE_PNG, dpi=300, bbox_inches="tight")
-    logger.info(f"Feature importance plot saved to {FEATURE_IMPORTANCE_PNG}")
+    plt.savefig(path, dpi=300, bbox_inches="tight")
+    logger.info(f"Feature importance plot saved to {path}")
     plt.close()
+    return df
 
 
 if __name__ == "__main__":
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     plot_feature_importances()
     logger.info("Feature importance analysis complete")
-
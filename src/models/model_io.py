@@ -0,0 +1,278 @@
+"""Save and load the trained model in XGBoost's native format."""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from src.config import MODEL_FILE, MODEL_NATIVE_FILE, MODEL_METADATA_FILE, MODELS_DIR
+from src.models.tree_engine import TreeEnsemble, export_tree_arrays
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import xgboost as xgb
+
+logger = logging.getLogger(__name__)
+
+CLASS_NAMES = ["Away Win", "Draw", "Home Win"]
+
+
+class BoosterClassifier:
+    """
+    Thin classifier interface over a native Booster.
+
+    Exposes the parts of XGBClassifier the project uses (predict_proba,
+    predict, feature_importances_) without unpickling a scikit-learn wrapper.
+    """
+
+    def __init__(self, booster: "xgb.Booster", metadata: Optional[Dict] = None):
+        self.booster = booster
+        self.metadata = metadata or {}
+        self.feature_names = list(booster.feature_names or self.metadata.get("feature_names", []))
+
+    def get_booster(self) -> "xgb.Booster":
+        return self.booster
+
+    def predict_proba(self, X) -> np.ndarray:
+        return np.asarray(self.booster.inplace_predict(X), dtype=float).reshape(len(X), -1)
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_proba(X).argmax(axis=1)
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """Normalized gain importances, as XGBClassifier reports them."""
+        scores = self.booster.get_score(importance_type="gain")
+        importances = np.array([scores.get(name, 0.0) for name in self.feature_names], dtype=np.float32)
+        total = importances.sum()
+        return importances / total if total > 0 else importances
+
+
+def hash_files(*paths: Path) -> str:
+    """SHA-256 over the contents of the given files; a directory counts as its files in name order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        files = sorted(child for child in Path(path).rglob("*") if child.is_file()) if Path(path).is_dir() else [path]
+        for file in files:
+            with open(file, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def save_model(
+    model,
+    feature_names: List[str],
+    training_data_hash: str,
+    extra_metadata: Optional[Dict] = None,
+    model_file: Path = MODEL_NATIVE_FILE,
+    metadata_file: Optional[Path] = None,
+    match_keys: Optional["pd.Series"] = None
+) -> Dict:
+    """
+    Save a trained model as UBJSON with a JSON metadata sidecar.
+
+    The flattened tree arrays used by the NumPy evaluator are exported next to
+    the model file so both stay in sync, as are the keys of the matches it was
+    trained on; a model saved without keys removes any left by an earlier one.
+
+    Args:
+        model: XGBClassifier or Booster
+        feature_names: Feature columns in training order
+        training_data_hash: Hash of the feature and target files the model was trained on
+        extra_metadata: Additional fields to store in the sidecar
+        model_file: Native model file to write
+        metadata_file: Sidecar to write; defaults to the one next to `model_file`
+        match_keys: Match key of every row of the training matrix
+
+    Returns:
+        The metadata dictionary that was written
+    """
+    import xgboost as xgb
+
+    metadata_file = metadata_file if metadata_file is not None else metadata_path(model_file)
+    model_file.parent.mkdir(parents=True, exist_ok=True)
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    booster.save_model(model_file)
+    export_tree_arrays(booster, model_file.with_suffix(".npz"), hash_files(model_file))
+    if match_keys is not None:
+        match_keys.rename("match_key").to_frame().to_parquet(model_keys_path(model_file), index=False)
+    else:
+        model_keys_path(model_file).unlink(missing_ok=True)
+
+    metadata = {
+        "feature_names": list(feature_names),
+        "classes": list(range(len(CLASS_NAMES))),
+        "class_names": CLASS_NAMES,
+        "training_data_hash": training_data_hash,
+        "num_trees": booster.num_boosted_rounds(),
+        "xgboost_version": xgb.__version__,
+        "saved_at": datetime.now(timezone.utc).isoformat()
+    }
+    metadata.update(extra_metadata or {})
+    metadata_file.write_text(json.dumps(metadata, indent=2))
+
+    logger.info(f"Model saved to {model_file}")
+    return metadata
+
+
+def metadata_path(model_file: Path) -> Path:
+    """The metadata sidecar belonging to a model file: its name with a .meta.json suffix."""
+    return model_file.with_suffix(".meta.json")
+
+
+def model_keys_path(model_file: Path) -> Path:
+    """The keys of the matches a model file was trained on: its name with a .keys.parquet suffix."""
+    return model_file.with_suffix(".keys.parquet")
+
+
+def load_model_keys(model_file: Path = MODEL_NATIVE_FILE) -> Optional["pd.Series"]:
+    """Match keys the model was trained on, or None if it was saved without them."""
+    import pandas as pd
+
+    path = model_keys_path(model_file)
+    return pd.read_parquet(path)["match_key"] if path.exists() else None
+
+
+def load_metadata(metadata_file: Path = MODEL_METADATA_FILE) -> Dict:
+    """Read the model metadata sidecar, or an empty dict if it is missing."""
+    if not metadata_file.exists():
+        return {}
+    return json.loads(metadata_file.read_text())
+
+
+def resolve_model_file() -> Path:
+    """The native model if it exists, otherwise the legacy pickle."""
+    return MODEL_NATIVE_FILE if MODEL_NATIVE_FILE.exists() else MODEL_FILE
+
+
+def load_model(model_file: Optional[Path] = None, metadata_file: Optional[Path] = None) -> BoosterClassifier:
+    """
+    Load the trained model into a Booster.
+
+    Native .ubj/.json files are read directly with the sidecar next to them,
+    unless `metadata_file` says otherwise; a .pkl path is unpickled as a
+    legacy fallback.
+    """
+    model_file = model_file if model_file is not None else resolve_model_file()
+    metadata_file = metadata_file if metadata_file is not None else metadata_path(model_file)
+    if not model_file.exists():
+        raise FileNotFoundError(
+            f"Model file not found at {model_file}. "
+            "Please train the model first by running: python create_model.py"
+        )
+
+    if model_file.suffix == ".pkl":
+        import joblib
+
+        logger.warning(f"Loading legacy pickled model from {model_file}")
+        return BoosterClassifier(joblib.load(model_file).get_booster())
+
+    import xgboost as xgb
+
+    booster = xgb.Booster()
+    booster.load_model(model_file)
+    return BoosterClassifier(booster, load_metadata(metadata_file))
+
+
+COLD_START_SNIPPETS = {
+    "native": (
+        "import time; start = time.perf_counter(); import xgboost as xgb; "
+        "booster = xgb.Booster(); booster.load_model({path!r}); print(time.perf_counter() - start)"
+    ),
+    "pickle": (
+        "import time; start = time.perf_counter(); import joblib; "
+        "model = joblib.load({path!r}); print(time.perf_counter() - start)"
+    )
+}
+
+
+def load_serving_model(model_file: Optional[Path] = None):
+    """
+    Load the model for prediction, avoiding the xgboost import when possible.
+
+    Returns the NumPy TreeEnsemble when the tree arrays exported alongside a
+    native model were exported from that exact file, otherwise falls back to
+    load_model.
+    """
+    model_file = model_file if model_file is not None else resolve_model_file()
+    arrays_file = model_file.with_suffix(".npz")
+    if model_file.suffix != ".pkl" and model_file.exists() and arrays_file.exists():
+        ensemble = TreeEnsemble.load(arrays_file)
+        if ensemble.source_hash == hash_files(model_file):
+            return ensemble
+    return load_model(model_file)
+
+
+def benchmark_model_loading(repeats: int = 5) -> "pd.DataFrame":
+    """
+    Time loading the native model against unpickling the legacy model.
+
+    Cold-start times run each loader in a fresh interpreter, imports included;
+    warm times repeat the load in this process.
+    """
+    import subprocess
+    import sys
+
+    import joblib
+    import pandas as pd
+
+    loaders = {
+        "native": (MODEL_NATIVE_FILE, lambda: load_model(MODEL_NATIVE_FILE)),
+        "pickle": (MODEL_FILE, lambda: joblib.load(MODEL_FILE))
+    }
+
+    timings = []
+    for name, (path, loader) in loaders.items():
+        if not path.exists():
+            continue
+
+        cold = []
+        for _ in range(repeats):
+            output = subprocess.run(
+                [sys.executable, "-W", "ignore", "-c", COLD_START_SNIPPETS[name].format(path=str(path))],
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout
+            cold.append(float(output.strip().splitlines()[-1]))
+
+        loader()
+        warm = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            loader()
+            warm.append(time.perf_counter() - start)
+
+        timings.append({
+            "format": name,
+            "file_size_kb": path.stat().st_size / 1024,
+            "cold_start_ms": np.median(cold) * 1000,
+            "warm_load_ms": np.median(warm) * 1000
+        })
+    return pd.DataFrame(timings)
+
+
+if __name__ == "__main__":
+    import joblib
+
+    logging.basicConfig(level=logging.INFO)
+
+    from src.config import X_FEATURES_FILE, Y_TARGET_FILE
+
+    if not MODEL_NATIVE_FILE.exists() and MODEL_FILE.exists():
+        logger.info(f"Converting legacy model {MODEL_FILE} to native format")
+        MODELS_DIR.mkdir(parents=True, exist_ok=True)
+        legacy = joblib.load(MODEL_FILE)
+        save_model(
+            legacy,
+            list(legacy.get_booster().feature_names),
+            hash_files(X_FEATURES_FILE, Y_TARGET_FILE)
+        )
+
+    logger.info("\n" + benchmark_model_loading().to_string(index=False))
@@ -0,0 +1,259 @@
+"""Out-of-core training that streams Parquet row groups into XGBoost."""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import xgboost as xgb
+
+from src.config import (
+    MODEL_METADATA_FILE,
+    MODEL_NATIVE_FILE,
+    PARQUET_ROW_GROUP_SIZE,
+    X_FEATURES_FILE,
+    XGB_PARAMS,
+    Y_TARGET_FILE
+)
+from src.data_preprocessing.feature_store import parquet_parts, read_match_keys
+from src.models.model_io import hash_files, save_model
+from src.models.tune import load_training_params, native_params
+
+logger = logging.getLogger(__name__)
+
+
+def _row_group_batches(path: Path, batch_size: int):
+    """Record batches of at most `batch_size` rows, decoding one row group at a time."""
+    for part in parquet_parts(path):
+        parquet_file = pq.ParquetFile(part)
+        for i in range(parquet_file.num_row_groups):
+            yield from parquet_file.read_row_group(i).to_batches(max_chunksize=batch_size)
+
+
+def parquet_row_batches(
+    x_path: Path,
+    y_path: Path,
+    start: int,
+    stop: int,
+    batch_size: int
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Yield aligned feature and target batches for rows start:stop.
+
+    Row groups are decoded one at a time (ParquetFile.iter_batches reads
+    ahead across row groups), so memory use is bounded by the row-group size
+    of the files and `batch_size`, not by the file size.
+    """
+    y_batches = _row_group_batches(y_path, batch_size)
+    y_buffer = np.empty(0, dtype=np.int64)
+    offset = 0
+
+    for x_batch in _row_group_batches(x_path, batch_size):
+        n_rows = x_batch.num_rows
+        while len(y_buffer) < n_rows:
+            y_buffer = np.concatenate((y_buffer, next(y_batches).column(0).to_numpy()))
+        y_batch, y_buffer = y_buffer[:n_rows], y_buffer[n_rows:]
+
+        lo, hi = max(start - offset, 0), min(stop - offset, n_rows)
+        offset += n_rows
+        if lo < hi:
+            yield x_batch.slice(lo, hi - lo).to_pandas(), y_batch[lo:hi]
+        if offset >= stop:
+            break
+
+
+class ParquetBatchIter(xgb.DataIter):
+    """XGBoost data iterator over a row range of the feature and target Parquet files."""
+
+    def __init__(
+        self,
+        x_path: Path,
+        y_path: Path,
+        start: int,
+        stop: int,
+        batch_size: int,
+        cache_prefix: Optional[str] = None
+    ):
+        self.x_path = x_path
+        self.y_path = y_path
+        self.start = start
+        self.stop = stop
+        self.batch_size = batch_size
+        self._batches: Optional[Iterator] = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._batches is None:
+            self._batches = parquet_row_batches(self.x_path, self.y_path, self.start, self.stop, self.batch_size)
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        input_data(data=batch[0], label=batch[1])
+        return True
+
+    def reset(self):
+        self._batches = None
+
+
+def train_xgboost_streaming(
+    batch_size: int = PARQUET_ROW_GROUP_SIZE,
+    external_memory: bool = False,
+    x_file: Path = X_FEATURES_FILE,
+    y_file: Path = Y_TARGET_FILE,
+    model_file: Path = MODEL_NATIVE_FILE,
+    metadata_file: Path = MODEL_METADATA_FILE,
+    params: Optional[Dict] = None
+) -> xgb.Booster:
+    """
+    Train on the chronological 80/20 split without loading the feature matrix.
+
+    Batches are quantized into a QuantileDMatrix as they stream in, so only
+    the 1-byte bin indices of the full matrix stay resident. With
+    `external_memory` the quantized pages are cached on disk as well
+    (ExtMemQuantileDMatrix) and the in-memory footprint is one page.
+
+    Args:
+        batch_size: Rows per batch handed to XGBoost
+        external_memory: Keep the quantized matrix on disk instead of in memory
+        params: XGBClassifier parameters; defaults to the training parameters,
+            with XGB_PARAMS' round count when `n_estimators` is not given
+
+    Returns:
+        Trained Booster, also saved with its metadata sidecar
+    """
+    n_rows = sum(pq.ParquetFile(part).metadata.num_rows for part in parquet_parts(x_file))
+    split_idx = int(n_rows * 0.8)
+    params = params if params is not None else load_training_params()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_prefix = str(Path(cache_dir) / "cache") if external_memory else None
+        matrix_type = xgb.ExtMemQuantileDMatrix if external_memory else xgb.QuantileDMatrix
+
+        dtrain = matrix_type(ParquetBatchIter(x_file, y_file, 0, split_idx, batch_size, cache_prefix))
+        dval = matrix_type(ParquetBatchIter(x_file, y_file, split_idx, n_rows, batch_size, cache_prefix), ref=dtrain)
+        logger.info(f"Streamed {n_rows} rows in batches of {batch_size}")
+
+        evals_result = {}
+        start = time.perf_counter()
+        booster = xgb.train(
+            native_params(params, nthread=0),
+            dtrain,
+            num_boost_round=params.get("n_estimators", XGB_PARAMS["n_estimators"]),
+            evals=[(dval, "validation")],
+            evals_result=evals_result,
+            verbose_eval=False
+        )
+        training_seconds = time.perf_counter() - start
+        y_val = dval.get_label()
+        accuracy = float(np.mean(booster.predict(dval).argmax(axis=1) == y_val))
+        del dtrain, dval
+
+    logger.info(f"Validation Accuracy: {accuracy:.4f}")
+    save_model(
+        booster,
+        list(booster.feature_names or []),
+        hash_files(x_file, y_file),
+        {
+            "n_samples": n_rows,
+            "n_train_samples": split_idx,
+            "validation_accuracy": accuracy,
+            "validation_mlogloss": evals_result["validation"]["mlogloss"][-1],
+            "params": params,
+            "training_mode": "external_memory" if external_memory else "streaming",
+            "full_training_seconds": training_seconds,
+            "full_training_samples": split_idx
+        },
+        model_file,
+        metadata_file,
+        read_match_keys(x_file, n_rows)
+    )
+    return booster
+
+
+MEMORY_SNIPPET = """
+import json, resource, sys
+from pathlib import Path
+mode, x_path, y_path, out_dir, batch_size, params = sys.argv[1:7]
+params = json.loads(params)
+if mode == "in_memory":
+    import pandas as pd, xgboost as xgb
+    X, y = pd.read_parquet(x_path), pd.read_parquet(y_path)
+    split_idx = int(len(X) * 0.8)
+    xgb.XGBClassifier(**params).fit(X.iloc[:split_idx], y.iloc[:split_idx], eval_set=[(X.iloc[split_idx:], y.iloc[split_idx:])], verbose=False)
+else:
+    from src.models.out_of_core import train_xgboost_streaming
+    train_xgboost_streaming(int(batch_size), mode == "external_memory", Path(x_path), Path(y_path),
+                            Path(out_dir) / "m.ubj", Path(out_dir) / "m.meta.json", params)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def benchmark_training_memory(
+    n_rows: int = 2_000_000,
+    batch_size: int = PARQUET_ROW_GROUP_SIZE,
+    n_rounds: int = 10
+) -> pd.DataFrame:
+    """
+    Peak RSS of in-memory, streaming and external-memory training on synthetic data.
+
+    Each mode trains `n_rounds` rounds in a fresh interpreter on a generated
+    feature file with the project's column layout, written in row groups of
+    `batch_size`.
+    """
+    import json
+    import subprocess
+    import sys
+    import time
+
+    import pyarrow as pa
+
+    from src.data_preprocessing.form_engine import FEATURE_COLUMNS
+
+    params = json.dumps({**load_training_params(), "n_estimators": n_rounds})
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        work = Path(work_dir)
+        rng = np.random.default_rng(0)
+        x_path, y_path = work / "X.parquet", work / "y.parquet"
+        with pq.ParquetWriter(x_path, pa.schema([(name, pa.float64()) for name in FEATURE_COLUMNS])) as x_writer, \
+                pq.ParquetWriter(y_path, pa.schema([("target", pa.int64())])) as y_writer:
+            for start in range(0, n_rows, batch_size):
+                size = min(batch_size, n_rows - start)
+                x_writer.write_table(pa.table({name: rng.normal(size=size) for name in FEATURE_COLUMNS}))
+                y_writer.write_table(pa.table({"target": rng.integers(0, 3, size=size)}))
+
+        for mode in ("in_memory", "streaming", "external_memory"):
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, "-W", "ignore", "-c", MEMORY_SNIPPET, mode, str(x_path), str(y_path), str(work), str(batch_size), params],
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout
+            results.append({
+                "mode": mode,
+                "rows": n_rows,
+                "peak_rss_mb": int(output.strip().splitlines()[-1]) / 1024,
+                "seconds": time.perf_counter() - start
+            })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Train from Parquet row groups without loading the feature matrix.")
+    parser.add_argument("--batch-size", type=int, default=PARQUET_ROW_GROUP_SIZE)
+    parser.add_argument("--external-memory", action="store_true", help="Cache quantized pages on disk")
+    parser.add_argument("--benchmark", type=int, default=None, metavar="ROWS", help="Compare peak memory on synthetic data instead")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        logger.info("\n" + benchmark_training_memory(args.benchmark, args.batch_size).to_string(index=False))
+    else:
+        train_xgboost_streaming(args.batch_size, args.external_memory)
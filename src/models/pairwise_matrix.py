@@ -0,0 +1,151 @@
+"""Precomputed home/away probability tensor for every pairing of teams."""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    CLEANED_DATA_FILE,
+    MODELS_DIR,
+    PAIRWISE_INDEX_FILE,
+    PAIRWISE_PROBABILITIES_FILE
+)
+from src.data_preprocessing.form_index import FormIndex
+from src.data_preprocessing.parallel_features import match_seasons
+from src.models.model_io import resolve_model_file
+from src.models.prediction_utils import PROBABILITY_COLUMNS, file_signature, prepare_fixture_features
+
+logger = logging.getLogger(__name__)
+
+
+class PairwiseProbabilities:
+    """
+    Probabilities for every (home, away) pairing, shaped teams x teams x 3.
+
+    Once every historical match is in the past, a fixture's features no longer
+    depend on its date, so one tensor answers every match after `history_end`.
+    """
+
+    def __init__(self, probabilities: np.ndarray, teams: List[str], history_end: pd.Timestamp):
+        self.probabilities = probabilities
+        self.teams = list(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.history_end = pd.Timestamp(history_end)
+
+    def covers(self, home_team: str, away_team: str, match_date) -> bool:
+        """Whether the tensor holds the answer for this fixture."""
+        return (
+            home_team != away_team
+            and home_team in self.team_index
+            and away_team in self.team_index
+            and pd.Timestamp(match_date) > self.history_end
+        )
+
+    def lookup(self, home_team: str, away_team: str) -> np.ndarray:
+        """Away-win, draw and home-win probabilities for a pairing."""
+        return np.asarray(self.probabilities[self.team_index[home_team], self.team_index[away_team]])
+
+    def save(
+        self,
+        probabilities_path: Path = PAIRWISE_PROBABILITIES_FILE,
+        index_path: Path = PAIRWISE_INDEX_FILE,
+        model_file: Optional[Path] = None,
+        data_file: Path = CLEANED_DATA_FILE
+    ):
+        """Write the tensor as .npy with a JSON sidecar of teams and source-file signatures."""
+        model_file = model_file if model_file is not None else resolve_model_file()
+        probabilities_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(probabilities_path, np.ascontiguousarray(self.probabilities))
+        index_path.write_text(json.dumps({
+            "teams": self.teams,
+            "columns": PROBABILITY_COLUMNS,
+            "history_end": self.history_end.isoformat(),
+            "model_signature": list(file_signature(model_file)),
+            "data_signature": list(file_signature(data_file))
+        }, indent=2))
+
+
+def build_pairwise_probabilities(
+    model,
+    history: pd.DataFrame,
+    form_index: Optional[FormIndex] = None
+) -> PairwiseProbabilities:
+    """
+    Score every pairing of the current season's teams in one batched model call.
+
+    Only teams that played in the season of the last historical match are
+    included, so the tensor stays one league's size however long or wide the
+    history is. Other fixtures fall back to the feature path.
+
+    Args:
+        model: Trained classifier with predict_proba
+        history: Cleaned historical matches
+        form_index: FormIndex over `history`, reused for the features when given
+
+    Returns:
+        PairwiseProbabilities valid for any date after the last historical match
+    """
+    seasons = match_seasons(history["match_date"])
+    current = history[seasons == seasons.max()] if len(history) else history
+    teams = sorted(set(current["home_team"]) | set(current["away_team"]))
+    n_teams = len(teams)
+    history_end = pd.Timestamp(pd.to_datetime(history["match_date"]).max())
+
+    home_idx, away_idx = np.nonzero(~np.eye(n_teams, dtype=bool))
+    fixtures = pd.DataFrame({
+        "home_team": np.asarray(teams, dtype=object)[home_idx],
+        "away_team": np.asarray(teams, dtype=object)[away_idx],
+        "match_date": history_end + pd.Timedelta(days=1)
+    })
+
+    probabilities = np.full((n_teams, n_teams, 3), np.nan)
+    if len(fixtures):
+        features = prepare_fixture_features(fixtures, form_index if form_index is not None else history)
+        probabilities[home_idx, away_idx] = model.predict_proba(features)
+
+    return PairwiseProbabilities(probabilities, teams, history_end)
+
+
+def load_pairwise_probabilities(
+    probabilities_path: Path = PAIRWISE_PROBABILITIES_FILE,
+    index_path: Path = PAIRWISE_INDEX_FILE,
+    model_file: Optional[Path] = None,
+    data_file: Path = CLEANED_DATA_FILE
+):
+    """
+    Memory-map a persisted tensor so worker processes share one copy.
+
+    Returns:
+        PairwiseProbabilities, or None when the files are missing or were built
+        from a different model or data file
+    """
+    if not probabilities_path.exists() or not index_path.exists():
+        return None
+    model_file = model_file if model_file is not None else resolve_model_file()
+
+    index = json.loads(index_path.read_text())
+    if (
+        not model_file.exists()
+        or not data_file.exists()
+        or index["model_signature"] != list(file_signature(model_file))
+        or index["data_signature"] != list(file_signature(data_file))
+    ):
+        return None
+
+    probabilities = np.load(probabilities_path, mmap_mode="r")
+    return PairwiseProbabilities(probabilities, index["teams"], pd.Timestamp(index["history_end"]))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from src.models.prediction_utils import get_predictor
+
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    predictor = get_predictor()
+    pairwise = build_pairwise_probabilities(predictor.model, predictor.history)
+    pairwise.save()
+    logger.info(f"Saved {len(pairwise.teams)}x{len(pairwise.teams)} probability tensor to {PAIRWISE_PROBABILITIES_FILE}")
@@ -0,0 +1,176 @@
+"""Permutation importance on the validation split, scored in parallel workers."""
+
+import argparse
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    PERMUTATION_IMPORTANCE_CSV,
+    RANDOM_SEED,
+    REPORTS_DIR,
+    X_FEATURES_FILE,
+    Y_TARGET_FILE
+)
+from src.models.model_io import resolve_model_file
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set up once by _init_worker: the model, the memory-mapped validation split
+# and one writable working copy of it whose columns are shuffled in place
+_worker: Dict = {}
+
+
+def _init_worker(model_file: str, x_path: str, y_path: str, nthread: int):
+    from src.models.model_io import load_model
+
+    model = load_model(Path(model_file))
+    model.get_booster().set_param({"nthread": nthread})
+    X = np.load(x_path, mmap_mode="r")
+    _worker.update(model=model, X=X, y=np.load(y_path, mmap_mode="r"), work=np.array(X))
+
+
+def _scores(y: np.ndarray, probabilities: np.ndarray) -> Tuple[float, float]:
+    """Log-loss and accuracy of one set of predictions."""
+    picked = probabilities[np.arange(len(y)), y]
+    return -np.log(np.clip(picked, 1e-15, None)).mean(), (probabilities.argmax(axis=1) == y).mean()
+
+
+def _permute_feature(column: int, n_repeats: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """
+    Score each repeat of one shuffled column.
+
+    Every repeat shuffles `column` of the worker's single working copy in
+    place and scores it, so memory stays at one copy of the split however
+    many repeats there are. The column is restored afterwards.
+    """
+    X, y, work = _worker["X"], np.asarray(_worker["y"]), _worker["work"]
+    rng = np.random.default_rng(seed)
+
+    scores = []
+    for _ in range(n_repeats):
+        work[:, column] = rng.permutation(X[:, column])
+        scores.append(_scores(y, _worker["model"].predict_proba(work)))
+    work[:, column] = X[:, column]
+
+    log_loss, accuracy = np.array(scores).T
+    return {"log_loss": log_loss, "accuracy": accuracy}
+
+
+def _mean_interval(values: np.ndarray, t: float):
+    """Mean of the repeats and its t-interval."""
+    mean = values.mean()
+    margin = t * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else np.nan
+    return mean, mean - margin, mean + margin
+
+
+def permutation_importance(
+    X: Optional[pd.DataFrame] = None,
+    y: Optional[pd.Series] = None,
+    model_file: Optional[Path] = None,
+    n_repeats: int = 30,
+    confidence: float = 0.95,
+    n_jobs: int = -1,
+    nthread: int = 1,
+    seed: int = RANDOM_SEED
+) -> pd.DataFrame:
+    """
+    Drop in validation performance when each feature is shuffled.
+
+    The chronological validation split (last 20% of rows) is written once to
+    .npy files that every worker memory-maps read-only; a worker loads the
+    model once, keeps one working copy whose columns it shuffles in place,
+    and handles whole features. Each feature's shuffles come from
+    its own child seed, so results do not depend on `n_jobs`.
+
+    Args:
+        X: Feature matrix in chronological order; defaults to X_FEATURES_FILE
+        y: Encoded targets aligned with X; defaults to Y_TARGET_FILE
+        model_file: Model to score; defaults to the trained model
+        n_repeats: Shuffles per feature
+        confidence: Coverage of the interval around the mean importance
+        n_jobs: Worker processes; 1 scores in this process, -1 uses every core
+        nthread: XGBoost threads per worker
+        seed: Seed for the shuffles
+
+    Returns:
+        DataFrame with one row per feature, sorted by importance: the mean
+        increase in log-loss with its interval and standard deviation, and the
+        mean drop in accuracy with its interval
+    """
+    from scipy import stats
+
+    if X is None:
+        X = pd.read_parquet(X_FEATURES_FILE)
+    if y is None:
+        y = pd.read_parquet(Y_TARGET_FILE).iloc[:, 0]
+    model_file = model_file if model_file is not None else resolve_model_file()
+
+    split_idx = int(len(X) * 0.8)
+    features = list(X.columns)
+    seeds = np.random.SeedSequence(seed).spawn(len(features))
+
+    with tempfile.TemporaryDirectory() as shared_dir:
+        x_path = str(Path(shared_dir) / "X_val.npy")
+        y_path = str(Path(shared_dir) / "y_val.npy")
+        np.save(x_path, np.ascontiguousarray(X.iloc[split_idx:].to_numpy(dtype=np.float32)))
+        np.save(y_path, np.asarray(y.iloc[split_idx:], dtype=np.int64))
+        init_args = (str(model_file), x_path, y_path, nthread)
+
+        if n_jobs == 1:
+            _init_worker(*init_args)
+            results = [_permute_feature(i, n_repeats, seeds[i]) for i in range(len(features))]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs if n_jobs > 0 else None,
+                initializer=_init_worker,
+                initargs=init_args
+            ) as executor:
+                futures = [executor.submit(_permute_feature, i, n_repeats, seeds[i]) for i in range(len(features))]
+                results = [future.result() for future in futures]
+            _init_worker(*init_args)
+        baseline_loss, baseline_accuracy = _scores(np.asarray(_worker["y"]), _worker["model"].predict_proba(_worker["work"]))
+        _worker.clear()
+
+    t = stats.t.ppf(0.5 + confidence / 2, df=max(n_repeats - 1, 1))
+    rows = []
+    for feature, scores in zip(features, results):
+        loss_increase = scores["log_loss"] - baseline_loss
+        accuracy_drop = baseline_accuracy - scores["accuracy"]
+        importance, lower, upper = _mean_interval(loss_increase, t)
+        accuracy_mean, accuracy_lower, accuracy_upper = _mean_interval(accuracy_drop, t)
+        rows.append({
+            "feature": feature,
+            "importance": importance,
+            "lower": lower,
+            "upper": upper,
+            "std": loss_increase.std(ddof=1) if n_repeats > 1 else np.nan,
+            "accuracy_drop": accuracy_mean,
+            "accuracy_drop_lower": accuracy_lower,
+            "accuracy_drop_upper": accuracy_upper
+        })
+
+    logger.info(f"Permuted {len(features)} features x {n_repeats} repeats on {len(X) - split_idx} validation rows")
+    return pd.DataFrame(rows).sort_values("importance", ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Permutation importance on the validation split.")
+    parser.add_argument("--repeats", type=int, default=30, help="Shuffles per feature")
+    parser.add_argument("--jobs", type=int, default=-1, help="Worker processes, one feature at a time each")
+    parser.add_argument("--nthread", type=int, default=1, help="XGBoost threads per worker")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    args = parser.parse_args()
+
+    importances = permutation_importance(n_repeats=args.repeats, n_jobs=args.jobs, nthread=args.nthread, seed=args.seed)
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    importances.to_csv(PERMUTATION_IMPORTANCE_CSV, index=False)
+    logger.info("\n" + importances.to_string(index=False))
+    logger.info(f"Permutation importances saved to {PERMUTATION_IMPORTANCE_CSV}")
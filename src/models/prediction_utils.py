@@ -1,34 +1,32 @@
 """Utilities for making predictions with the trained model."""
 
 import logging
-import joblib
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
-from src.config import MODEL_FILE, CLEANED_DATA_FILE
-from src.data_preprocessing.feature_engineering import calculate_rolling_stats
+from src.config import CLEANED_DATA_FILE, EXPLANATIONS_FILE, PAIRWISE_INDEX_FILE, PAIRWISE_PROBABILITIES_FILE
+from src.data_preprocessing.form_engine import form_stats_as_of, match_feature_frame
+from src.data_preprocessing.form_index import FormIndex, build_form_index
+from src.data_preprocessing.ratings import RATING_COLUMNS, EloRatings
+from src.models.model_io import CLASS_NAMES, load_model, load_serving_model, resolve_model_file
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def load_trained_model():
-    """Load the trained XGBoost model."""
-    if not MODEL_FILE.exists():
-        raise FileNotFoundError(
-            f"Model file not found at {MODEL_FILE}. "
-            "Please train the model first by running: python create_model.py"
-        )
-    return joblib.load(MODEL_FILE)
+def load_trained_model(model_file: Optional[Path] = None):
+    """Load the trained XGBoost model, preferring the native format over the legacy pickle."""
+    return load_model(model_file)
 
 
 def prepare_single_match_features(
     home_team: str,
     away_team: str,
     match_date: datetime,
-    historical_data: pd.DataFrame
+    historical_data: Union[pd.DataFrame, FormIndex],
+    ratings: Optional[EloRatings] = None
 ) -> pd.DataFrame:
     """
     Prepare features for a single match prediction.
@@ -37,66 +35,84 @@ def prepare_single_match_features(
         home_team: Name of home team
         away_team: Name of away team
         match_date: Date of the match
-        historical_data: Historical match data for calculating rolling stats
+        historical_data: Historical match data, or a prebuilt FormIndex over it
+        ratings: Elo state built from the same history; adds rating columns when given
     
     Returns:
         DataFrame with single row of features
     """
     match_date = pd.to_datetime(match_date)
     
-    home_stats = calculate_rolling_stats(historical_data, home_team, True, match_date)
-    away_stats = calculate_rolling_stats(historical_data, away_team, False, match_date)
-    
-    feature_dict = {
-        "home_goals_scored_avg": home_stats["goals_scored"],
-        "home_goals_conceded_avg": home_stats["goals_conceded"],
-        "home_points_avg": home_stats["points"],
-        "home_home_goals_scored_avg": home_stats["home_goals_scored"],
-        "home_home_goals_conceded_avg": home_stats["home_goals_conceded"],
-        "home_home_points_avg": home_stats["home_points"],
-        "away_goals_scored_avg": away_stats["goals_scored"],
-        "away_goals_conceded_avg": away_stats["goals_conceded"],
-        "away_points_avg": away_stats["points"],
-        "away_away_goals_scored_avg": away_stats["away_goals_scored"],
-        "away_away_goals_conceded_avg": away_stats["away_goals_conceded"],
-        "away_away_points_avg": away_stats["away_points"],
-        "goals_scored_diff": home_stats["goals_scored"] - away_stats["goals_scored"],
-        "goals_conceded_diff": home_stats["goals_conceded"] - away_stats["goals_conceded"],
-        "points_diff": home_stats["points"] - away_stats["points"]
-    }
+    if isinstance(historical_data, FormIndex):
+        home_stats = historical_data.team_stats(home_team, match_date)
+        away_stats = historical_data.team_stats(away_team, match_date)
+    else:
+        from src.data_preprocessing.feature_engineering import calculate_rolling_stats
+        
+        home_stats = calculate_rolling_stats(historical_data, home_team, True, match_date)
+        away_stats = calculate_rolling_stats(historical_data, away_team, False, match_date)
+    
+    features = match_feature_frame(home_stats, away_stats)
     
-    return pd.DataFrame([feature_dict])
+    if ratings is not None:
+        rating_features = ratings.rating_features(home_team, away_team, match_date)
+        for column in RATING_COLUMNS:
+            features[column] = rating_features[column]
+    
+    return features
 
 
-def predict_match(home_team: str, away_team: str, match_date: datetime) -> Dict:
+def prepare_fixture_features(
+    fixtures_df: pd.DataFrame,
+    history_df: Union[pd.DataFrame, FormIndex],
+    ratings: Optional[EloRatings] = None
+) -> pd.DataFrame:
     """
-    Predict match outcome for a given match.
+    Prepare features for many fixtures at once with a point-in-time join.
     
     Args:
-        home_team: Name of home team
-        away_team: Name of away team
-        match_date: Date of the match
+        fixtures_df: DataFrame with columns home_team, away_team, match_date
+        history_df: Historical match data, or a prebuilt FormIndex over it; only matches before each fixture's date are used
+        ratings: Elo state built from the same history; adds rating columns when given
     
     Returns:
-        Dictionary with prediction results
+        DataFrame with one row of features per fixture, in fixture order
     """
-    model = load_trained_model()
-    
-    historical_data = pd.read_csv(CLEANED_DATA_FILE)
-    historical_data["match_date"] = pd.to_datetime(historical_data["match_date"])
+    n_fixtures = len(fixtures_df)
+    match_dates = pd.to_datetime(fixtures_df["match_date"]).reset_index(drop=True)
     
-    X = prepare_single_match_features(home_team, away_team, match_date, historical_data)
+    teams = pd.concat([fixtures_df["home_team"], fixtures_df["away_team"]], ignore_index=True)
+    as_of = pd.concat([match_dates, match_dates], ignore_index=True)
+    if isinstance(history_df, FormIndex):
+        stats = history_df.stats_as_of(teams, as_of)
+    else:
+        stats = form_stats_as_of(history_df, teams, as_of)
+    home_stats = {stat: values[:n_fixtures] for stat, values in stats.items()}
+    away_stats = {stat: values[n_fixtures:] for stat, values in stats.items()}
     
-    probabilities = model.predict_proba(X)[0]
-    predicted_class = model.predict(X)[0]
+    features = match_feature_frame(home_stats, away_stats)
     
-    class_names = ["Away Win", "Draw", "Home Win"]
+    if ratings is not None:
+        rating_rows = [
+            ratings.rating_features(home, away, date)
+            for home, away, date in zip(fixtures_df["home_team"], fixtures_df["away_team"], match_dates)
+        ]
+        for column in RATING_COLUMNS:
+            features[column] = [row[column] for row in rating_rows]
     
-    result = {
+    return features
+
+
+PROBABILITY_COLUMNS = ["prob_away_win", "prob_draw", "prob_home_win"]
+
+
+def format_prediction(home_team: str, away_team: str, match_date, probabilities: np.ndarray) -> Dict:
+    """Build the prediction result dictionary from class probabilities."""
+    return {
         "home_team": home_team,
         "away_team": away_team,
-        "match_date": match_date.strftime("%Y-%m-%d"),
-        "predicted_outcome": class_names[predicted_class],
+        "match_date": pd.Timestamp(match_date).strftime("%Y-%m-%d"),
+        "predicted_outcome": CLASS_NAMES[int(np.argmax(probabilities))],
         "probabilities": {
             "Away Win": float(probabilities[0]),
             "Draw": float(probabilities[1]),
@@ -108,6 +124,263 @@ def predict_match(home_team: str, away_team: str, match_date: datetime) -> Dict:
             "Home Win": f"{probabilities[2] * 100:.1f}%"
         }
     }
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    """Modification time and size of a file, used to detect changes."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Predictor:
+    """
+    Long-lived predictor that keeps the model and indexed history in memory.
+    
+    Each call checks the model and data files' modification time and size,
+    and reloads only what changed. Without an explicit `model_file`, the
+    model path is resolved again on every check, so a native model written
+    after startup replaces the legacy pickle. The model is served from its exported
+    NumPy tree arrays when they are current, so xgboost is never imported.
+    With `use_pairwise`, single-match queries between current-season teams
+    after the last historical match are answered from a precomputed
+    all-pairs probability tensor, memory-mapped from `pairwise_file` and
+    built and saved there when missing or stale. Explanations are served from a cache of
+    feature contributions keyed by model version and feature row.
+    """
+    
+    def __init__(
+        self,
+        model_file: Optional[Path] = None,
+        data_file: Path = CLEANED_DATA_FILE,
+        use_pairwise: bool = False,
+        explanations_file: Path = EXPLANATIONS_FILE,
+        pairwise_file: Path = PAIRWISE_PROBABILITIES_FILE,
+        pairwise_index_file: Path = PAIRWISE_INDEX_FILE
+    ):
+        self._fixed_model_file = model_file
+        self.model_file = model_file if model_file is not None else resolve_model_file()
+        self.data_file = data_file
+        self.use_pairwise = use_pairwise
+        self.explanations_file = explanations_file
+        self.pairwise_file = pairwise_file
+        self.pairwise_index_file = pairwise_index_file
+        self._pairwise = None
+        self._explainer = None
+        self._model = None
+        self._model_signature = None
+        self._history = None
+        self._form_index = None
+        self._data_signature = None
+    
+    def refresh(self):
+        """Reload the model or history if their files changed since the last load."""
+        changed = False
+        
+        if self._fixed_model_file is None:
+            self.model_file = resolve_model_file()
+        model_signature = (self.model_file, file_signature(self.model_file) if self.model_file.exists() else None)
+        if self._model is None or model_signature != self._model_signature:
+            self._model = load_serving_model(self.model_file)
+            self._model_signature = model_signature
+            if self._explainer is not None:
+                self._explainer.close()
+            self._explainer = None
+            changed = True
+            logger.info(f"Loaded model from {self.model_file}")
+        
+        data_signature = file_signature(self.data_file)
+        if self._history is None or data_signature != self._data_signature:
+            history = pd.read_csv(self.data_file)
+            history["match_date"] = pd.to_datetime(history["match_date"])
+            self._history = history
+            self._form_index = build_form_index(history)
+            self._data_signature = data_signature
+            changed = True
+            logger.info(f"Indexed {len(history)} historical matches from {self.data_file}")
+        
+        if changed and self.use_pairwise:
+            from src.models.pairwise_matrix import build_pairwise_probabilities, load_pairwise_probabilities
+            
+            paths = dict(
+                probabilities_path=self.pairwise_file,
+                index_path=self.pairwise_index_file,
+                model_file=self.model_file,
+                data_file=self.data_file
+            )
+            self._pairwise = load_pairwise_probabilities(**paths)
+            if self._pairwise is None:
+                pairwise = build_pairwise_probabilities(self._model, self._history, self._form_index)
+                pairwise.save(**paths)
+                self._pairwise = load_pairwise_probabilities(**paths) or pairwise
+                logger.info(f"Saved {len(pairwise.teams)}x{len(pairwise.teams)} probability tensor to {self.pairwise_file}")
+    
+    @property
+    def model(self):
+        self.refresh()
+        return self._model
+    
+    @property
+    def history(self) -> pd.DataFrame:
+        self.refresh()
+        return self._history
+    
+    @property
+    def explainer(self):
+        self.refresh()
+        if self._explainer is None:
+            from src.models.explanations import MatchExplainer
+            
+            self._explainer = MatchExplainer(self.model_file, self.explanations_file)
+        return self._explainer
+    
+    def predict(self, home_team: str, away_team: str, match_date: datetime) -> Dict:
+        """
+        Predict match outcome for a single match.
+        
+        Args:
+            home_team: Name of home team
+            away_team: Name of away team
+            match_date: Date of the match
+        
+        Returns:
+            Dictionary with prediction results
+        """
+        self.refresh()
+        if self._pairwise is not None and self._pairwise.covers(home_team, away_team, match_date):
+            probabilities = self._pairwise.lookup(home_team, away_team)
+        else:
+            X = prepare_single_match_features(home_team, away_team, match_date, self._form_index)
+            probabilities = self._model.predict_proba(X)[0]
+        return format_prediction(home_team, away_team, match_date, probabilities)
     
-    return result
+    def predict_frame(self, fixtures: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict outcomes for many matches with one feature build and one model call.
+        
+        Args:
+            fixtures: DataFrame with columns home_team, away_team, match_date
+        
+        Returns:
+            DataFrame with the fixture columns, PROBABILITY_COLUMNS and predicted_outcome
+        """
+        self.refresh()
+        result = pd.DataFrame({
+            "home_team": fixtures["home_team"].to_numpy(),
+            "away_team": fixtures["away_team"].to_numpy(),
+            "match_date": pd.to_datetime(fixtures["match_date"]).to_numpy()
+        })
+        if len(fixtures) == 0:
+            for column in PROBABILITY_COLUMNS:
+                result[column] = pd.Series(dtype=float)
+            result["predicted_outcome"] = pd.Series(dtype=object)
+            return result
+        
+        X = prepare_fixture_features(fixtures, self._form_index)
+        probabilities = self._model.predict_proba(X)
+        for i, column in enumerate(PROBABILITY_COLUMNS):
+            result[column] = probabilities[:, i]
+        result["predicted_outcome"] = np.asarray(CLASS_NAMES, dtype=object)[probabilities.argmax(axis=1)]
+        return result
+    
+    def predict_many(self, fixtures: pd.DataFrame) -> List[Dict]:
+        """
+        Predict outcomes for several matches and return them as result dictionaries.
+        
+        Args:
+            fixtures: DataFrame with columns home_team, away_team, match_date
+        
+        Returns:
+            List of prediction dictionaries in fixture order
+        """
+        frame = self.predict_frame(fixtures)
+        probabilities = frame[PROBABILITY_COLUMNS].to_numpy()
+        return [
+            format_prediction(home, away, date, probs)
+            for home, away, date, probs in zip(frame["home_team"], frame["away_team"], frame["match_date"], probabilities)
+        ]
+    
+    def explain(self, home_team: str, away_team: str, match_date: datetime) -> Dict:
+        """
+        Predict a single match along with each feature's contribution to each outcome.
+        
+        A fixture already explained for the current model, for example as part
+        of an explain_many call on its gameweek, is a cache lookup. A miss is
+        buffered and written to the cache file with later ones.
+        
+        Returns:
+            Prediction dictionary with a "contributions" DataFrame of features x outcomes
+        """
+        from src.models.explanations import explanation_frame
+        
+        explainer = self.explainer
+        X = prepare_single_match_features(home_team, away_team, match_date, self._form_index)
+        contributions, probabilities = explainer.explain_rows(X)
+        result = format_prediction(home_team, away_team, match_date, probabilities[0])
+        result["contributions"] = explanation_frame(contributions[0], explainer.feature_names)
+        return result
+    
+    def explain_many(self, fixtures: pd.DataFrame) -> List[Dict]:
+        """
+        Explain a whole gameweek with one batched contribution call for the uncached fixtures.
+        
+        Args:
+            fixtures: DataFrame with columns home_team, away_team, match_date
+        
+        Returns:
+            List of explained prediction dictionaries in fixture order
+        """
+        from src.models.explanations import explanation_frame
+        
+        if len(fixtures) == 0:
+            return []
+        
+        explainer = self.explainer
+        contributions, probabilities = explainer.explain_rows(prepare_fixture_features(fixtures, self._form_index))
+        explainer.flush()
+        results = []
+        for i, (home, away, date) in enumerate(zip(fixtures["home_team"], fixtures["away_team"], fixtures["match_date"])):
+            result = format_prediction(home, away, date, probabilities[i])
+            result["contributions"] = explanation_frame(contributions[i], explainer.feature_names)
+            results.append(result)
+        return results
+
+
+_default_predictor: Optional[Predictor] = None
+
+
+def get_predictor() -> Predictor:
+    """Shared module-level Predictor, answering single-match queries from the pairwise tensor."""
+    global _default_predictor
+    if _default_predictor is None:
+        _default_predictor = Predictor(use_pairwise=True)
+    return _default_predictor
+
+
+def predict_match(home_team: str, away_team: str, match_date: datetime) -> Dict:
+    """
+    Predict match outcome for a given match.
+    
+    Args:
+        home_team: Name of home team
+        away_team: Name of away team
+        match_date: Date of the match
+    
+    Returns:
+        Dictionary with prediction results
+    """
+    return get_predictor().predict(home_team, away_team, match_date)
 
+
+def predict_matches(fixtures: pd.DataFrame, predictor: Optional[Predictor] = None) -> pd.DataFrame:
+    """
+    Predict a whole gameweek or season of fixtures in one batch.
+    
+    Args:
+        fixtures: DataFrame with columns home_team, away_team, match_date
+        predictor: Predictor to use; defaults to the shared module-level instance
+    
+    Returns:
+        DataFrame with one row per fixture and its class probabilities
+    """
+    predictor = predictor if predictor is not None else get_predictor()
+    return predictor.predict_frame(fixtures)
@@ -0,0 +1,160 @@
+"""Cached, parallel rendering of the evaluation and feature-importance reports."""
+
+import argparse
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.config import (
+    CONFUSION_MATRIX_PNG,
+    FEATURE_IMPORTANCE_CSV,
+    FEATURE_IMPORTANCE_PNG,
+    METRICS_JSON,
+    MODEL_METADATA_FILE,
+    MODEL_NATIVE_FILE,
+    REPORTS_DIR,
+    X_FEATURES_FILE,
+    Y_TARGET_FILE
+)
+from src.models.model_io import hash_files
+
+logger = logging.getLogger(__name__)
+
+
+def render_evaluation(model_file: Path, metadata_file: Path, x_file: Path, y_file: Path, output_dir: Path) -> Dict:
+    """Validation metrics with bootstrap intervals, and the confusion matrix plot."""
+    import numpy as np
+    import pandas as pd
+
+    from src.models.evaluate_model import compute_evaluation_metrics, plot_confusion_matrix
+    from src.models.model_io import load_model
+
+    metrics = compute_evaluation_metrics(
+        load_model(model_file, metadata_file),
+        pd.read_parquet(x_file),
+        pd.read_parquet(y_file)
+    )
+    plot_confusion_matrix(np.asarray(metrics["confusion_matrix"]), output_dir / CONFUSION_MATRIX_PNG.name)
+    return metrics
+
+
+def render_feature_importance(model_file: Path, metadata_file: Path, x_file: Path, y_file: Path, output_dir: Path) -> Dict:
+    """Feature importance table and bar plot."""
+    from src.models.feature_importance import extract_feature_importances, plot_feature_importances
+    from src.models.model_io import load_model
+
+    df = extract_feature_importances(load_model(model_file, metadata_file), output_dir / FEATURE_IMPORTANCE_CSV.name)
+    plot_feature_importances(df=df, path=output_dir / FEATURE_IMPORTANCE_PNG.name)
+    return {"feature_importances": {row.feature: float(row.importance) for row in df.itertuples()}}
+
+
+# Report name -> (render function, output file names inside the reports directory)
+REPORTS = {
+    "evaluation": (render_evaluation, [CONFUSION_MATRIX_PNG.name]),
+    "feature_importance": (render_feature_importance, [FEATURE_IMPORTANCE_CSV.name, FEATURE_IMPORTANCE_PNG.name])
+}
+
+
+def report_key(name: str, model_hash: str, data_hash: str) -> str:
+    """Cache key of one report: its name, the model contents and the data contents."""
+    return hashlib.sha256(f"{name}:{model_hash}:{data_hash}".encode()).hexdigest()
+
+
+def _render(name: str, *paths: Path) -> Dict:
+    return REPORTS[name][0](*paths)
+
+
+def build_reports(
+    names: Optional[Sequence[str]] = None,
+    force: bool = False,
+    n_jobs: int = 2,
+    model_file: Path = MODEL_NATIVE_FILE,
+    metadata_file: Path = MODEL_METADATA_FILE,
+    x_file: Path = X_FEATURES_FILE,
+    y_file: Path = Y_TARGET_FILE,
+    output_dir: Path = REPORTS_DIR,
+    metrics_file: Path = METRICS_JSON
+) -> Dict[str, str]:
+    """
+    Render the reports whose model or data changed and write the metrics JSON.
+
+    Each report is keyed on the hash of the model file plus the hash of the
+    feature and target files. A report whose key matches the one recorded in
+    `metrics_file` and whose outputs all exist is skipped; the rest render
+    side by side in worker processes with matplotlib's Agg backend. The
+    metrics file carries every report's summary (validation metrics with
+    bootstrap intervals, confusion matrix, feature importances) so dashboards
+    can read them without loading images or the model.
+
+    Args:
+        names: Reports to build; all of REPORTS when empty
+        force: Re-render even when the keys match
+        n_jobs: Worker processes; 1 renders in this process
+        output_dir: Directory the report files are written to
+        metrics_file: JSON file with the hashes, keys and summaries of every report
+
+    Returns:
+        Dictionary mapping report name to "rendered" or "skipped"
+    """
+    names = list(names) if names else list(REPORTS)
+    unknown = set(names) - set(REPORTS)
+    if unknown:
+        raise ValueError(f"Unknown reports: {sorted(unknown)}")
+
+    model_hash = hash_files(model_file)
+    data_hash = hash_files(x_file, y_file)
+    previous = json.loads(metrics_file.read_text()).get("reports", {}) if metrics_file.exists() else {}
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    status: Dict[str, str] = {}
+    stale: List[str] = []
+    for name in names:
+        key = report_key(name, model_hash, data_hash)
+        outputs_exist = all((output_dir / file_name).exists() for file_name in REPORTS[name][1])
+        if not force and outputs_exist and previous.get(name, {}).get("key") == key:
+            status[name] = "skipped"
+            logger.info(f"Report {name} is up to date")
+        else:
+            stale.append(name)
+
+    paths = (model_file, metadata_file, x_file, y_file, output_dir)
+    if n_jobs == 1 or len(stale) <= 1:
+        summaries = [_render(name, *paths) for name in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(stale)) if n_jobs > 0 else None) as executor:
+            futures = [executor.submit(_render, name, *paths) for name in stale]
+            summaries = [future.result() for future in futures]
+
+    reports = {name: entry for name, entry in previous.items() if name in REPORTS}
+    for name, summary in zip(stale, summaries):
+        reports[name] = {
+            "key": report_key(name, model_hash, data_hash),
+            "outputs": REPORTS[name][1],
+            **summary
+        }
+        status[name] = "rendered"
+        logger.info(f"Report {name} rendered")
+
+    metrics_file.parent.mkdir(parents=True, exist_ok=True)
+    metrics_file.write_text(json.dumps(
+        {"model_hash": model_hash, "data_hash": data_hash, "reports": reports},
+        indent=2
+    ))
+    return status
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Render the evaluation reports that are out of date.")
+    parser.add_argument("names", nargs="*", help=f"Reports to build: {', '.join(REPORTS)}")
+    parser.add_argument("--force", action="store_true", help="Re-render even if the model and data are unchanged")
+    parser.add_argument("--jobs", type=int, default=2, help="Worker processes, one report each")
+    args = parser.parse_args()
+
+    status = build_reports(args.names, force=args.force, n_jobs=args.jobs)
+    logger.info(", ".join(f"{name}: {result}" for name, result in status.items()))
+    logger.info(f"Metrics saved to {METRICS_JSON}")
@@ -0,0 +1,197 @@
+"""Monte Carlo simulation of the remaining season from predicted match probabilities."""
+
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import ELO_K_FACTOR, RANDOM_SEED
+from src.models.prediction_utils import PROBABILITY_COLUMNS, Predictor, predict_matches
+
+logger = logging.getLogger(__name__)
+
+SIMULATION_CHUNK_SIZE = 10000
+
+
+def _simulate_chunk(
+    n_simulations: int,
+    seed: np.random.SeedSequence,
+    base_points: np.ndarray,
+    tiebreak: np.ndarray,
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    probabilities: np.ndarray,
+    rounds: List[np.ndarray],
+    form_feedback: bool,
+    k_factor: float
+) -> np.ndarray:
+    """
+    Simulate `n_simulations` seasons and count finishing positions.
+
+    With `form_feedback`, each simulation keeps an Elo-style rating offset
+    per team, moved by `k_factor` times how far each simulated result beat
+    the model's expectation, and later fixtures' win odds are scaled by
+    10 ** (offset difference / 400). This stands in for recomputing the
+    rolling-form features and re-scoring the model after every simulated
+    round, which is not done.
+
+    Returns:
+        Array of shape (n_teams, n_teams) where [team, position] counts finishes
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+    points = np.tile(base_points.astype(float), (n_simulations, 1))
+    form = np.zeros((n_simulations, n_teams))
+
+    for fixtures in rounds:
+        probs = np.broadcast_to(probabilities[fixtures], (n_simulations, len(fixtures), 3))
+        if form_feedback:
+            odds = 10.0 ** ((form[:, home_idx[fixtures]] - form[:, away_idx[fixtures]]) / 400.0)
+            probs = probs * np.stack([1.0 / odds, np.ones_like(odds), odds], axis=2)
+            probs = probs / probs.sum(axis=2, keepdims=True)
+
+        draws = rng.random((n_simulations, len(fixtures)))
+        home_win = draws < probs[:, :, 2]
+        draw = ~home_win & (draws < probs[:, :, 2] + probs[:, :, 1])
+        away_win = ~home_win & ~draw
+
+        home_points = 3.0 * home_win + draw
+        away_points = 3.0 * away_win + draw
+        for j, fixture in enumerate(fixtures):
+            points[:, home_idx[fixture]] += home_points[:, j]
+            points[:, away_idx[fixture]] += away_points[:, j]
+
+        if form_feedback:
+            expected = probs[:, :, 2] + 0.5 * probs[:, :, 1]
+            delta = k_factor * (home_win + 0.5 * draw - expected)
+            for j, fixture in enumerate(fixtures):
+                form[:, home_idx[fixture]] += delta[:, j]
+                form[:, away_idx[fixture]] -= delta[:, j]
+
+    key = points + tiebreak + rng.random((n_simulations, n_teams)) * 1e-6
+    order = np.argsort(-key, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_teams)[None, :], axis=1)
+
+    flat = np.arange(n_teams)[None, :] * n_teams + positions
+    return np.bincount(flat.ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+
+def simulate_season(
+    table: pd.DataFrame,
+    fixtures: pd.DataFrame,
+    n_simulations: int = 100000,
+    form_feedback: bool = False,
+    n_jobs: int = 1,
+    seed: int = RANDOM_SEED,
+    predictor: Optional[Predictor] = None
+) -> pd.DataFrame:
+    """
+    Simulate the rest of the season and return finishing-position probabilities.
+
+    Results are sampled from the model's home/draw/away probabilities,
+    predicted once per fixture. `form_feedback` approximates the effect of
+    simulated results on later form: each simulated season carries an
+    Elo-style offset per team that shifts the win odds of later rounds. The
+    simulated results are not fed back through the rolling-form features and
+    the model. That would take one feature build and model call per round
+    and simulation, about 38 million for 100k seasons of 38 rounds, against
+    a few array operations per round for the offset. The offset captures
+    momentum in the same direction, but it is not what the model would
+    predict from the simulated form.
+
+    Args:
+        table: Current standings with columns team, points and optionally goal_difference
+        fixtures: Remaining fixtures with home_team, away_team, match_date and optionally
+            round and PROBABILITY_COLUMNS (predicted with the model when missing)
+        n_simulations: Number of seasons to simulate
+        form_feedback: Shift later rounds' odds by an Elo-style offset from earlier simulated results
+        n_jobs: Worker processes for the simulation chunks
+        seed: Random seed; results do not depend on n_jobs
+        predictor: Predictor used for fixture probabilities
+
+    Returns:
+        DataFrame indexed by team with one column per finishing position (1..n_teams)
+    """
+    teams = list(table["team"])
+    team_index = {team: i for i, team in enumerate(teams)}
+    unknown = (set(fixtures["home_team"]) | set(fixtures["away_team"])) - set(teams)
+    if unknown:
+        raise ValueError(f"Fixtures reference teams missing from the table: {sorted(unknown)}")
+
+    fixtures = fixtures.reset_index(drop=True)
+    if not set(PROBABILITY_COLUMNS).issubset(fixtures.columns):
+        predictions = predict_matches(fixtures, predictor)
+        fixtures = pd.concat([fixtures, predictions[PROBABILITY_COLUMNS]], axis=1)
+
+    probabilities = fixtures[PROBABILITY_COLUMNS].to_numpy(dtype=float)
+    home_idx = fixtures["home_team"].map(team_index).to_numpy()
+    away_idx = fixtures["away_team"].map(team_index).to_numpy()
+
+    round_key = fixtures["round"] if "round" in fixtures.columns else pd.to_datetime(fixtures["match_date"])
+    rounds = [np.asarray(group) for group in fixtures.groupby(round_key, sort=True).indices.values()]
+
+    base_points = table["points"].to_numpy(dtype=float)
+    goal_difference = table["goal_difference"].to_numpy(dtype=float) if "goal_difference" in table.columns else np.zeros(len(teams))
+    tiebreak = goal_difference * 1e-3
+
+    chunk_sizes = [SIMULATION_CHUNK_SIZE] * (n_simulations // SIMULATION_CHUNK_SIZE)
+    if n_simulations % SIMULATION_CHUNK_SIZE:
+        chunk_sizes.append(n_simulations % SIMULATION_CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    shared = (base_points, tiebreak, home_idx, away_idx, probabilities, rounds, form_feedback, ELO_K_FACTOR)
+
+    if n_jobs == 1 or len(chunk_sizes) == 1:
+        counts = [_simulate_chunk(size, chunk_seed, *shared) for size, chunk_seed in zip(chunk_sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs if n_jobs > 0 else None) as executor:
+            futures = [executor.submit(_simulate_chunk, size, chunk_seed, *shared) for size, chunk_seed in zip(chunk_sizes, seeds)]
+            counts = [future.result() for future in futures]
+
+    position_counts = np.sum(counts, axis=0)
+    logger.info(f"Simulated {n_simulations} seasons over {len(fixtures)} fixtures")
+
+    return pd.DataFrame(
+        position_counts / n_simulations,
+        index=pd.Index(teams, name="team"),
+        columns=range(1, len(teams) + 1)
+    )
+
+
+def summarize_odds(position_probabilities: pd.DataFrame, top_n: int = 4, relegated: int = 3) -> pd.DataFrame:
+    """Title, top-four and relegation odds plus expected finishing position per team."""
+    n_teams = position_probabilities.shape[1]
+    positions = np.arange(1, n_teams + 1)
+    summary = pd.DataFrame({
+        "title": position_probabilities[1],
+        f"top_{top_n}": position_probabilities[list(positions[:top_n])].sum(axis=1),
+        "relegation": position_probabilities[list(positions[n_teams - relegated:])].sum(axis=1),
+        "expected_position": position_probabilities.to_numpy() @ positions
+    })
+    return summary.sort_values("expected_position")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Simulate the rest of the season.")
+    parser.add_argument("table", type=Path, help="CSV with team, points and optional goal_difference")
+    parser.add_argument("fixtures", type=Path, help="CSV with home_team, away_team, match_date and optional round")
+    parser.add_argument("output", type=Path, help="CSV for the finishing-position probabilities")
+    parser.add_argument("--simulations", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--form-feedback", action="store_true")
+    args = parser.parse_args()
+
+    position_probabilities = simulate_season(
+        pd.read_csv(args.table),
+        pd.read_csv(args.fixtures),
+        n_simulations=args.simulations,
+        form_feedback=args.form_feedback,
+        n_jobs=args.jobs
+    )
+    position_probabilities.to_csv(args.output)
+    logger.info("\n" + summarize_odds(position_probabilities).to_string())
@@ -1,39 +1,70 @@
 """Train XGBoost model for EPL match outcome prediction."""
 
+import argparse
 import logging
-import joblib
+import time
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import accuracy_score, balanced_accuracy_score
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, log_loss
 import xgboost as xgb
 
 from src.config import (
     X_FEATURES_FILE,
     Y_TARGET_FILE,
-    MODEL_FILE,
+    MODEL_NATIVE_FILE,
+    MODEL_METADATA_FILE,
     MODELS_DIR,
-    RANDOM_SEED
+    REFRESH_ROUNDS,
+    REFRESH_MAX_ROUNDS,
+    REFRESH_DRIFT_THRESHOLD,
+    REFRESH_MAX_NEW_FRACTION,
+    REFRESH_MIN_DRIFT_MATCHES
 )
+from src.data_preprocessing.feature_store import read_match_keys
+from src.models.model_io import hash_files, load_metadata, load_model, load_model_keys, save_model
+from src.models.tune import load_training_params, native_params
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def train_xgboost_model() -> xgb.XGBClassifier:
+def multiclass_log_loss(y_true, probabilities: np.ndarray) -> float:
+    """Log-loss over the three outcomes, with float32 model output renormalized in float64."""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    probabilities = probabilities / probabilities.sum(axis=1, keepdims=True)
+    return log_loss(y_true, probabilities, labels=[0, 1, 2])
+
+
+def train_xgboost_model(
+    x_file: Path = X_FEATURES_FILE,
+    y_file: Path = Y_TARGET_FILE,
+    model_file: Path = MODEL_NATIVE_FILE,
+    metadata_file: Path = MODEL_METADATA_FILE,
+    params: Optional[Dict] = None
+) -> xgb.XGBClassifier:
     """
     Train XGBoost classifier on EPL match data.
     
+    Args:
+        x_file: Feature matrix
+        y_file: Encoded targets
+        model_file: Native model to write
+        metadata_file: Metadata sidecar to write
+        params: XGBClassifier parameters; defaults to XGB_PARAMS with any tuned overrides
+    
     Returns:
         Trained XGBoost model
     """
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
     
     logger.info("Loading feature matrix and target vector")
-    X = pd.read_parquet(X_FEATURES_FILE)
-    y = pd.read_parquet(Y_TARGET_FILE)
+    X = pd.read_parquet(x_file)
+    y = pd.read_parquet(y_file)
     
     logger.info(f"Dataset shape: {X.shape[0]} samples, {X.shape[1]} features")
+    keys = read_match_keys(x_file, len(X))
     
     split_idx = int(len(X) * 0.8)
     X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
@@ -41,40 +72,207 @@ def train_xgboost_model() -> xgb.XGBClassifier:
     
     logger.info(f"Train set: {len(X_train)} samples, Validation set: {len(X_val)} samples")
     
-    model = xgb.XGBClassifier(
-        objective="multi:softprob",
-        num_class=3,
-        n_estimators=200,
-        learning_rate=0.1,
-        max_depth=6,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        random_state=RANDOM_SEED,
-        eval_metric="mlogloss"
-    )
+    params = dict(params) if params is not None else load_training_params()
+    model = xgb.XGBClassifier(**params)
     
     logger.info("Training XGBoost model...")
+    start = time.perf_counter()
     model.fit(
         X_train,
         y_train,
         eval_set=[(X_val, y_val)],
         verbose=False
     )
+    training_seconds = time.perf_counter() - start
     
     y_pred = model.predict(X_val)
     accuracy = accuracy_score(y_val, y_pred)
     balanced_acc = balanced_accuracy_score(y_val, y_pred)
+    validation_logloss = multiclass_log_loss(y_val, model.predict_proba(X_val))
     
     logger.info(f"Validation Accuracy: {accuracy:.4f}")
     logger.info(f"Validation Balanced Accuracy: {balanced_acc:.4f}")
     
-    joblib.dump(model, MODEL_FILE)
-    logger.info(f"Model saved to {MODEL_FILE}")
+    save_model(
+        model,
+        list(X.columns),
+        hash_files(x_file, y_file),
+        {
+            "n_samples": len(X),
+            "n_train_samples": len(X_train),
+            "validation_accuracy": accuracy,
+            "validation_balanced_accuracy": balanced_acc,
+            "validation_mlogloss": validation_logloss,
+            "params": params,
+            "full_training_seconds": training_seconds,
+            "full_training_samples": len(X_train)
+        },
+        model_file,
+        metadata_file,
+        keys
+    )
+    logger.info(f"Model saved to {model_file}")
     
     return model
 
 
+def refresh_policy(
+    metadata: Dict,
+    feature_names: List[str],
+    n_new: Optional[int],
+    num_rounds: int,
+    new_logloss: float,
+    n_rounds: int = REFRESH_ROUNDS,
+    max_rounds: int = REFRESH_MAX_ROUNDS,
+    drift_threshold: float = REFRESH_DRIFT_THRESHOLD,
+    max_new_fraction: float = REFRESH_MAX_NEW_FRACTION,
+    min_drift_matches: int = REFRESH_MIN_DRIFT_MATCHES
+) -> Tuple[bool, str]:
+    """
+    Decide whether new matches can be added to the model by continued boosting.
+    
+    Log-loss over a handful of matches swings too much to say anything about
+    drift, so the drift check only applies once there are `min_drift_matches`
+    new matches; smaller batches are added on the other rules alone.
+    
+    Args:
+        metadata: Sidecar of the current model
+        feature_names: Columns of the current feature matrix
+        n_new: Matches in the feature matrix the model was not trained on; None when they cannot be identified
+        num_rounds: Boosting rounds already in the model
+        new_logloss: Current model's log-loss on the new matches
+    
+    Returns:
+        Tuple of (continue_boosting, reason)
+    """
+    if "validation_mlogloss" not in metadata or "full_training_samples" not in metadata:
+        return False, "model has no refresh baseline"
+    if n_new is None:
+        return False, "new matches cannot be identified by match key"
+    if metadata.get("feature_names") != list(feature_names):
+        return False, "feature columns changed"
+    if n_new <= 0:
+        return False, "no new matches since the model was trained"
+    if num_rounds + n_rounds > max_rounds:
+        return False, f"model would exceed {max_rounds} boosting rounds"
+    if n_new > max_new_fraction * metadata["full_training_samples"]:
+        return False, f"{n_new} new matches exceed {max_new_fraction:.0%} of the training set"
+    if n_new < min_drift_matches:
+        return True, f"continuing boosting on {n_new} new matches, too few to check drift"
+    if new_logloss - metadata["validation_mlogloss"] > drift_threshold:
+        return False, f"log-loss on new matches drifted by {new_logloss - metadata['validation_mlogloss']:.3f}"
+    return True, f"continuing boosting on {n_new} new matches"
+
+
+def new_match_rows(keys: Optional[pd.Series], trained_keys: Optional[pd.Series]) -> Optional[np.ndarray]:
+    """
+    Mask of the feature rows whose match the model was not trained on.
+    
+    None when either side has no keys, or when matches the model was trained
+    on are gone from the matrix, which then no longer extends the model's
+    training data.
+    """
+    if keys is None or trained_keys is None or not trained_keys.isin(keys).all():
+        return None
+    return ~keys.isin(trained_keys).to_numpy()
+
+
+def update_xgboost_model(
+    n_rounds: int = REFRESH_ROUNDS,
+    max_rounds: int = REFRESH_MAX_ROUNDS,
+    drift_threshold: float = REFRESH_DRIFT_THRESHOLD,
+    max_new_fraction: float = REFRESH_MAX_NEW_FRACTION,
+    x_file: Path = X_FEATURES_FILE,
+    y_file: Path = Y_TARGET_FILE,
+    model_file: Path = MODEL_NATIVE_FILE,
+    metadata_file: Path = MODEL_METADATA_FILE,
+    min_drift_matches: int = REFRESH_MIN_DRIFT_MATCHES
+) -> Dict:
+    """
+    Refresh the model with matches added since it was trained.
+    
+    New matches are the feature rows whose match key is not among the keys
+    saved with the model, wherever they sit in the matrix. Loads the current
+    booster and adds `n_rounds` rounds trained on those rows only
+    (xgb.train continuation with all three classes fixed, so a batch without
+    a draw is fine). Falls back to a full retrain when
+    refresh_policy rejects the update, e.g. too many trees, too much new data
+    or drift in log-loss on the new matches.
+    
+    Returns:
+        Report with the mode used, the reason, the new match count and the
+        time taken against the estimated full retrain
+    """
+    metadata = load_metadata(metadata_file)
+    X = pd.read_parquet(x_file)
+    y = pd.read_parquet(y_file).iloc[:, 0]
+    
+    if metadata.get("training_data_hash") == hash_files(x_file, y_file):
+        logger.info("Model is already trained on the current feature matrix")
+        return {"mode": "unchanged", "reason": "training data unchanged", "n_new": 0}
+    
+    current = load_model(model_file, metadata_file)
+    booster = current.get_booster()
+    keys = read_match_keys(x_file, len(X))
+    new_rows = new_match_rows(keys, load_model_keys(model_file))
+    X_new, y_new = (X[new_rows], y[new_rows]) if new_rows is not None else (X.iloc[:0], y.iloc[:0])
+    new_logloss = multiclass_log_loss(y_new, current.predict_proba(X_new)) if len(X_new) else np.nan
+    
+    use_update, reason = refresh_policy(
+        metadata, list(X.columns), len(X_new) if new_rows is not None else None, booster.num_boosted_rounds(),
+        new_logloss, n_rounds, max_rounds, drift_threshold, max_new_fraction, min_drift_matches
+    )
+    logger.info(f"Refresh policy: {reason}")
+    
+    start = time.perf_counter()
+    if not use_update:
+        train_xgboost_model(x_file, y_file, model_file, metadata_file)
+        return {"mode": "full", "reason": reason, "n_new": len(X_new), "seconds": time.perf_counter() - start}
+    
+    params = {**load_training_params(), **metadata.get("params", {})}
+    booster = xgb.train(
+        {**native_params(params, nthread=0), "objective": "multi:softprob", "num_class": 3},
+        xgb.DMatrix(X_new, label=y_new),
+        num_boost_round=n_rounds,
+        xgb_model=booster
+    )
+    seconds = time.perf_counter() - start
+    
+    estimated_full_seconds = metadata["full_training_seconds"] * len(X) * 0.8 / metadata["full_training_samples"]
+    report = {
+        "mode": "update",
+        "reason": reason,
+        "n_new": len(X_new),
+        "rounds_added": n_rounds,
+        "seconds": seconds,
+        "estimated_full_seconds": estimated_full_seconds,
+        "seconds_saved": estimated_full_seconds - seconds
+    }
+    
+    refreshed_metadata = {
+        key: metadata[key]
+        for key in ("n_train_samples", "validation_mlogloss", "params", "full_training_seconds", "full_training_samples")
+        if key in metadata
+    }
+    refreshed_metadata.update({"n_samples": len(X), "last_refresh": report})
+    save_model(booster, list(X.columns), hash_files(x_file, y_file), refreshed_metadata, model_file, metadata_file, keys)
+    
+    logger.info(
+        f"Added {n_rounds} rounds on {len(X_new)} new matches in {seconds:.2f}s "
+        f"(full retrain estimated at {estimated_full_seconds:.2f}s, {report['seconds_saved']:.2f}s saved)"
+    )
+    return report
+
+
 if __name__ == "__main__":
-    model = train_xgboost_model()
-    logger.info("Training complete")
+    parser = argparse.ArgumentParser(description="Train the match outcome model.")
+    parser.add_argument("--update", action="store_true", help="Continue boosting on new matches instead of retraining")
+    args = parser.parse_args()
+    
+    if args.update:
+        update_xgboost_model()
+        logger.info("Refresh complete")
+    else:
+        model = train_xgboost_model()
+        logger.info("Training complete")
 
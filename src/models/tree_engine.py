@@ -0,0 +1,148 @@
+"""Dependency-free NumPy inference for the exported XGBoost tree ensemble."""
+
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from src.config import MODEL_ARRAYS_FILE
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_base_score(value: str, n_classes: int) -> np.ndarray:
+    values = [float(v) for v in value.strip("[]").split(",")]
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (n_classes,)).copy()
+
+
+def export_tree_arrays(booster, path: Path = MODEL_ARRAYS_FILE, source_hash: str = "") -> Path:
+    """
+    Flatten a multi-class Booster into contiguous arrays saved as .npz.
+
+    Every tree's nodes are concatenated; child indices point into the flat
+    arrays and leaves point to themselves, so traversal is a fixed number of
+    vectorized gather steps.
+
+    Args:
+        booster: Trained xgboost Booster with a multi:softprob objective
+        path: Output .npz file
+        source_hash: Hash of the saved model file the arrays were exported from
+
+    Returns:
+        The path written
+    """
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    model = learner["gradient_booster"]["model"]
+    n_classes = int(learner["learner_model_param"]["num_class"])
+
+    features, thresholds, lefts, rights, default_left, values, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for tree in model["trees"]:
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        n_nodes = len(left)
+        is_leaf = left == -1
+        node_ids = np.arange(n_nodes)
+
+        lefts.append(np.where(is_leaf, node_ids, left) + offset)
+        rights.append(np.where(is_leaf, node_ids, right) + offset)
+        features.append(np.where(is_leaf, 0, tree["split_indices"]))
+        thresholds.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+        values.append(np.where(is_leaf, tree["split_conditions"], 0.0))
+        roots.append(offset)
+
+        depth = np.zeros(n_nodes, dtype=np.int64)
+        for node in range(n_nodes):
+            if not is_leaf[node]:
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+        max_depth = max(max_depth, int(depth.max()))
+        offset += n_nodes
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path,
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts),
+        right=np.concatenate(rights),
+        default_left=np.concatenate(default_left),
+        value=np.concatenate(values).astype(np.float32),
+        root=np.asarray(roots, dtype=np.int64),
+        tree_class=np.asarray(model["tree_info"], dtype=np.int64),
+        base_margin=_parse_base_score(learner["learner_model_param"]["base_score"], n_classes),
+        max_depth=np.asarray(max_depth),
+        feature_names=np.asarray(booster.feature_names or [], dtype=str),
+        source_hash=np.asarray(source_hash)
+    )
+    logger.info(f"Exported {len(roots)} trees ({offset} nodes) to {path}")
+    return path
+
+
+class TreeEnsemble:
+    """
+    Scores rows with the exported tree arrays, without importing xgboost.
+
+    Offers the same predict_proba/predict interface as the model classes, so it
+    can stand in for them on the serving path.
+    """
+
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.default_left = arrays["default_left"]
+        self.value = arrays["value"].astype(np.float64)
+        self.root = arrays["root"]
+        self.max_depth = int(arrays["max_depth"])
+        self.base_margin = arrays["base_margin"]
+        self.feature_names: List[str] = [str(name) for name in arrays["feature_names"]]
+        self.source_hash = str(arrays["source_hash"]) if "source_hash" in arrays else ""
+
+        n_classes = len(self.base_margin)
+        self.class_matrix = np.zeros((len(self.root), n_classes))
+        self.class_matrix[np.arange(len(self.root)), arrays["tree_class"]] = 1.0
+
+    @classmethod
+    def load(cls, path: Path = MODEL_ARRAYS_FILE) -> "TreeEnsemble":
+        with np.load(path) as arrays:
+            return cls({key: arrays[key] for key in arrays.files})
+
+    def _matrix(self, X) -> np.ndarray:
+        if hasattr(X, "columns") and self.feature_names:
+            X = X[self.feature_names]
+        return np.atleast_2d(np.asarray(X, dtype=np.float32))
+
+    def predict_margin(self, X) -> np.ndarray:
+        """Raw per-class scores before the softmax."""
+        X = self._matrix(X)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.root, (len(X), len(self.root))).copy()
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes] @ self.class_matrix + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        margin = self.predict_margin(X)
+        margin -= margin.max(axis=1, keepdims=True)
+        exp = np.exp(margin)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_margin(X).argmax(axis=1)
+
+
+if __name__ == "__main__":
+    from src.models.model_io import hash_files, load_model, resolve_model_file
+
+    logging.basicConfig(level=logging.INFO)
+    model_file = resolve_model_file()
+    export_tree_arrays(load_model(model_file).get_booster(), model_file.with_suffix(".npz"), hash_files(model_file))
@@ -0,0 +1,209 @@
+"""Random and successive-halving hyperparameter search for the XGBoost model."""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    BEST_PARAMS_FILE,
+    RANDOM_SEED,
+    REPORTS_DIR,
+    TUNING_TRIALS_CSV,
+    X_FEATURES_FILE,
+    XGB_PARAMS,
+    Y_TARGET_FILE
+)
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SPACE: Dict[str, Callable[[np.random.Generator], float]] = {
+    "learning_rate": lambda rng: float(10 ** rng.uniform(-2.0, -0.5)),
+    "max_depth": lambda rng: int(rng.integers(2, 9)),
+    "min_child_weight": lambda rng: float(10 ** rng.uniform(-1.0, 1.0)),
+    "subsample": lambda rng: float(rng.uniform(0.5, 1.0)),
+    "colsample_bytree": lambda rng: float(rng.uniform(0.5, 1.0)),
+    "reg_lambda": lambda rng: float(10 ** rng.uniform(-1.0, 1.5)),
+    "gamma": lambda rng: float(rng.uniform(0.0, 2.0))
+}
+
+NATIVE_PARAM_NAMES = {"n_jobs": "nthread", "random_state": "seed"}
+SKLEARN_ONLY_PARAMS = {"n_estimators"}
+
+
+def sample_configs(n_trials: int, seed: int = RANDOM_SEED) -> List[Dict]:
+    """Draw `n_trials` parameter sets from SEARCH_SPACE."""
+    rng = np.random.default_rng(seed)
+    return [{name: sampler(rng) for name, sampler in SEARCH_SPACE.items()} for _ in range(n_trials)]
+
+
+def native_params(params: Dict, nthread: int) -> Dict:
+    """Translate XGBClassifier parameter names into xgb.train parameters."""
+    native = {NATIVE_PARAM_NAMES.get(name, name): value for name, value in params.items() if name not in SKLEARN_ONLY_PARAMS}
+    native["nthread"] = nthread
+    return native
+
+
+def _run_trial(trial_id: int, config: Dict, dtrain, dval, num_rounds: int, early_stopping_rounds: int, nthread: int) -> Dict:
+    """Train one configuration with early stopping on validation mlogloss."""
+    import xgboost as xgb
+
+    start = time.perf_counter()
+    evals_result: Dict = {}
+    booster = xgb.train(
+        native_params({**XGB_PARAMS, **config}, nthread),
+        dtrain,
+        num_boost_round=num_rounds,
+        evals=[(dval, "validation")],
+        early_stopping_rounds=early_stopping_rounds,
+        evals_result=evals_result,
+        verbose_eval=False
+    )
+    return {
+        "trial": trial_id,
+        **config,
+        "num_rounds": num_rounds,
+        "best_iteration": booster.best_iteration,
+        "validation_mlogloss": float(evals_result["validation"]["mlogloss"][booster.best_iteration]),
+        "seconds": time.perf_counter() - start
+    }
+
+
+def tune_hyperparameters(
+    X: Optional[pd.DataFrame] = None,
+    y: Optional[pd.Series] = None,
+    strategy: str = "random",
+    n_trials: int = 32,
+    max_rounds: int = 500,
+    min_rounds: int = 50,
+    reduction_factor: int = 3,
+    early_stopping_rounds: int = 20,
+    n_workers: Optional[int] = None,
+    nthread: int = 1,
+    seed: int = RANDOM_SEED
+) -> pd.DataFrame:
+    """
+    Search XGBoost hyperparameters on the chronological 80/20 split used for training.
+
+    The training and validation QuantileDMatrix are built once and shared by
+    every trial. Trials run in a thread pool (XGBoost releases the GIL while
+    boosting) with `nthread` threads each, so at most n_workers x nthread
+    cores are busy. Successive halving trains every configuration for
+    `min_rounds`, keeps the best 1/reduction_factor and multiplies the round
+    budget by reduction_factor until it reaches `max_rounds`.
+
+    Args:
+        X: Feature matrix in chronological order; defaults to X_FEATURES_FILE
+        y: Encoded targets; defaults to Y_TARGET_FILE
+        strategy: "random" or "halving"
+        n_trials: Number of sampled configurations
+        max_rounds: Boosting rounds for random search and the final halving rung
+        min_rounds: Boosting rounds for the first halving rung
+        reduction_factor: Halving keeps 1/reduction_factor of the trials per rung
+        early_stopping_rounds: Stop a trial when validation mlogloss has not improved for this many rounds
+        n_workers: Concurrent trials; defaults to the core count divided by `nthread`
+        nthread: XGBoost threads per trial
+        seed: Seed for sampling configurations
+
+    Returns:
+        Trials table with one row per trained configuration and rung, best first
+    """
+    import xgboost as xgb
+
+    if strategy not in ("random", "halving"):
+        raise ValueError(f"Unknown search strategy: {strategy}")
+    if X is None:
+        X = pd.read_parquet(X_FEATURES_FILE)
+    if y is None:
+        y = pd.read_parquet(Y_TARGET_FILE).iloc[:, 0]
+    n_workers = n_workers if n_workers is not None else max(1, (os.cpu_count() or 1) // nthread)
+
+    split_idx = int(len(X) * 0.8)
+    dtrain = xgb.QuantileDMatrix(X.iloc[:split_idx], y.iloc[:split_idx])
+    dval = xgb.QuantileDMatrix(X.iloc[split_idx:], y.iloc[split_idx:], ref=dtrain)
+
+    configs = dict(enumerate(sample_configs(n_trials, seed)))
+    if strategy == "random":
+        budgets = [max_rounds]
+    else:
+        budgets = [min_rounds]
+        while budgets[-1] < max_rounds:
+            budgets.append(min(budgets[-1] * reduction_factor, max_rounds))
+
+    trials = []
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        for rung, num_rounds in enumerate(budgets):
+            futures = [
+                executor.submit(_run_trial, trial_id, config, dtrain, dval, num_rounds, early_stopping_rounds, nthread)
+                for trial_id, config in configs.items()
+            ]
+            results = [dict(future.result(), rung=rung) for future in futures]
+            trials.extend(results)
+            logger.info(f"Rung {rung}: {len(results)} trials at {num_rounds} rounds")
+
+            keep = max(1, len(results) // reduction_factor)
+            survivors = sorted(results, key=lambda result: result["validation_mlogloss"])[:keep]
+            configs = {result["trial"]: configs[result["trial"]] for result in survivors}
+
+    final_rung = len(budgets) - 1
+    table = pd.DataFrame(trials)
+    table["final"] = table["rung"] == final_rung
+    return table.sort_values(["final", "validation_mlogloss"], ascending=[False, True]).reset_index(drop=True)
+
+
+def best_params(trials: pd.DataFrame) -> Dict:
+    """XGBClassifier parameters of the best final-rung trial, with n_estimators set by early stopping."""
+    best = trials[trials["final"]].sort_values("validation_mlogloss").iloc[0]
+    params = {name: best[name].item() if hasattr(best[name], "item") else best[name] for name in SEARCH_SPACE}
+    params["max_depth"] = int(params["max_depth"])
+    params["n_estimators"] = int(best["best_iteration"]) + 1
+    return params
+
+
+def save_best_params(trials: pd.DataFrame, path: Path = BEST_PARAMS_FILE) -> Dict:
+    """Write the best configuration for the training stage."""
+    params = best_params(trials)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(params, indent=2))
+    logger.info(f"Best parameters saved to {path}")
+    return params
+
+
+def load_training_params(path: Path = BEST_PARAMS_FILE) -> Dict:
+    """XGB_PARAMS overridden by the tuned parameters, when a search has been run."""
+    if not path.exists():
+        return dict(XGB_PARAMS)
+    return {**XGB_PARAMS, **json.loads(path.read_text())}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Search XGBoost hyperparameters.")
+    parser.add_argument("--strategy", choices=["random", "halving"], default="halving")
+    parser.add_argument("--trials", type=int, default=32)
+    parser.add_argument("--max-rounds", type=int, default=500)
+    parser.add_argument("--min-rounds", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent trials")
+    parser.add_argument("--nthread", type=int, default=1, help="XGBoost threads per trial")
+    args = parser.parse_args()
+
+    trials = tune_hyperparameters(
+        strategy=args.strategy,
+        n_trials=args.trials,
+        max_rounds=args.max_rounds,
+        min_rounds=args.min_rounds,
+        n_workers=args.workers,
+        nthread=args.nthread
+    )
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    trials.to_csv(TUNING_TRIALS_CSV, index=False)
+    logger.info(f"Trials table saved to {TUNING_TRIALS_CSV}")
+    logger.info(f"Best parameters: {save_best_params(trials)}")
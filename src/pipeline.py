@@ -0,0 +1,299 @@
+"""Content-hash cached runner for the clean -> features -> train -> report pipeline."""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from src.config import (
+    BEST_PARAMS_FILE,
+    CLEANED_DATA_FILE,
+    CONFUSION_MATRIX_PNG,
+    FEATURE_IMPORTANCE_CSV,
+    FEATURE_IMPORTANCE_PNG,
+    MATCH_KEYS_FILE,
+    METRICS_JSON,
+    MODEL_ARRAYS_FILE,
+    MODEL_KEYS_FILE,
+    MODEL_METADATA_FILE,
+    MODEL_NATIVE_FILE,
+    PIPELINE_STATE_FILE,
+    PROJECT_ROOT,
+    ROLLING_WINDOW,
+    SEASON_START_MONTH,
+    X_FEATURES_FILE,
+    XGB_PARAMS,
+    Y_TARGET_FILE
+)
+from src.data_preprocessing.ingest import discover_source_files
+from src.models.model_io import hash_files
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """
+    One pipeline step with its declared inputs, outputs and config.
+
+    `func` is a "module:function" path so the stage can be imported lazily
+    inside a worker process. `inputs` may instead be a callable returning the
+    paths, resolved each time they are read, for inputs discovered at run
+    time. The stage reruns when the content of an input, its config, or the
+    source of its module or any `src` module that module imports changes, or
+    when an output is missing or was modified since the stage last wrote it.
+    """
+
+    __slots__ = ("name", "func", "_inputs", "outputs", "config")
+
+    def __init__(
+        self,
+        name: str,
+        func: str,
+        inputs: Union[Sequence[Path], Callable[[], Sequence[Path]]],
+        outputs: Sequence[Path],
+        config: Optional[Dict] = None
+    ):
+        self.name = name
+        self.func = func
+        self._inputs = inputs if callable(inputs) else [Path(path) for path in inputs]
+        self.outputs = [Path(path) for path in outputs]
+        self.config = config or {}
+
+    @property
+    def inputs(self) -> List[Path]:
+        return [Path(path) for path in self._inputs()] if callable(self._inputs) else self._inputs
+
+
+def raw_input_files() -> List[Path]:
+    """Raw files the clean stage reads, discovered when the pipeline runs."""
+    return [path for _, path in discover_source_files()]
+
+
+PIPELINE_STAGES = [
+    Stage(
+        "clean",
+        "src.data_preprocessing.clean_raw_data:clean_raw_files",
+        raw_input_files,
+        [CLEANED_DATA_FILE]
+    ),
+    Stage(
+        "features",
+        "src.data_preprocessing.feature_engineering:build_feature_matrix_from_file",
+        [CLEANED_DATA_FILE],
+        [X_FEATURES_FILE, Y_TARGET_FILE, MATCH_KEYS_FILE],
+        {"ROLLING_WINDOW": ROLLING_WINDOW, "SEASON_START_MONTH": SEASON_START_MONTH}
+    ),
+    Stage(
+        "train",
+        "src.models.train_xgboost:train_xgboost_model",
+        [X_FEATURES_FILE, Y_TARGET_FILE, MATCH_KEYS_FILE, BEST_PARAMS_FILE],
+        [MODEL_NATIVE_FILE, MODEL_METADATA_FILE, MODEL_ARRAYS_FILE, MODEL_KEYS_FILE],
+        {"XGB_PARAMS": XGB_PARAMS}
+    ),
+    Stage(
+        "reports",
+        "src.models.reports:build_reports",
+        [MODEL_NATIVE_FILE, X_FEATURES_FILE, Y_TARGET_FILE],
+        [CONFUSION_MATRIX_PNG, FEATURE_IMPORTANCE_CSV, FEATURE_IMPORTANCE_PNG, METRICS_JSON]
+    )
+]
+
+
+def _file_hash(path: Path) -> Optional[str]:
+    return hash_files(path) if path.exists() else None
+
+
+def _project_module_file(module_name: str) -> Optional[Path]:
+    base = PROJECT_ROOT.joinpath(*module_name.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def module_sources(module_name: str) -> List[Path]:
+    """
+    Source files of a module and every `src` module it imports, transitively.
+
+    Imports are read from the syntax tree, including those inside functions,
+    so nothing is imported to find them.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return []
+
+    sources = {module_name: Path(spec.origin)}
+    queue = [Path(spec.origin)]
+    while queue:
+        for node in ast.walk(ast.parse(queue.pop().read_text())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                path = _project_module_file(name) if name.split(".")[0] == "src" else None
+                if path is not None and name not in sources:
+                    sources[name] = path
+                    queue.append(path)
+    return sorted(set(sources.values()))
+
+
+def _source_hash(func: str) -> Optional[str]:
+    sources = module_sources(func.split(":")[0])
+    return hash_files(*sources) if sources else None
+
+
+def stage_fingerprint(stage: Stage) -> str:
+    """Hash of everything that determines a stage's outputs."""
+    payload = {
+        "func": stage.func,
+        "source": _source_hash(stage.func),
+        "config": stage.config,
+        "inputs": {str(path): _file_hash(path) for path in stage.inputs}
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _load_state(state_file: Path) -> Dict:
+    return json.loads(state_file.read_text()) if state_file.exists() else {}
+
+
+def _is_fresh(stage: Stage, fingerprint: str, record: Optional[Dict]) -> bool:
+    if record is None or record["fingerprint"] != fingerprint:
+        return False
+    return all(record["outputs"].get(str(path)) == _file_hash(path) for path in stage.outputs)
+
+
+def _run_stage(func: str):
+    module_name, function_name = func.split(":")
+    getattr(importlib.import_module(module_name), function_name)()
+
+
+def _select_stages(stages: List[Stage], targets: Optional[Sequence[str]]) -> List[Stage]:
+    """The target stages and everything upstream of them, in declaration order."""
+    if not targets:
+        return list(stages)
+
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    selected = set()
+    queue = list(targets)
+    while queue:
+        name = queue.pop()
+        if name not in selected:
+            selected.add(name)
+            queue.extend(producers[path] for path in by_name[name].inputs if path in producers)
+    return [stage for stage in stages if stage.name in selected]
+
+
+def run_pipeline(
+    stages: Optional[List[Stage]] = None,
+    targets: Optional[Sequence[str]] = None,
+    force: bool = False,
+    n_jobs: int = 2,
+    state_file: Path = PIPELINE_STATE_FILE
+) -> Dict[str, str]:
+    """
+    Run the pipeline, skipping stages whose inputs, config and code are unchanged.
+
+    A stage starts once every stage producing its inputs has finished, so
+    independent stages run side by side in worker processes. A stage that
+    reruns but writes byte-identical outputs leaves its downstream stages
+    skipped.
+
+    Args:
+        stages: Pipeline definition; defaults to PIPELINE_STAGES
+        targets: Stage names to bring up to date along with their upstream stages; all when empty
+        force: Rerun every selected stage regardless of the cache
+        n_jobs: Worker processes; 1 runs stages in this process
+        state_file: JSON file recording each stage's fingerprint and output hashes
+
+    Returns:
+        Dictionary mapping stage name to "ran" or "skipped"
+    """
+    stages = _select_stages(stages if stages is not None else PIPELINE_STAGES, targets)
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    dependencies = {
+        stage.name: {producers[path] for path in stage.inputs if path in producers and producers[path] != stage.name}
+        for stage in stages
+    }
+
+    state = _load_state(state_file)
+    status: Dict[str, str] = {}
+    pending = list(stages)
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs != 1 else None
+    running = {}
+
+    def record(stage: Stage, fingerprint: str):
+        state[stage.name] = {
+            "fingerprint": fingerprint,
+            "outputs": {str(path): _file_hash(path) for path in stage.outputs}
+        }
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_file.write_text(json.dumps(state, indent=2))
+        status[stage.name] = "ran"
+        logger.info(f"Stage {stage.name} finished")
+
+    try:
+        while pending or running:
+            ready = [stage for stage in pending if dependencies[stage.name] <= status.keys()]
+            for stage in ready:
+                pending.remove(stage)
+                fingerprint = stage_fingerprint(stage)
+
+                if not force and _is_fresh(stage, fingerprint, state.get(stage.name)):
+                    status[stage.name] = "skipped"
+                    logger.info(f"Stage {stage.name} is up to date")
+                elif not any(path.exists() for path in stage.inputs) and all(path.exists() for path in stage.outputs):
+                    status[stage.name] = "skipped"
+                    logger.warning(f"Stage {stage.name} has no inputs; keeping its existing outputs")
+                elif executor is None:
+                    logger.info(f"Running stage {stage.name}")
+                    _run_stage(stage.func)
+                    record(stage, fingerprint)
+                else:
+                    logger.info(f"Running stage {stage.name}")
+                    running[executor.submit(_run_stage, stage.func)] = (stage, fingerprint)
+
+            if ready and not running:
+                continue
+            if not running:
+                if pending:
+                    raise RuntimeError(f"Stages with unmet dependencies: {[stage.name for stage in pending]}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, fingerprint = running.pop(future)
+                future.result()
+                record(stage, fingerprint)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return status
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Run the pipeline, redoing only stages whose inputs changed.")
+    parser.add_argument("targets", nargs="*", help=f"Stages to build: {', '.join(stage.name for stage in PIPELINE_STAGES)}")
+    parser.add_argument("--force", action="store_true", help="Rerun every selected stage")
+    parser.add_argument("--jobs", type=int, default=2, help="Worker processes for independent stages")
+    args = parser.parse_args()
+
+    status = run_pipeline(targets=args.targets, force=args.force, n_jobs=args.jobs)
+    logger.info(", ".join(f"{name}: {result}" for name, result in status.items()))
@@ -0,0 +1,43 @@
+"""Tests for walk-forward backtesting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import XGB_PARAMS
+from src.models.backtest import multiclass_brier, run_backtest, walk_forward_folds
+
+
+def test_walk_forward_folds_expanding_and_sliding():
+    """Test that folds train only on earlier seasons and test on the next one."""
+    seasons = np.repeat([2020, 2021, 2022, 2023], [3, 4, 2, 5])
+    
+    assert walk_forward_folds(seasons) == [(2021, 0, 3, 7), (2022, 0, 7, 9), (2023, 0, 9, 14)]
+    assert walk_forward_folds(seasons, "sliding", window=1) == [(2021, 0, 3, 7), (2022, 3, 7, 9), (2023, 7, 9, 14)]
+    
+    with pytest.raises(ValueError):
+        walk_forward_folds(seasons, "sliding")
+
+
+def test_multiclass_brier():
+    """Test the Brier score on perfect and uniform forecasts."""
+    y = np.array([0, 2])
+    assert multiclass_brier(y, np.eye(3)[y]) == 0.0
+    assert np.isclose(multiclass_brier(y, np.full((2, 3), 1 / 3)), 2 / 3)
+
+
+def test_parallel_backtest_matches_serial():
+    """Test that folds run in worker processes give the same metrics as a serial run."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(240, 4)), columns=list("abcd"))
+    y = pd.Series((X["a"] > 0).astype(int) + (X["b"] > 0.5).astype(int))
+    seasons = np.repeat([2020, 2021, 2022, 2023], 60)
+    params = {**XGB_PARAMS, "n_estimators": 10}
+    
+    serial = run_backtest(X, y, seasons, n_jobs=1, params=params)
+    parallel = run_backtest(X, y, seasons, n_jobs=2, params=params)
+    
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert list(serial["season"]) == [2021, 2022, 2023]
+    assert list(serial["n_train"]) == [60, 120, 180]
+    assert serial["accuracy"].between(0, 1).all()
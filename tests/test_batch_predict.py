@@ -0,0 +1,54 @@
+"""Tests for batch prediction."""
+
+import pandas as pd
+import pytest
+
+from src.models.model_io import resolve_model_file
+from src.models.batch_predict import predict_fixtures_file
+from src.models.prediction_utils import PROBABILITY_COLUMNS, Predictor, predict_matches
+from tests.test_form_engine import make_matches
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    if not resolve_model_file().exists():
+        pytest.skip("Model not available for testing")
+    data_file = tmp_path / "matches.csv"
+    make_matches(n_matches=100, seed=12).to_csv(data_file, index=False)
+    return Predictor(resolve_model_file(), data_file)
+
+
+def fixtures():
+    return pd.DataFrame({
+        "home_team": ["Arsenal", "Wolves", "Everton"] * 5,
+        "away_team": ["Chelsea", "Fulham", "Liverpool"] * 5,
+        "match_date": pd.date_range("2021-01-01", periods=15, freq="3D")
+    })
+
+
+def test_predict_matches_agrees_with_single_predictions(predictor):
+    """Test that the batch path returns the same probabilities as one-at-a-time calls."""
+    batch = predict_matches(fixtures(), predictor)
+    
+    assert len(batch) == 15
+    for row in batch.itertuples(index=False):
+        single = predictor.predict(row.home_team, row.away_team, row.match_date)
+        assert abs(single["probabilities"]["Home Win"] - row.prob_home_win) < 1e-6
+        assert single["predicted_outcome"] == row.predicted_outcome
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_predict_fixtures_file_writes_all_chunks(predictor, tmp_path, suffix):
+    """Test that the chunked CLI path scores every fixture."""
+    fixtures_path = tmp_path / f"fixtures{suffix}"
+    output_path = tmp_path / f"predictions{suffix}"
+    if suffix == ".csv":
+        fixtures().to_csv(fixtures_path, index=False)
+    else:
+        fixtures().to_parquet(fixtures_path, index=False)
+    
+    n_scored = predict_fixtures_file(fixtures_path, output_path, chunk_size=4, predictor=predictor)
+    
+    output = pd.read_csv(output_path) if suffix == ".csv" else pd.read_parquet(output_path)
+    assert n_scored == len(output) == 15
+    assert ((output[PROBABILITY_COLUMNS].sum(axis=1) - 1.0).abs() < 1e-5).all()
@@ -0,0 +1,77 @@
+"""Tests for bootstrap evaluation metrics."""
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, log_loss
+
+from src.models.bootstrap_evaluation import (
+    bootstrap_metrics,
+    bootstrap_sums,
+    calibration_bins,
+    compare_models,
+    per_match_scores,
+    poisson_weight_table
+)
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 3, size=2000)
+    probabilities = rng.dirichlet(np.ones(3), size=2000)
+    probabilities[np.arange(2000), y] += 0.5
+    return y, probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def test_point_estimates_match_sklearn(predictions):
+    """Test that the estimates agree with sklearn and the intervals contain them."""
+    y, probabilities = predictions
+    metrics = bootstrap_metrics(y, probabilities, n_resamples=500)
+    
+    assert np.isclose(metrics.loc["accuracy", "estimate"], accuracy_score(y, probabilities.argmax(axis=1)))
+    assert np.isclose(metrics.loc["balanced_accuracy", "estimate"], balanced_accuracy_score(y, probabilities.argmax(axis=1)))
+    assert np.isclose(metrics.loc["log_loss", "estimate"], log_loss(y, probabilities))
+    assert ((metrics["lower"] <= metrics["estimate"]) & (metrics["estimate"] <= metrics["upper"])).all()
+    assert (metrics["upper"] - metrics["lower"] < 0.1).all()
+
+
+def test_rps_and_brier_on_known_forecasts():
+    """Test that RPS penalizes distant misses more than near ones while Brier does not."""
+    y = np.array([2, 2])
+    probabilities = np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])
+    scores = per_match_scores(y, probabilities)
+    
+    assert np.allclose(scores["brier"], [2.0, 2.0])
+    assert np.allclose(scores["rps"], [0.5, 1.0])
+
+
+def test_weights_are_poisson_and_resampling_is_deterministic():
+    """Test the weight distribution and that threads do not change the result."""
+    table = poisson_weight_table()
+    assert np.isclose(table.mean(), 1.0, atol=1e-3) and np.isclose(table.var(), 1.0, atol=1e-2)
+    
+    columns = np.random.default_rng(1).random((500, 3))
+    assert np.array_equal(bootstrap_sums(columns, 300, n_jobs=1), bootstrap_sums(columns, 300, n_jobs=3))
+
+
+def test_paired_comparison(predictions):
+    """Test that identical models differ by zero and a worse model is detected."""
+    y, probabilities = predictions
+    uniform = np.full_like(probabilities, 1 / 3)
+    
+    same = compare_models(y, probabilities, probabilities, n_resamples=200)
+    assert (same["difference"] == 0).all() and (same["p_value"] == 1.0).all()
+    
+    worse = compare_models(y, probabilities, uniform, n_resamples=200)
+    assert worse.loc["log_loss", "lower"] > 0
+    assert worse.loc["log_loss", "p_value"] < 0.05
+
+
+def test_calibration_bins_cover_every_match(predictions):
+    """Test that each class's bins partition the matches and frequencies lie in [0, 1]."""
+    y, probabilities = predictions
+    table = calibration_bins(y, probabilities, n_bins=5, n_resamples=100)
+    
+    assert (table.groupby("class")["count"].sum() == len(y)).all()
+    assert table["observed_frequency"].between(0, 1).all()
+    assert (table["mean_predicted"] >= table["bin_lower"]).all()
@@ -0,0 +1,110 @@
+"""Tests for the chunked raw data cleaner."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_preprocessing.clean_raw_data import clean_raw_files
+from src.data_preprocessing.form_index import build_form_index
+from src.data_preprocessing.ingest import SOURCE_REGISTRY, discover_source_files
+
+
+def test_clean_raw_files_streams_sorted_deduplicated_output(tmp_path):
+    """Test block-streamed cleaning across sources against an in-memory reference."""
+    rng = np.random.default_rng(0)
+    n_rows = 500
+    dates = pd.Timestamp("2018-08-01") + pd.to_timedelta(rng.integers(0, 1500, n_rows), unit="D")
+    teams = np.array([f"Team {i}" for i in range(8)])
+    public = pd.DataFrame({
+        "Div": "E0",
+        "Date": dates.strftime("%d/%m/%Y"),
+        "HomeTeam": teams[rng.integers(0, 4, n_rows)],
+        "AwayTeam": teams[rng.integers(4, 8, n_rows)],
+        "FTHG": rng.integers(0, 4, n_rows),
+        "FTAG": rng.integers(0, 4, n_rows),
+        "B365H": rng.random(n_rows)
+    })
+    public.loc[::50, "Date"] = None
+    public.to_csv(tmp_path / "public.csv", index=False)
+    
+    scraped = public.head(100).rename(columns={"Date": "match_date", "HomeTeam": "home_team", "AwayTeam": "away_team", "FTHG": "home_goals", "FTAG": "away_goals"})
+    scraped["match_date"] = pd.to_datetime(scraped["match_date"], format="%d/%m/%Y").dt.strftime("%Y-%m-%d")
+    scraped[["match_date", "home_team", "away_team", "home_goals", "away_goals"]].to_csv(tmp_path / "scraped.csv", index=False)
+    
+    sources = {spec.name: spec for spec in SOURCE_REGISTRY}
+    files = [(sources["public"], tmp_path / "public.csv"), (sources["scraped_bs4"], tmp_path / "scraped.csv")]
+    n_written = clean_raw_files(files, tmp_path / "clean.csv", block_size=4096, n_workers=2)
+    cleaned = pd.read_csv(tmp_path / "clean.csv", parse_dates=["match_date"])
+    
+    reference = public.dropna(subset=["Date"]).assign(match_date=lambda df: pd.to_datetime(df["Date"], format="%d/%m/%Y"))
+    reference = reference.drop_duplicates(subset=["match_date", "HomeTeam", "AwayTeam"])
+    
+    assert n_written == len(cleaned) == len(reference)
+    assert list(cleaned.columns) == ["match_date", "home_team", "away_team", "home_goals", "away_goals", "result"]
+    assert cleaned["match_date"].is_monotonic_increasing
+    assert not cleaned.duplicated(subset=["match_date", "home_team", "away_team"]).any()
+    expected = np.where(cleaned["home_goals"] > cleaned["away_goals"], "H", np.where(cleaned["home_goals"] < cleaned["away_goals"], "A", "D"))
+    assert (cleaned["result"] == expected).all()
+
+
+def test_clean_raw_files_keeps_only_configured_league(tmp_path):
+    """Test that rows from other divisions are dropped unless the league filter is disabled."""
+    for league in ("E0", "SP1"):
+        pd.DataFrame({
+            "Div": league,
+            "Date": ["14/08/2021", "21/08/2021"],
+            "HomeTeam": [f"{league} A", f"{league} B"],
+            "AwayTeam": [f"{league} C", f"{league} D"],
+            "FTHG": [1, 2],
+            "FTAG": [0, 2]
+        }).to_csv(tmp_path / f"{league}.csv", index=False)
+    
+    sources = {spec.name: spec for spec in SOURCE_REGISTRY}
+    files = [(sources["football_data"], tmp_path / "E0.csv"), (sources["football_data"], tmp_path / "SP1.csv")]
+    
+    assert clean_raw_files(files, tmp_path / "clean.csv", n_workers=1) == 2
+    assert set(pd.read_csv(tmp_path / "clean.csv")["home_team"]) == {"E0 A", "E0 B"}
+    assert clean_raw_files(files, tmp_path / "all.csv", n_workers=1, league=None) == 4
+
+
+def test_clean_raw_files_writes_one_date_format_across_years(tmp_path):
+    """Test that a year with kick-off times is written in the same format as a midnight-only year."""
+    pd.DataFrame({
+        "Date": ["2020-08-14", "2021-08-14 15:00:00", "2021-08-14"],
+        "HomeTeam": ["Arsenal", "Chelsea", "Chelsea"],
+        "AwayTeam": ["Fulham", "Palace", "Palace"],
+        "FTHG": [3, 3, 3],
+        "FTAG": [0, 0, 0]
+    }).to_csv(tmp_path / "public.csv", index=False)
+    
+    sources = {spec.name: spec for spec in SOURCE_REGISTRY}
+    n_written = clean_raw_files([(sources["public"], tmp_path / "public.csv")], tmp_path / "clean.csv", n_workers=1)
+    cleaned = pd.read_csv(tmp_path / "clean.csv")
+    
+    assert n_written == 2
+    assert cleaned["match_date"].tolist() == ["2020-08-14", "2021-08-14"]
+    assert pd.to_datetime(cleaned["match_date"]).dt.year.tolist() == [2020, 2021]
+
+
+def test_cleaned_csv_from_timed_scraped_source_loads_for_features(tmp_path):
+    """Test that a midnight-only public year and a timed scraped year give a CSV format-less readers parse."""
+    pd.DataFrame({
+        "Date": ["14/08/2020"],
+        "HomeTeam": ["Arsenal"],
+        "AwayTeam": ["Fulham"],
+        "FTHG": [3],
+        "FTAG": [0]
+    }).to_csv(tmp_path / "epl_matches_raw.csv", index=False)
+    pd.DataFrame({
+        "match_date": ["2021-08-14 15:00:00"],
+        "home_team": ["Fulham"],
+        "away_team": ["Arsenal"],
+        "home_goals": [1],
+        "away_goals": [1]
+    }).to_csv(tmp_path / "scraped_matches_bs4.csv", index=False)
+    
+    clean_raw_files(discover_source_files(tmp_path), tmp_path / "clean.csv", n_workers=2)
+    history = pd.read_csv(tmp_path / "clean.csv")
+    history["match_date"] = pd.to_datetime(history["match_date"])
+    
+    assert history["match_date"].tolist() == [pd.Timestamp("2020-08-14"), pd.Timestamp("2021-08-14")]
+    assert build_form_index(history).team_stats("Arsenal", "2022-01-01")["points"] == 2.0
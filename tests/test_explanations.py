@@ -0,0 +1,98 @@
+"""Tests for cached per-match explanations."""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import explanations
+from src.models.explanations import BIAS_NAME, ExplanationCache, MatchExplainer, feature_row_keys
+from src.models.model_io import load_model, resolve_model_file
+from src.models.prediction_utils import Predictor, prepare_fixture_features
+from tests.test_batch_predict import fixtures
+from tests.test_form_engine import make_matches
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    if not resolve_model_file().exists():
+        pytest.skip("Model not available for testing")
+    data_file = tmp_path / "matches.csv"
+    make_matches(n_matches=100, seed=12).to_csv(data_file, index=False)
+    return Predictor(resolve_model_file(), data_file, use_pairwise=False, explanations_file=tmp_path / "explanations.npz")
+
+
+def test_contributions_sum_to_model_probabilities(predictor):
+    """Test that each match's contributions add up to the probabilities the model predicts."""
+    results = predictor.explain_many(fixtures())
+    batch = predictor.predict_frame(fixtures())
+    
+    for result, row in zip(results, batch.itertuples(index=False)):
+        assert abs(result["probabilities"]["Home Win"] - row.prob_home_win) < 1e-5
+        assert result["predicted_outcome"] == row.predicted_outcome
+        assert result["contributions"].index[-1] == BIAS_NAME
+        assert len(result["contributions"]) == len(load_model().feature_names) + 1
+
+
+def test_single_match_is_served_from_gameweek_cache(predictor, tmp_path):
+    """Test that explaining a gameweek caches every fixture so single requests and restarts skip the booster."""
+    predictor.explain_many(fixtures())
+    
+    with mock.patch.object(explanations, "compute_contributions", side_effect=AssertionError("recomputed")):
+        for home, away, date in fixtures().head(3).itertuples(index=False):
+            assert predictor.explain(home, away, date)["home_team"] == home
+        
+        reloaded = MatchExplainer(resolve_model_file(), tmp_path / "explanations.npz")
+        contributions, _ = reloaded.explain_rows(prepare_fixture_features(fixtures(), predictor.history))
+        assert contributions.shape[:2] == (15, 3)
+
+
+def test_cache_is_keyed_by_model_version_and_row(tmp_path):
+    """Test deduplication of repeated rows and that another model version ignores the file."""
+    X = pd.DataFrame({"a": [1.0, 2.0, 1.0], "b": [0.0, -0.0, 0.0]})
+    keys = feature_row_keys(X)
+    assert keys[0] == keys[2] != keys[1]
+    
+    cache = ExplanationCache("v1", ["a", "b"])
+    cache.add(keys, np.random.default_rng(0).random((3, 3, 3)).astype(np.float32), np.full((3, 3), 1 / 3))
+    assert len(cache) == 2
+    
+    cache.save(tmp_path / "cache.npz")
+    assert len(ExplanationCache.load("v1", tmp_path / "cache.npz")) == 2
+    assert np.array_equal(ExplanationCache.load("v1", tmp_path / "cache.npz").get(keys[1])[0], cache.get(keys[1])[0])
+    assert ExplanationCache.load("v2", tmp_path / "cache.npz") is None
+
+
+def test_cache_keeps_newest_rows_and_replaces_file(tmp_path):
+    """Test that the cache prunes its oldest rows past the cap and leaves no temporary files."""
+    X = pd.DataFrame({"a": np.arange(5.0), "b": np.zeros(5)})
+    keys = feature_row_keys(X)
+    cache = ExplanationCache("v1", ["a", "b"], max_rows=3)
+    
+    cache.add(keys[:2], np.zeros((2, 3, 3), dtype=np.float32), np.full((2, 3), 1 / 3))
+    cache.add(keys[2:], np.ones((3, 3, 3), dtype=np.float32), np.full((3, 3), 1 / 3))
+    cache.save(tmp_path / "cache.npz")
+    
+    assert list(cache.index) == keys[2:]
+    assert cache.get(keys[0]) is None and cache.get(keys[4])[0].sum() == 9.0
+    assert len(ExplanationCache.load("v1", tmp_path / "cache.npz", max_rows=2)) == 2
+    assert [path.name for path in tmp_path.iterdir()] == ["cache.npz"]
+
+
+def test_single_misses_are_buffered_until_flush(predictor, tmp_path):
+    """Test that one-row misses are written in batches of flush_rows and on close."""
+    cache_file = tmp_path / "buffered.npz"
+    explainer = MatchExplainer(resolve_model_file(), cache_file, flush_rows=3)
+    X = prepare_fixture_features(fixtures(), predictor.history).drop_duplicates().head(4)
+    
+    for i in range(2):
+        explainer.explain_rows(X.iloc[[i]])
+    assert not cache_file.exists()
+    
+    explainer.explain_rows(X.iloc[[2]])
+    assert len(ExplanationCache.load(explainer.model_version, cache_file)) == 3
+    
+    explainer.explain_rows(X.iloc[[3]])
+    explainer.close()
+    assert len(ExplanationCache.load(explainer.model_version, cache_file)) == 4
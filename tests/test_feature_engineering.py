@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from src.data_preprocessing import feature_engineering
 from src.data_preprocessing.feature_engineering import build_feature_matrix
 
 
@@ -47,3 +48,23 @@ def test_feature_matrix_dimensions():
     
     assert X.shape[1] == 15
 
+
+
+def test_wide_matrix_defaults_read_config_at_call_time(tmp_path, monkeypatch):
+    """Test that omitted windows and half-lives come from the config when called, not when defined."""
+    monkeypatch.setattr(feature_engineering, "X_FEATURES_WIDE_FILE", tmp_path / "X_wide.parquet")
+    monkeypatch.setattr(feature_engineering, "ROLLING_WINDOWS", [4])
+    monkeypatch.setattr(feature_engineering, "EWM_HALFLIVES", [2])
+    dates = [datetime(2020, 1, 1) + timedelta(days=i*7) for i in range(10)]
+    clean_data = pd.DataFrame({
+        "match_date": dates,
+        "home_team": ["Team A", "Team B"] * 5,
+        "away_team": ["Team B", "Team A"] * 5,
+        "home_goals": [2, 1] * 5,
+        "away_goals": [1, 2] * 5,
+        "result": ["H", "A"] * 5
+    })
+    
+    X, _ = feature_engineering.build_wide_feature_matrix(clean_data)
+    
+    assert {column.rsplit("_", 1)[-1] for column in X.columns} == {"w4", "h2"}
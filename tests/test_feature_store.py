@@ -0,0 +1,103 @@
+"""Tests for the incremental feature store."""
+
+import json
+
+import pandas as pd
+
+from src.data_preprocessing import feature_store
+from src.data_preprocessing.feature_store import FeatureStore, match_keys, match_keys_path, read_match_keys
+from src.data_preprocessing.form_engine import compute_form_features, encode_targets
+from tests.test_form_engine import make_matches
+
+
+def test_update_matches_full_rebuild():
+    """Test that appending a batch gives the same rows as rebuilding from scratch."""
+    df = make_matches(n_matches=150, seed=1).sort_values("match_date").reset_index(drop=True)
+    history, new_matches = df.iloc[:120], df.iloc[120:]
+
+    store = FeatureStore.from_history(history)
+    X_new, y_new = store.update(new_matches)
+
+    full = compute_form_features(df)
+    expected = full.iloc[120:][new_matches["result"].isin(["H", "D", "A"]).to_numpy()]
+
+    pd.testing.assert_frame_equal(X_new, expected.reset_index(drop=True))
+    assert len(y_new) == len(X_new)
+
+
+def test_append_skips_known_matches_and_round_trips(tmp_path):
+    """Test that already-processed matches are ignored and the state survives save/load."""
+    df = make_matches(n_matches=60, seed=2).sort_values("match_date").reset_index(drop=True)
+    store = FeatureStore.from_history(df.iloc[:50])
+
+    x_path, y_path, state_path = tmp_path / "X.parquet", tmp_path / "y.parquet", tmp_path / "state.json"
+    X_first, _ = store.append(df, x_path, y_path, state_path)
+    X_again, _ = FeatureStore.load(state_path).append(df, x_path, y_path, state_path)
+
+    assert len(X_again) == 0
+    assert len(pd.read_parquet(x_path)) == len(X_first)
+    assert len(pd.read_parquet(y_path)) == len(X_first)
+
+
+def test_late_and_unplayed_matches(tmp_path):
+    """Test dedup by match key, waiting on unplayed fixtures and appending batches as part files."""
+    df = make_matches(n_matches=60, seed=3).sort_values("match_date").reset_index(drop=True)
+    history = df.drop(index=[45, 58])
+    incoming = pd.concat([history, df.loc[[45, 58]]])
+    incoming.loc[58, "result"] = None
+    store = FeatureStore.from_history(history.iloc[:-2])
+    last_date = store.last_match_date
+    
+    x_path, y_path, state_path = tmp_path / "X.parquet", tmp_path / "y.parquet", tmp_path / "state.json"
+    store.append(history, x_path, y_path, state_path)
+    X_late, _ = store.append(incoming, x_path, y_path, state_path)
+    
+    assert len(X_late) == 1
+    assert store.last_match_date == history["match_date"].max() > last_date
+    assert f"{df.loc[58, 'match_date']:%Y-%m-%dT%H:%M:%S}|{df.loc[58, 'home_team']}|{df.loc[58, 'away_team']}" not in store.seen
+    
+    X_played, _ = FeatureStore.load(state_path).append(df, x_path, y_path, state_path)
+    
+    assert len(X_played) == 1
+    assert sorted(path.name for path in x_path.iterdir()) == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+    assert len(pd.read_parquet(x_path)) == len(pd.read_parquet(y_path)) == 4
+
+
+def test_result_less_fixtures_match_full_rebuild():
+    """Test that fixtures without a result count in the window as in a full rebuild, before and after their result."""
+    played = make_matches(n_matches=150, seed=1).sort_values("match_date").reset_index(drop=True)
+    df = played.copy()
+    df.loc[[118, 125], "result"] = None
+    
+    store = FeatureStore.from_history(df.iloc[:120])
+    X_new, _ = store.update(df.iloc[120:])
+    
+    expected = compute_form_features(df).iloc[120:][df.iloc[120:]["result"].isin(["H", "D", "A"]).to_numpy()]
+    pd.testing.assert_frame_equal(X_new, expected.reset_index(drop=True))
+    assert store.watermark == df.loc[7, "match_date"]
+    
+    X_late, _ = store.update(played)
+    
+    pd.testing.assert_frame_equal(X_late, compute_form_features(played).loc[[118, 125]].reset_index(drop=True))
+
+
+def test_refresh_passes_only_rows_from_the_watermark(tmp_path, monkeypatch):
+    """Test that a refresh featurizes only rows from the watermark on and keeps a bounded set of match keys."""
+    df = make_matches(n_matches=200, seed=4).sort_values("match_date").reset_index(drop=True)
+    df["result"] = df["result"].fillna("D")
+    paths = {"FEATURE_STORE_FILE": tmp_path / "state.json", "X_FEATURES_FILE": tmp_path / "X.parquet", "Y_TARGET_FILE": tmp_path / "y.parquet"}
+    for name, path in paths.items():
+        monkeypatch.setattr(feature_store, name, path)
+    compute_form_features(df.iloc[:150]).to_parquet(paths["X_FEATURES_FILE"], index=False)
+    encode_targets(df.iloc[:150]["result"]).to_frame().to_parquet(paths["Y_TARGET_FILE"], index=False)
+    match_keys(df.iloc[:150]).rename("match_key").to_frame().to_parquet(match_keys_path(paths["X_FEATURES_FILE"]), index=False)
+    FeatureStore.from_history(df.iloc[:150]).save(paths["FEATURE_STORE_FILE"])
+    
+    batch_sizes = []
+    featurize = FeatureStore._featurize
+    monkeypatch.setattr(FeatureStore, "_featurize", lambda self, matches: batch_sizes.append(len(matches)) or featurize(self, matches))
+    X_new, _ = feature_store.refresh_feature_store(df)
+    
+    assert batch_sizes == [51] and len(X_new) == 50
+    assert read_match_keys(paths["X_FEATURES_FILE"], 200).tolist() == match_keys(df).tolist()
+    assert json.loads(paths["FEATURE_STORE_FILE"].read_text())["matches"] == [f"{df.loc[199, 'match_date']:%Y-%m-%dT%H:%M:%S}|{df.loc[199, 'home_team']}|{df.loc[199, 'away_team']}"]
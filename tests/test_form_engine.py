@@ -0,0 +1,123 @@
+"""Tests for the vectorized rolling-form engine."""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.data_preprocessing.feature_engineering import calculate_rolling_stats
+from src.data_preprocessing.form_engine import (
+    FEATURE_COLUMNS,
+    compute_form_features,
+    compute_multi_window_features
+)
+
+
+def make_matches(n_matches=120, seed=0):
+    """Random fixtures between a handful of teams, including missing results and goals."""
+    rng = np.random.default_rng(seed)
+    teams = ["Arsenal", "Chelsea", "Everton", "Fulham", "Liverpool", "Wolves"]
+    rows = []
+    for i in range(n_matches):
+        home, away = rng.choice(teams, size=2, replace=False)
+        home_goals, away_goals = rng.poisson(1.4), rng.poisson(1.1)
+        result = "H" if home_goals > away_goals else "A" if away_goals > home_goals else "D"
+        rows.append({
+            "match_date": datetime(2020, 8, 1) + timedelta(days=3 * i),
+            "home_team": home,
+            "away_team": away,
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "result": result
+        })
+    df = pd.DataFrame(rows)
+    df.loc[df.index.isin([7, 40]), "result"] = None
+    df.loc[df.index.isin([15, 90]), "home_goals"] = np.nan
+    return df
+
+
+def legacy_features(df_sorted):
+    """Reference row-by-row implementation the engine replaces."""
+    rows = []
+    for _, row in df_sorted.iterrows():
+        home_stats = calculate_rolling_stats(df_sorted, row["home_team"], True, row["match_date"])
+        away_stats = calculate_rolling_stats(df_sorted, row["away_team"], False, row["match_date"])
+        rows.append({
+            "home_goals_scored_avg": home_stats["goals_scored"],
+            "home_goals_conceded_avg": home_stats["goals_conceded"],
+            "home_points_avg": home_stats["points"],
+            "home_home_goals_scored_avg": home_stats["home_goals_scored"],
+            "home_home_goals_conceded_avg": home_stats["home_goals_conceded"],
+            "home_home_points_avg": home_stats["home_points"],
+            "away_goals_scored_avg": away_stats["goals_scored"],
+            "away_goals_conceded_avg": away_stats["goals_conceded"],
+            "away_points_avg": away_stats["points"],
+            "away_away_goals_scored_avg": away_stats["away_goals_scored"],
+            "away_away_goals_conceded_avg": away_stats["away_goals_conceded"],
+            "away_away_points_avg": away_stats["away_points"],
+            "goals_scored_diff": home_stats["goals_scored"] - away_stats["goals_scored"],
+            "goals_conceded_diff": home_stats["goals_conceded"] - away_stats["goals_conceded"],
+            "points_diff": home_stats["points"] - away_stats["points"]
+        })
+    return pd.DataFrame(rows)
+
+
+def test_compute_form_features_matches_legacy():
+    """Test that the vectorized engine reproduces the row-by-row features exactly."""
+    df_sorted = make_matches().sort_values("match_date").reset_index(drop=True)
+
+    expected = legacy_features(df_sorted)
+    features = compute_form_features(df_sorted)
+
+    assert list(features.columns) == FEATURE_COLUMNS
+    pd.testing.assert_frame_equal(features, expected, check_exact=True)
+
+
+def test_compute_form_features_excludes_same_day_matches():
+    """Test that matches played on the match date never leak into the window."""
+    df = pd.DataFrame({
+        "match_date": pd.to_datetime(["2020-01-01", "2020-01-08", "2020-01-08"]),
+        "home_team": ["Team A", "Team A", "Team C"],
+        "away_team": ["Team B", "Team C", "Team B"],
+        "home_goals": [3, 1, 0],
+        "away_goals": [0, 1, 2],
+        "result": ["H", "D", "A"]
+    })
+
+    features = compute_form_features(df)
+
+    assert features.loc[1, "home_points_avg"] == 3.0
+    assert features.loc[2, "away_points_avg"] == 0.0
+    assert features.loc[0].abs().sum() == 0.0
+
+
+def test_multi_window_features_match_single_window():
+    """Test that each window slice equals the single-window engine output."""
+    df_sorted = make_matches(n_matches=150, seed=4).sort_values("match_date").reset_index(drop=True)
+
+    wide = compute_multi_window_features(df_sorted, windows=[3, 5, 10], halflives=[2])
+
+    for window in [3, 5, 10]:
+        expected = compute_form_features(df_sorted, window).add_suffix(f"_w{window}")
+        pd.testing.assert_frame_equal(wide[expected.columns], expected)
+
+    ewm_columns = [column for column in wide.columns if column.endswith("_ewm_h2")]
+    assert len(ewm_columns) == 9
+    assert (wide[ewm_columns].iloc[0] == 0.0).all()
+
+
+def test_ewm_features_follow_recurrence():
+    """Test the EWMA columns against a direct weighted average of prior matches."""
+    df_sorted = make_matches(n_matches=80, seed=5).sort_values("match_date").reset_index(drop=True)
+    halflife = 3
+    decay = 0.5 ** (1 / halflife)
+
+    wide = compute_multi_window_features(df_sorted, windows=[], halflives=[halflife])
+
+    team = df_sorted["home_team"].iloc[-1]
+    played = df_sorted.iloc[:-1]
+    played = played[(played["home_team"] == team) | (played["away_team"] == team)]
+    goals = np.where(played["home_team"] == team, played["home_goals"], played["away_goals"])
+    goals = np.nan_to_num(goals.astype(float))
+    weights = decay ** np.arange(len(goals))[::-1]
+
+    assert np.isclose(wide[f"home_goals_scored_ewm_h{halflife}"].iloc[-1], (weights * goals).sum() / weights.sum())
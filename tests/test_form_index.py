@@ -0,0 +1,28 @@
+"""Tests for the per-team form index."""
+
+import pandas as pd
+import pytest
+
+from src.data_preprocessing.feature_engineering import calculate_rolling_stats
+from src.data_preprocessing.form_index import build_form_index
+from tests.test_form_engine import make_matches
+
+
+@pytest.mark.parametrize("as_of", ["2020-08-01", "2020-10-15", "2021-01-02", "2022-06-30"])
+def test_team_stats_matches_rolling_stats(as_of):
+    """Test that index lookups agree with a full scan at past and future dates."""
+    history = make_matches(n_matches=150, seed=3)
+    index = build_form_index(history)
+    as_of = pd.Timestamp(as_of)
+
+    for team in index.teams:
+        assert index.team_stats(team, as_of) == calculate_rolling_stats(history, team, True, as_of)
+
+
+def test_unknown_team_has_empty_form():
+    """Test that a team without history gets zero-valued statistics."""
+    index = build_form_index(make_matches(n_matches=20))
+
+    stats = index.team_stats("Luton", pd.Timestamp("2021-01-01"))
+
+    assert set(stats.values()) == {0.0}
@@ -0,0 +1,43 @@
+"""Import-time regression tests for the prediction path."""
+
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET_SECONDS = 1.5
+HEAVY_MODULES = ["xgboost", "sklearn", "joblib", "matplotlib", "seaborn"]
+PREDICTION_MODULES = [
+    "src.models.prediction_utils",
+    "src.models.batch_predict",
+    "src.models.season_simulator"
+]
+
+
+def cumulative_import_seconds(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter, from -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stderr
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+
+@pytest.mark.parametrize("module", PREDICTION_MODULES)
+def test_prediction_path_skips_heavy_imports(module):
+    """Test that importing a prediction module does not load training or plotting libraries."""
+    script = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ""
+
+
+def test_prediction_utils_import_time_budget():
+    """Test that importing the prediction utilities stays within the time budget."""
+    seconds = min(cumulative_import_seconds("src.models.prediction_utils") for _ in range(3))
+    assert seconds < IMPORT_TIME_BUDGET_SECONDS
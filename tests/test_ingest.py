@@ -0,0 +1,95 @@
+"""Tests for concurrent raw data ingestion."""
+
+import pandas as pd
+import pyarrow as pa
+
+from src.data_preprocessing.ingest import (
+    MATCH_SCHEMA,
+    SOURCE_REGISTRY,
+    derive_results,
+    discover_source_files,
+    ingest_raw_data,
+    read_source_file
+)
+
+SOURCES = {spec.name: spec for spec in SOURCE_REGISTRY}
+
+
+def test_discovery_assigns_each_file_to_first_matching_spec(tmp_path):
+    """Test that registry order decides which spec reads a file and that the catch-all takes the rest."""
+    for relative in ["epl_matches_raw.csv", "scraped_matches_bs4.csv", "football-data/E0/2019.csv", "football-data/SP1/2019.csv", "extra/old.csv"]:
+        (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative).write_text("Date\n")
+    
+    found = [(spec.name, path.relative_to(tmp_path).as_posix()) for spec, path in discover_source_files(tmp_path)]
+    
+    assert found == [
+        ("public", "epl_matches_raw.csv"),
+        ("football_data", "football-data/E0/2019.csv"),
+        ("football_data", "football-data/SP1/2019.csv"),
+        ("scraped_bs4", "scraped_matches_bs4.csv"),
+        ("other", "extra/old.csv")
+    ]
+
+
+def test_football_data_file_maps_to_typed_schema(tmp_path):
+    """Test explicit day-first dates, typed goals, league from Div and derived results."""
+    path = tmp_path / "E0.csv"
+    path.write_text(
+        "Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR,B365H\n"
+        "E0,01/08/20,Arsenal,Fulham,3,0,H,1.5\n"
+        "E0,02/08/2020,Chelsea,Leeds, 1,1,,2.1\n"
+        "E0,soon,Everton,Spurs,0,2,A,3.0\n"
+        "E0,03/08/2020,Wolves,Burnley,x,2,,2.5\n"
+    )
+    
+    table = read_source_file(SOURCES["football_data"], path)
+    
+    assert table.schema == MATCH_SCHEMA
+    df = table.to_pandas()
+    assert df["match_date"].tolist() == [pd.Timestamp("2020-08-01"), pd.Timestamp("2020-08-02"), pd.Timestamp("2020-08-03")]
+    assert df["home_goals"].tolist()[:2] == [3, 1] and pd.isna(df["home_goals"].iloc[2])
+    assert df["result"].tolist()[:2] == ["H", "D"] and df["result"].iloc[2] is None
+    assert set(df["league"]) == {"E0"} and set(df["source"]) == {"football_data"}
+
+
+def test_derive_results():
+    """Test result codes from scores, with null for missing scores."""
+    results = derive_results(pa.array([2, 0, 1, None]), pa.array([1, 3, 1, 1]))
+    
+    assert results.to_pylist() == ["H", "A", "D", None]
+
+
+def test_ingest_reads_files_concurrently_in_discovery_order(tmp_path):
+    """Test that threaded ingestion concatenates every file in order."""
+    for season in range(6):
+        pd.DataFrame({
+            "match_date": [f"{2000 + season}-08-0{day}" for day in range(1, 4)],
+            "home_team": ["A", "B", "C"],
+            "away_team": ["D", "E", "F"],
+            "home_goals": [1, 0, 2],
+            "away_goals": [0, 0, 3]
+        }).to_csv(tmp_path / f"season_{season}.csv", index=False)
+    
+    table = ingest_raw_data(discover_source_files(tmp_path), n_workers=3)
+    
+    assert table.num_rows == 18
+    assert table.to_pandas()["match_date"].is_monotonic_increasing
+    assert table["result"].to_pylist()[:3] == ["H", "D", "A"]
+
+
+def test_scores_written_as_floats_or_blank(tmp_path):
+    """Test that integral float scores parse, while blank, fractional and negative scores become null."""
+    path = tmp_path / "scraped.csv"
+    path.write_text(
+        "match_date,home_team,away_team,home_goals,away_goals\n"
+        "2021-08-14,Arsenal,Brentford,2.0,0.0\n"
+        "2021-08-15,Chelsea,Palace, 3 ,\n"
+        "2021-08-21,Everton,Leeds,1.5,-1\n"
+    )
+    
+    table = read_source_file(SOURCES["scraped_bs4"], path)
+    
+    assert table["home_goals"].to_pylist() == [2, 3, None]
+    assert table["away_goals"].to_pylist() == [0, None, None]
+    assert table["result"].to_pylist() == ["H", None, None]
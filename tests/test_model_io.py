@@ -0,0 +1,49 @@
+"""Tests for native model saving and loading."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import MODEL_FILE, X_FEATURES_FILE
+from src.models.model_io import load_metadata, load_model, save_model
+
+
+@pytest.fixture
+def legacy_model():
+    if not MODEL_FILE.exists():
+        pytest.skip("Model not available for testing")
+    import joblib
+    return joblib.load(MODEL_FILE)
+
+
+def test_native_round_trip_matches_pickle(legacy_model, tmp_path):
+    """Test that a model saved natively predicts exactly like the pickled classifier."""
+    X = pd.read_parquet(X_FEATURES_FILE).head(50)
+    model_file, metadata_file = tmp_path / "model.ubj", tmp_path / "model.meta.json"
+    
+    save_model(legacy_model, list(X.columns), "abc123", {"n_samples": 50}, model_file, metadata_file)
+    model = load_model(model_file, metadata_file)
+    
+    assert np.allclose(model.predict_proba(X), legacy_model.predict_proba(X), atol=1e-7)
+    assert (model.predict(X) == legacy_model.predict(X)).all()
+    assert np.allclose(model.feature_importances_, legacy_model.feature_importances_)
+    
+    metadata = load_metadata(metadata_file)
+    assert metadata["feature_names"] == list(X.columns)
+    assert metadata["classes"] == [0, 1, 2]
+    assert metadata["training_data_hash"] == "abc123"
+
+
+def test_model_elsewhere_reads_its_own_sidecar(legacy_model, tmp_path):
+    """Test that a model outside models/ is paired with the sidecar next to it, not the production one."""
+    model_file = tmp_path / "candidate.ubj"
+    save_model(legacy_model, legacy_model.get_booster().feature_names, "candidate", model_file=model_file)
+    
+    assert (tmp_path / "candidate.meta.json").exists()
+    assert load_model(model_file).metadata["training_data_hash"] == "candidate"
+
+
+def test_load_model_reports_missing_file(tmp_path):
+    """Test that a missing model raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        load_model(tmp_path / "missing.ubj")
@@ -0,0 +1,77 @@
+"""Tests for out-of-core training over Parquet row groups."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import XGB_PARAMS
+from src.data_preprocessing.feature_store import match_keys_path
+from src.models.model_io import load_metadata, load_model
+from src.models.out_of_core import parquet_row_batches, train_xgboost_streaming
+from src.models.train_xgboost import update_xgboost_model
+
+
+def write_files(tmp_path, n_rows=500):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=list("abcd"))
+    y = pd.DataFrame({"target": (X["a"] > 0).astype(int) + (X["b"] > 0.5).astype(int)})
+    pq.write_table(pa.Table.from_pandas(X, preserve_index=False), tmp_path / "X.parquet", row_group_size=64)
+    pq.write_table(pa.Table.from_pandas(y, preserve_index=False), tmp_path / "y.parquet", row_group_size=100)
+    return X, y
+
+
+def test_row_batches_stay_aligned(tmp_path):
+    """Test that batches cover the requested rows with matching targets across differing row groups."""
+    X, y = write_files(tmp_path)
+    
+    batches = list(parquet_row_batches(tmp_path / "X.parquet", tmp_path / "y.parquet", 130, 410, 50))
+    
+    assert max(len(features) for features, _ in batches) <= 50
+    pd.testing.assert_frame_equal(pd.concat([f for f, _ in batches], ignore_index=True), X.iloc[130:410].reset_index(drop=True))
+    assert (np.concatenate([t for _, t in batches]) == y["target"].to_numpy()[130:410]).all()
+
+
+def test_streaming_training_learns_and_saves(tmp_path):
+    """Test that streaming and external-memory training produce a usable saved model."""
+    X, y = write_files(tmp_path)
+    params = {**XGB_PARAMS, "n_estimators": 20}
+    
+    for external_memory in (False, True):
+        model_file, metadata_file = tmp_path / "model.ubj", tmp_path / "model.meta.json"
+        train_xgboost_streaming(
+            64, external_memory, tmp_path / "X.parquet", tmp_path / "y.parquet", model_file, metadata_file, params
+        )
+        
+        model = load_model(model_file, metadata_file)
+        assert (model.predict(X) == y["target"]).mean() > 0.8
+        metadata = load_metadata(metadata_file)
+        assert metadata["feature_names"] == list("abcd")
+        assert metadata["n_train_samples"] == 400
+
+
+def test_streaming_model_can_be_refreshed_without_round_count(tmp_path):
+    """Test that params without n_estimators train and leave a sidecar the incremental update accepts."""
+    X, y = write_files(tmp_path)
+    params = {key: value for key, value in XGB_PARAMS.items() if key != "n_estimators"}
+    keys = pd.DataFrame({"match_key": [f"match-{i:03d}" for i in range(560)]})
+    keys.head(500).to_parquet(match_keys_path(tmp_path / "X.parquet"), index=False)
+    model_file, metadata_file = tmp_path / "model.ubj", tmp_path / "model.meta.json"
+    
+    booster = train_xgboost_streaming(
+        64, False, tmp_path / "X.parquet", tmp_path / "y.parquet", model_file, metadata_file, params
+    )
+    metadata = load_metadata(metadata_file)
+    
+    assert booster.num_boosted_rounds() == XGB_PARAMS["n_estimators"]
+    assert metadata["full_training_samples"] == 400
+    assert metadata["full_training_seconds"] > 0
+    
+    (tmp_path / "more").mkdir()
+    X_more, y_more = write_files(tmp_path / "more", 60)
+    pq.write_table(pa.Table.from_pandas(pd.concat([X, X_more], ignore_index=True), preserve_index=False), tmp_path / "X.parquet")
+    pq.write_table(pa.Table.from_pandas(pd.concat([y, y_more], ignore_index=True), preserve_index=False), tmp_path / "y.parquet")
+    keys.to_parquet(match_keys_path(tmp_path / "X.parquet"), index=False)
+    report = update_xgboost_model(10, 1000, 10.0, 0.5, tmp_path / "X.parquet", tmp_path / "y.parquet", model_file, metadata_file)
+    
+    assert report["mode"] == "update"
@@ -0,0 +1,86 @@
+"""Tests for the all-pairs probability tensor."""
+
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+
+from src.models.model_io import resolve_model_file
+from src.models.pairwise_matrix import build_pairwise_probabilities, load_pairwise_probabilities
+from src.models import prediction_utils
+from src.models.prediction_utils import Predictor, get_predictor, load_trained_model, prepare_single_match_features
+from tests.test_form_engine import make_matches
+
+
+@pytest.fixture
+def model():
+    if not resolve_model_file().exists():
+        pytest.skip("Model not available for testing")
+    return load_trained_model()
+
+
+def test_lookup_matches_direct_prediction(model):
+    """Test that tensor entries equal scoring the fixture directly."""
+    history = make_matches(n_matches=100, seed=13)
+    pairwise = build_pairwise_probabilities(model, history)
+    
+    assert pairwise.probabilities.shape == (6, 6, 3)
+    assert np.isnan(pairwise.probabilities[0, 0]).all()
+    
+    match_date = datetime(2023, 1, 1)
+    assert pairwise.covers("Arsenal", "Wolves", match_date)
+    assert not pairwise.covers("Arsenal", "Wolves", history["match_date"].min())
+    
+    X = prepare_single_match_features("Arsenal", "Wolves", match_date, history)
+    assert np.allclose(pairwise.lookup("Arsenal", "Wolves"), model.predict_proba(X)[0])
+
+
+def test_tensor_holds_only_current_season_teams(model):
+    """Test that teams absent from the latest season are left to the feature path."""
+    history = make_matches(n_matches=100, seed=13)
+    history.loc[:9, "match_date"] = history.loc[:9, "match_date"] - timedelta(days=400)
+    history.loc[:9, "home_team"] = "Luton"
+    
+    pairwise = build_pairwise_probabilities(model, history)
+    
+    assert pairwise.teams == ["Arsenal", "Chelsea", "Everton", "Fulham", "Liverpool", "Wolves"]
+    assert not pairwise.covers("Luton", "Arsenal", datetime(2023, 1, 1))
+
+
+def test_saved_tensor_is_memory_mapped_and_invalidated(model, tmp_path):
+    """Test the .npy round trip and that a changed data file makes it stale."""
+    data_file = tmp_path / "matches.csv"
+    history = make_matches(n_matches=50, seed=14)
+    history.to_csv(data_file, index=False)
+    paths = dict(probabilities_path=tmp_path / "pairs.npy", index_path=tmp_path / "pairs.json")
+    
+    build_pairwise_probabilities(model, history).save(model_file=resolve_model_file(), data_file=data_file, **paths)
+    loaded = load_pairwise_probabilities(model_file=resolve_model_file(), data_file=data_file, **paths)
+    
+    assert isinstance(loaded.probabilities, np.memmap)
+    
+    make_matches(n_matches=60, seed=15).to_csv(data_file, index=False)
+    assert load_pairwise_probabilities(model_file=resolve_model_file(), data_file=data_file, **paths) is None
+
+
+def test_predictor_serves_future_matches_from_tensor(model, tmp_path):
+    """Test that Predictor answers with the tensor and agrees with the feature path."""
+    data_file = tmp_path / "matches.csv"
+    make_matches(n_matches=80, seed=16).to_csv(data_file, index=False)
+    
+    paths = dict(pairwise_file=tmp_path / "pairs.npy", pairwise_index_file=tmp_path / "pairs.json")
+    cached = Predictor(resolve_model_file(), data_file, use_pairwise=True, **paths).predict("Everton", "Fulham", datetime(2023, 1, 1))
+    direct = Predictor(resolve_model_file(), data_file).predict("Everton", "Fulham", datetime(2023, 1, 1))
+    
+    for outcome, probability in direct["probabilities"].items():
+        assert abs(cached["probabilities"][outcome] - probability) < 1e-6
+    
+    restarted = Predictor(resolve_model_file(), data_file, use_pairwise=True, **paths)
+    restarted.refresh()
+    assert isinstance(restarted._pairwise.probabilities, np.memmap)
+
+
+def test_default_predictor_uses_tensor(monkeypatch):
+    """Test that the shared predictor behind predict_match and the app serves from the tensor."""
+    monkeypatch.setattr(prediction_utils, "_default_predictor", None)
+    
+    assert get_predictor().use_pairwise
@@ -0,0 +1,30 @@
+"""Tests for season-partitioned parallel feature building."""
+
+import pandas as pd
+
+from src.data_preprocessing.form_engine import compute_form_features
+from src.data_preprocessing.parallel_features import (
+    compute_form_features_parallel,
+    match_seasons,
+    season_partitions
+)
+from tests.test_form_engine import make_matches
+
+
+def test_match_seasons_split_in_summer():
+    """Test that matches are labelled with the season's starting year."""
+    dates = pd.Series(pd.to_datetime(["2023-05-28", "2023-08-12", "2024-01-01"]))
+
+    assert list(match_seasons(dates)) == [2022, 2023, 2023]
+
+
+def test_parallel_features_identical_to_serial():
+    """Test that the partitioned build reproduces the serial output exactly."""
+    df_sorted = make_matches(n_matches=500, seed=7).sort_values("match_date").reset_index(drop=True)
+
+    assert len(season_partitions(df_sorted)) > 2
+
+    serial = compute_form_features(df_sorted)
+    parallel = compute_form_features_parallel(df_sorted, n_jobs=2)
+
+    pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
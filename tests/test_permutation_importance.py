@@ -0,0 +1,41 @@
+"""Tests for parallel permutation importance."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import XGB_PARAMS
+from src.models.permutation_importance import permutation_importance
+from src.models.train_xgboost import train_xgboost_model
+
+
+@pytest.fixture
+def trained(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 3)), columns=["signal", "noise", "weak"])
+    y = pd.DataFrame({"target": (X["signal"] > 0).astype(int) + (X["signal"] > 1).astype(int)})
+    X.to_parquet(tmp_path / "X.parquet", index=False)
+    y.to_parquet(tmp_path / "y.parquet", index=False)
+    train_xgboost_model(tmp_path / "X.parquet", tmp_path / "y.parquet", tmp_path / "model.ubj", tmp_path / "model.meta.json", XGB_PARAMS)
+    return X, y["target"], tmp_path / "model.ubj"
+
+
+def test_informative_feature_ranks_first_with_interval(trained):
+    """Test that shuffling the signal hurts the most and its interval excludes zero."""
+    X, y, model_file = trained
+    importances = permutation_importance(X, y, model_file, n_repeats=10, n_jobs=1)
+    
+    assert importances["feature"].iloc[0] == "signal"
+    signal = importances.iloc[0]
+    assert 0 < signal["lower"] <= signal["importance"] <= signal["upper"]
+    assert signal["accuracy_drop"] > 0.2
+    assert importances.set_index("feature").loc["noise", "importance"] < signal["lower"]
+
+
+def test_workers_match_serial_scores(trained):
+    """Test that parallel workers on the memory-mapped split reproduce the serial result."""
+    X, y, model_file = trained
+    serial = permutation_importance(X, y, model_file, n_repeats=5, n_jobs=1)
+    parallel = permutation_importance(X, y, model_file, n_repeats=5, n_jobs=2)
+    
+    pd.testing.assert_frame_equal(serial, parallel)
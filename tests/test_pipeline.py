@@ -0,0 +1,131 @@
+"""Tests for the content-hash cached pipeline runner."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.pipeline import Stage, module_sources, run_pipeline
+
+
+def workdir() -> Path:
+    return Path(os.environ["PIPELINE_TEST_DIR"])
+
+
+def strip_source():
+    (workdir() / "mid.txt").write_text((workdir() / "source.txt").read_text().strip())
+    log_call("strip")
+
+
+def upper_report():
+    (workdir() / "upper.txt").write_text((workdir() / "mid.txt").read_text().upper())
+    log_call("upper")
+
+
+def length_report():
+    (workdir() / "length.txt").write_text(str(len((workdir() / "mid.txt").read_text())))
+    log_call("length")
+
+
+def log_call(name):
+    with open(workdir() / "calls.log", "a") as f:
+        f.write(name + "\n")
+
+
+def calls():
+    log = workdir() / "calls.log"
+    names = sorted(log.read_text().split()) if log.exists() else []
+    log.unlink(missing_ok=True)
+    return names
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPELINE_TEST_DIR", str(tmp_path))
+    (tmp_path / "source.txt").write_text("form")
+    return [
+        Stage("strip", f"{__name__}:strip_source", [tmp_path / "source.txt"], [tmp_path / "mid.txt"]),
+        Stage("upper", f"{__name__}:upper_report", [tmp_path / "mid.txt"], [tmp_path / "upper.txt"]),
+        Stage("length", f"{__name__}:length_report", [tmp_path / "mid.txt"], [tmp_path / "length.txt"], {"unit": "chars"})
+    ]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_unchanged_stages_are_skipped(stages, tmp_path, n_jobs):
+    """Test that a second run does nothing and a changed input reruns its dependants."""
+    state_file = tmp_path / "state.json"
+    
+    assert set(run_pipeline(stages, n_jobs=n_jobs, state_file=state_file).values()) == {"ran"}
+    assert calls() == ["length", "strip", "upper"]
+    
+    assert set(run_pipeline(stages, n_jobs=n_jobs, state_file=state_file).values()) == {"skipped"}
+    assert calls() == []
+    
+    (tmp_path / "source.txt").write_text("goals")
+    run_pipeline(stages, n_jobs=n_jobs, state_file=state_file)
+    assert calls() == ["length", "strip", "upper"]
+    assert (tmp_path / "upper.txt").read_text() == "GOALS"
+
+
+def test_identical_outputs_stop_propagation(stages, tmp_path):
+    """Test that a rerun producing identical outputs leaves downstream stages skipped."""
+    state_file = tmp_path / "state.json"
+    run_pipeline(stages, n_jobs=1, state_file=state_file)
+    calls()
+    
+    (tmp_path / "source.txt").write_text("form\n")
+    status = run_pipeline(stages, n_jobs=1, state_file=state_file)
+    
+    assert status == {"strip": "ran", "upper": "skipped", "length": "skipped"}
+
+
+def test_config_change_and_modified_output_rerun_stage(stages, tmp_path):
+    """Test that config changes and tampered outputs trigger a rerun of only that stage."""
+    state_file = tmp_path / "state.json"
+    run_pipeline(stages, n_jobs=1, state_file=state_file)
+    calls()
+    
+    stages[2].config = {"unit": "bytes"}
+    (tmp_path / "upper.txt").write_text("edited")
+    run_pipeline(stages, n_jobs=1, state_file=state_file)
+    
+    assert calls() == ["length", "upper"]
+    assert (tmp_path / "upper.txt").read_text() == "FORM"
+
+
+def test_targets_select_upstream_stages(stages, tmp_path):
+    """Test that a target brings only itself and its upstream stages up to date."""
+    status = run_pipeline(stages, targets=["upper"], n_jobs=1, state_file=tmp_path / "state.json")
+    
+    assert status == {"strip": "ran", "upper": "ran"}
+    assert not (tmp_path / "length.txt").exists()
+    
+    with pytest.raises(ValueError):
+        run_pipeline(stages, targets=["missing"], state_file=tmp_path / "state.json")
+
+
+def test_callable_inputs_are_discovered_at_run_time(tmp_path, monkeypatch):
+    """Test that a stage with discovered inputs reruns when a new input file appears."""
+    monkeypatch.setenv("PIPELINE_TEST_DIR", str(tmp_path))
+    (tmp_path / "source.txt").write_text("form")
+    state_file = tmp_path / "state.json"
+    stage = Stage("strip", f"{__name__}:strip_source", lambda: sorted(tmp_path.glob("source*.txt")), [tmp_path / "mid.txt"])
+    
+    assert run_pipeline([stage], n_jobs=1, state_file=state_file) == {"strip": "ran"}
+    assert run_pipeline([stage], n_jobs=1, state_file=state_file) == {"strip": "skipped"}
+    
+    (tmp_path / "source_2024.txt").write_text("new season")
+    assert run_pipeline([stage], n_jobs=1, state_file=state_file) == {"strip": "ran"}
+    calls()
+
+
+def test_module_sources_follow_src_imports():
+    """Test that a stage's code covers the src modules it imports, including function-level imports."""
+    features = {path.name for path in module_sources("src.data_preprocessing.feature_engineering")}
+    reports = {path.name for path in module_sources("src.models.reports")}
+    clean = {path.name for path in module_sources("src.data_preprocessing.clean_raw_data")}
+    
+    assert {"feature_engineering.py", "form_engine.py", "ratings.py", "config.py"} <= features
+    assert {"reports.py", "evaluate_model.py", "bootstrap_evaluation.py", "model_io.py"} <= reports
+    assert "train_xgboost.py" not in reports
+    assert {"clean_raw_data.py", "ingest.py"} <= clean
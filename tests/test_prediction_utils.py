@@ -4,7 +4,9 @@ import pytest
 import pandas as pd
 from datetime import datetime
 
-from src.models.prediction_utils import prepare_single_match_features
+from src.data_preprocessing.form_index import build_form_index
+from src.models.prediction_utils import prepare_fixture_features, prepare_single_match_features
+from tests.test_form_engine import make_matches
 
 
 def test_prepare_single_match_features():
@@ -44,3 +46,102 @@ def test_prediction_probabilities_sum():
     except (FileNotFoundError, ValueError):
         pytest.skip("Model or data not available for testing")
 
+
+def test_prepare_fixture_features_matches_single_match():
+    """Test that batch fixture features agree with per-match preparation."""
+    historical_data = make_matches(n_matches=120, seed=8)
+    fixtures = pd.DataFrame({
+        "home_team": ["Arsenal", "Wolves", "Luton", "Everton"],
+        "away_team": ["Chelsea", "Fulham", "Arsenal", "Liverpool"],
+        "match_date": pd.to_datetime(["2020-09-01", "2021-03-15", "2021-06-01", "2022-01-01"])
+    })
+    
+    features = prepare_fixture_features(fixtures, historical_data)
+    
+    for i, fixture in fixtures.iterrows():
+        expected = prepare_single_match_features(
+            fixture["home_team"], fixture["away_team"], fixture["match_date"], historical_data
+        )
+        pd.testing.assert_frame_equal(features.iloc[[i]].reset_index(drop=True), expected)
+
+
+def test_prepare_fixture_features_from_form_index():
+    """Test that batch features served from a FormIndex match the as-of join over the history."""
+    historical_data = make_matches(n_matches=150, seed=10)
+    fixtures = pd.DataFrame({
+        "home_team": ["Arsenal", "Luton", "Wolves", "Chelsea", "Arsenal"],
+        "away_team": ["Chelsea", "Arsenal", "Fulham", "Everton", "Liverpool"],
+        "match_date": pd.to_datetime(["2019-01-01", "2020-10-01", "2021-02-10", "2021-02-10", "2023-01-01"])
+    })
+    
+    features = prepare_fixture_features(fixtures, build_form_index(historical_data))
+    
+    pd.testing.assert_frame_equal(features, prepare_fixture_features(fixtures, historical_data))
+
+
+def test_prepare_fixture_features_excludes_results_on_match_date():
+    """Test that a fixture never sees the result of a match on its own date."""
+    historical_data = make_matches(n_matches=60, seed=9)
+    played = historical_data.iloc[[30]]
+    
+    features = prepare_fixture_features(played, historical_data)
+    shifted = prepare_fixture_features(played.assign(match_date=played["match_date"] + pd.Timedelta(days=1)), historical_data)
+    
+    assert not features.equals(shifted)
+    expected = prepare_single_match_features(
+        played["home_team"].iat[0], played["away_team"].iat[0], played["match_date"].iat[0], historical_data
+    )
+    pd.testing.assert_frame_equal(features, expected)
+
+
+def test_predictor_reloads_only_changed_files(tmp_path):
+    """Test that the predictor caches the model and reloads history when the data file changes."""
+    from src.models.model_io import resolve_model_file
+    from src.models.prediction_utils import Predictor
+    
+    if not resolve_model_file().exists():
+        pytest.skip("Model not available for testing")
+    
+    data_file = tmp_path / "matches.csv"
+    make_matches(n_matches=40, seed=10).to_csv(data_file, index=False)
+    predictor = Predictor(resolve_model_file(), data_file)
+    
+    first = predictor.predict("Arsenal", "Chelsea", datetime(2021, 1, 1))
+    model = predictor.model
+    predictor.predict("Wolves", "Fulham", datetime(2021, 1, 1))
+    assert predictor.model is model
+    
+    make_matches(n_matches=80, seed=11).to_csv(data_file, index=False)
+    history = predictor.history
+    assert len(history) == 80
+    assert predictor.model is model
+    
+    batch = predictor.predict_many(pd.DataFrame({
+        "home_team": ["Arsenal"],
+        "away_team": ["Chelsea"],
+        "match_date": [datetime(2021, 1, 1)]
+    }))
+    assert set(batch[0]) == set(first)
+
+
+def test_predictor_switches_to_native_model_written_later(tmp_path, monkeypatch):
+    """Test that a predictor without an explicit model file picks up a native model saved after it started."""
+    from src.config import MODEL_FILE, MODEL_NATIVE_FILE
+    from src.models import prediction_utils
+    
+    if not (MODEL_FILE.exists() and MODEL_NATIVE_FILE.exists()):
+        pytest.skip("Model not available for testing")
+    
+    data_file = tmp_path / "matches.csv"
+    make_matches(n_matches=40, seed=12).to_csv(data_file, index=False)
+    resolved = [MODEL_FILE]
+    monkeypatch.setattr(prediction_utils, "resolve_model_file", lambda: resolved[0])
+    predictor = prediction_utils.Predictor(data_file=data_file)
+    
+    legacy_model = predictor.model
+    assert predictor.model_file == MODEL_FILE
+    
+    resolved[0] = MODEL_NATIVE_FILE
+    predictor.predict("Arsenal", "Chelsea", datetime(2021, 1, 1))
+    assert predictor.model_file == MODEL_NATIVE_FILE
+    assert predictor.model is not legacy_model
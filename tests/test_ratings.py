@@ -0,0 +1,40 @@
+"""Tests for the online Elo rating generator."""
+
+import pandas as pd
+
+from src.data_preprocessing.ratings import RATING_COLUMNS, EloRatings
+from src.models.prediction_utils import prepare_single_match_features
+from tests.test_form_engine import make_matches
+
+
+def test_process_emits_pre_match_ratings():
+    """Test that ratings start equal, move with results and stay zero-sum."""
+    matches = pd.DataFrame({
+        "match_date": pd.to_datetime(["2020-01-01", "2020-01-01", "2020-01-08"]),
+        "home_team": ["Team A", "Team C", "Team A"],
+        "away_team": ["Team B", "Team D", "Team C"],
+        "result": ["H", "D", "A"]
+    })
+    ratings = EloRatings()
+
+    features = ratings.process(matches)
+
+    assert list(features.columns) == RATING_COLUMNS
+    assert (features.loc[:1, "elo_diff"] == 0.0).all()
+    assert features.loc[2, "home_elo"] > ratings.initial_rating
+    assert abs(ratings.ratings[:4].sum() - 4 * ratings.initial_rating) < 1e-9
+
+
+def test_rating_lookup_as_of_past_date():
+    """Test that as-of lookups return the rating recorded before that date."""
+    history = make_matches(n_matches=100, seed=6).sort_values("match_date").reset_index(drop=True)
+    ratings = EloRatings()
+    features = ratings.process(history)
+
+    row = history.iloc[60]
+    assert ratings.rating(row["home_team"], row["match_date"]) == features.loc[60, "home_elo"]
+
+    match_features = prepare_single_match_features(
+        row["home_team"], row["away_team"], row["match_date"], history, ratings=ratings
+    )
+    assert match_features.loc[0, "elo_diff"] == features.loc[60, "elo_diff"]
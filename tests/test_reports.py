@@ -0,0 +1,57 @@
+"""Tests for cached report rendering and the metrics JSON."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.reports import build_reports
+from src.models.train_xgboost import train_xgboost_model
+
+
+@pytest.fixture
+def report_files(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 4)), columns=list("abcd"))
+    y = pd.DataFrame({"target": (X["a"] > 0).astype(int) + (X["b"] > 0.5).astype(int)})
+    files = {
+        "model_file": tmp_path / "model.ubj",
+        "metadata_file": tmp_path / "model.meta.json",
+        "x_file": tmp_path / "X.parquet",
+        "y_file": tmp_path / "y.parquet",
+        "output_dir": tmp_path / "reports",
+        "metrics_file": tmp_path / "reports" / "metrics.json"
+    }
+    X.to_parquet(files["x_file"], index=False)
+    y.to_parquet(files["y_file"], index=False)
+    train_xgboost_model(files["x_file"], files["y_file"], files["model_file"], files["metadata_file"])
+    return files
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_reports_are_skipped_until_model_or_data_change(report_files, n_jobs):
+    """Test that unchanged inputs skip rendering and missing outputs or new data re-render."""
+    assert set(build_reports(n_jobs=n_jobs, **report_files).values()) == {"rendered"}
+    assert set(build_reports(n_jobs=n_jobs, **report_files).values()) == {"skipped"}
+    
+    (report_files["output_dir"] / "feature_importances.png").unlink()
+    assert build_reports(n_jobs=n_jobs, **report_files) == {"evaluation": "skipped", "feature_importance": "rendered"}
+    
+    pd.read_parquet(report_files["y_file"]).head(280).to_parquet(report_files["y_file"], index=False)
+    pd.read_parquet(report_files["x_file"]).head(280).to_parquet(report_files["x_file"], index=False)
+    assert set(build_reports(n_jobs=n_jobs, **report_files).values()) == {"rendered"}
+    assert build_reports(["evaluation"], force=True, n_jobs=n_jobs, **report_files) == {"evaluation": "rendered"}
+
+
+def test_metrics_json_summarizes_every_report(report_files):
+    """Test that the metrics file holds the hashes, intervals, confusion matrix and importances."""
+    build_reports(n_jobs=1, **report_files)
+    metrics = json.loads(report_files["metrics_file"].read_text())
+    
+    evaluation = metrics["reports"]["evaluation"]
+    assert np.sum(evaluation["confusion_matrix"]) == evaluation["n_validation"] == 60
+    assert evaluation["bootstrap"]["accuracy"]["lower"] <= evaluation["accuracy"] <= evaluation["bootstrap"]["accuracy"]["upper"]
+    assert set(metrics["reports"]["feature_importance"]["feature_importances"]) == set("abcd")
+    assert len(metrics["model_hash"]) == len(metrics["data_hash"]) == 64
+    assert (report_files["output_dir"] / "confusion_matrix.png").exists()
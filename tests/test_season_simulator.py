@@ -0,0 +1,52 @@
+"""Tests for the Monte Carlo season simulator."""
+
+import numpy as np
+import pandas as pd
+
+from src.models.season_simulator import simulate_season, summarize_odds
+
+
+def make_season(seed=0):
+    teams = ["Arsenal", "Chelsea", "Everton", "Fulham", "Liverpool", "Wolves"]
+    rng = np.random.default_rng(seed)
+    fixtures = pd.DataFrame(
+        [(home, away) for home in teams for away in teams if home != away],
+        columns=["home_team", "away_team"]
+    )
+    fixtures["round"] = np.arange(len(fixtures)) // 3
+    fixtures["match_date"] = pd.Timestamp("2024-08-01") + pd.to_timedelta(fixtures["round"] * 7, unit="D")
+    probabilities = rng.dirichlet([3, 2, 4], len(fixtures))
+    fixtures["prob_away_win"], fixtures["prob_draw"], fixtures["prob_home_win"] = probabilities.T
+    table = pd.DataFrame({"team": teams, "points": [0, 0, 0, 0, 0, 0]})
+    return table, fixtures
+
+
+def test_position_probabilities_are_distributions():
+    """Test that every team and every position sums to one."""
+    table, fixtures = make_season()
+
+    positions = simulate_season(table, fixtures, n_simulations=5000, form_feedback=True)
+
+    assert np.allclose(positions.sum(axis=1), 1.0)
+    assert np.allclose(positions.sum(axis=0), 1.0)
+
+
+def test_unassailable_lead_wins_title():
+    """Test that a team too far ahead to be caught always finishes first."""
+    table, fixtures = make_season()
+    table.loc[0, "points"] = 100
+
+    odds = summarize_odds(simulate_season(table, fixtures, n_simulations=2000))
+
+    assert odds.loc["Arsenal", "title"] == 1.0
+    assert odds.loc["Arsenal", "relegation"] == 0.0
+
+
+def test_results_do_not_depend_on_worker_count():
+    """Test that the process-pool path reproduces the serial simulation."""
+    table, fixtures = make_season(seed=1)
+
+    serial = simulate_season(table, fixtures, n_simulations=25000, seed=3)
+    parallel = simulate_season(table, fixtures, n_simulations=25000, seed=3, n_jobs=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
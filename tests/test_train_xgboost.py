@@ -0,0 +1,136 @@
+"""Tests for full training and incremental model refresh."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_preprocessing.feature_store import match_keys_path
+from src.models.model_io import load_metadata, load_model
+from src.models.train_xgboost import refresh_policy, train_xgboost_model, update_xgboost_model
+
+
+@pytest.fixture
+def files(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 4)), columns=list("abcd"))
+    y = pd.DataFrame({"target": (X["a"] > 0).astype(int) + (X["b"] > 0.5).astype(int)})
+    keys = pd.DataFrame({"match_key": [f"match-{i:03d}" for i in range(len(X))]})
+    paths = {name: tmp_path / name for name in ("X.parquet", "y.parquet", "model.ubj", "model.meta.json")}
+    
+    def write(n_rows):
+        X.head(n_rows).to_parquet(paths["X.parquet"], index=False)
+        y.head(n_rows).to_parquet(paths["y.parquet"], index=False)
+        keys.head(n_rows).to_parquet(match_keys_path(paths["X.parquet"]), index=False)
+    
+    write(300)
+    train_xgboost_model(*paths.values())
+    return write, list(paths.values())
+
+
+def test_update_continues_boosting_on_new_matches(files):
+    """Test that new matches add trees to the existing booster instead of retraining."""
+    write, paths = files
+    before = load_model(paths[2], paths[3]).get_booster().num_boosted_rounds()
+    
+    write(340)
+    report = update_xgboost_model(10, 1000, 10.0, 0.5, *paths)
+    
+    assert report["mode"] == "update"
+    assert report["n_new"] == 40
+    assert "seconds_saved" in report
+    assert load_model(paths[2], paths[3]).get_booster().num_boosted_rounds() == before + 10
+    
+    metadata = load_metadata(paths[3])
+    assert metadata["n_samples"] == 340
+    assert metadata["last_refresh"]["mode"] == "update"
+    assert update_xgboost_model(10, 1000, 10.0, 0.5, *paths)["mode"] == "unchanged"
+
+
+def test_update_handles_batch_without_draws(files):
+    """Test that a gameweek missing an outcome class still continues boosting."""
+    write, paths = files
+    before = load_model(paths[2], paths[3]).get_booster().num_boosted_rounds()
+    y = pd.read_parquet(paths[1])
+    X = pd.read_parquet(paths[0])
+    new_rows = X.iloc[:20].to_numpy() + 0.01
+    pd.concat([X, pd.DataFrame(new_rows, columns=X.columns)], ignore_index=True).to_parquet(paths[0], index=False)
+    pd.concat([y, pd.DataFrame({"target": [0, 2] * 10})], ignore_index=True).to_parquet(paths[1], index=False)
+    keys = pd.read_parquet(match_keys_path(paths[0]))
+    pd.concat([keys, pd.DataFrame({"match_key": [f"new-{i}" for i in range(20)]})]).to_parquet(match_keys_path(paths[0]), index=False)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        report = update_xgboost_model(10, 1000, 10.0, 0.5, *paths)
+    
+    assert report["mode"] == "update"
+    model = load_model(paths[2], paths[3])
+    assert model.get_booster().num_boosted_rounds() == before + 10
+    assert model.predict_proba(X.head(5)).shape == (5, 3)
+
+
+def test_update_falls_back_to_full_retrain(files):
+    """Test that exceeding the round cap triggers a full retrain."""
+    write, paths = files
+    write(340)
+    
+    report = update_xgboost_model(10, 205, 10.0, 0.5, *paths)
+    
+    assert report["mode"] == "full"
+    assert load_metadata(paths[3])["n_samples"] == 340
+    assert "last_refresh" not in load_metadata(paths[3])
+
+
+def test_update_finds_new_matches_by_key_not_position(files):
+    """Test that late results inserted before trained rows are the ones boosted on."""
+    write, paths = files
+    X, y = pd.read_parquet(paths[0]), pd.read_parquet(paths[1])
+    keys = pd.read_parquet(match_keys_path(paths[0]))
+    late = pd.DataFrame(np.random.default_rng(1).normal(size=(30, 4)), columns=X.columns)
+    pd.concat([late, X], ignore_index=True).to_parquet(paths[0], index=False)
+    pd.concat([pd.DataFrame({"target": [0] * 30}), y], ignore_index=True).to_parquet(paths[1], index=False)
+    pd.concat([pd.DataFrame({"match_key": [f"late-{i}" for i in range(30)]}), keys]).to_parquet(match_keys_path(paths[0]), index=False)
+    before = load_model(paths[2], paths[3]).predict_proba(late)[:, 0]
+    
+    report = update_xgboost_model(10, 1000, 10.0, 0.5, *paths)
+    
+    assert report["mode"] == "update"
+    assert report["n_new"] == 30
+    assert (load_model(paths[2], paths[3]).predict_proba(late)[:, 0] - before).mean() > 0.1
+
+
+def test_update_without_match_keys_retrains(files):
+    """Test that rows that cannot be told apart by key trigger a full retrain."""
+    write, paths = files
+    write(340)
+    match_keys_path(paths[0]).unlink()
+    
+    report = update_xgboost_model(10, 1000, 10.0, 0.5, *paths)
+    
+    assert report["mode"] == "full"
+    assert report["reason"] == "new matches cannot be identified by match key"
+
+
+def test_refresh_policy_rules():
+    """Test each reason the policy rejects continued boosting."""
+    metadata = {"n_samples": 100, "feature_names": ["a"], "validation_mlogloss": 1.0, "full_training_samples": 80}
+    
+    assert refresh_policy(metadata, ["a"], 10, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy({}, ["a"], 10, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["a"], None, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["b"], 10, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["a"], 0, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["a"], 10, 95, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["a"], 30, 50, 1.05, 10, 100, 0.1, 0.25, 5)[0]
+    assert not refresh_policy(metadata, ["a"], 10, 50, 1.2, 10, 100, 0.1, 0.25, 5)[0]
+
+
+def test_drift_is_not_judged_on_small_batches():
+    """Test that log-loss on fewer than the minimum new matches neither forces nor clears a retrain."""
+    metadata = {"n_samples": 100, "feature_names": ["a"], "validation_mlogloss": 1.0, "full_training_samples": 80}
+    
+    use_update, reason = refresh_policy(metadata, ["a"], 10, 50, 3.0, 10, 100, 0.1, 0.25, 20)
+    
+    assert use_update and "too few to check drift" in reason
+    assert not refresh_policy(metadata, ["a"], 20, 50, 3.0, 10, 100, 0.1, 0.25, 20)[0]
@@ -0,0 +1,46 @@
+"""Tests for the NumPy tree-inference engine."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import X_FEATURES_FILE
+from src.models.model_io import load_model, resolve_model_file
+from src.models.tree_engine import TreeEnsemble, export_tree_arrays
+
+
+@pytest.fixture
+def model():
+    if not resolve_model_file().exists():
+        pytest.skip("Model not available for testing")
+    return load_model()
+
+
+def test_numpy_engine_matches_booster(model, tmp_path):
+    """Test that exported arrays reproduce the booster's probabilities, missing values included."""
+    X = pd.read_parquet(X_FEATURES_FILE).head(500)
+    X.iloc[::7, 3] = np.nan
+    X.iloc[::11, 0] = np.nan
+
+    ensemble = TreeEnsemble.load(export_tree_arrays(model.get_booster(), tmp_path / "model.npz"))
+
+    assert np.abs(ensemble.predict_proba(X) - model.predict_proba(X)).max() < 1e-6
+    assert (ensemble.predict(X) == model.predict(X)).all()
+    assert np.allclose(ensemble.predict_proba(X.iloc[[0]]), model.predict_proba(X.iloc[[0]]), atol=1e-6)
+
+
+def test_numpy_engine_does_not_import_xgboost(model, tmp_path):
+    """Test that scoring with the exported arrays never imports xgboost."""
+    path = export_tree_arrays(model.get_booster(), tmp_path / "model.npz")
+    script = (
+        "import sys, numpy as np\n"
+        "from src.models.tree_engine import TreeEnsemble\n"
+        f"ensemble = TreeEnsemble.load(__import__('pathlib').Path({str(path)!r}))\n"
+        "ensemble.predict_proba(np.zeros((2, len(ensemble.feature_names))))\n"
+        "print('xgboost' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
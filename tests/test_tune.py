@@ -0,0 +1,45 @@
+"""Tests for hyperparameter search."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import XGB_PARAMS
+from src.models.tune import load_training_params, save_best_params, tune_hyperparameters
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 4)), columns=list("abcd"))
+    y = pd.Series((X["a"] > 0).astype(int) + (X["b"] > 0.5).astype(int))
+    return X, y
+
+
+def test_successive_halving_narrows_trials(data):
+    """Test that each halving rung keeps the best third of the previous rung."""
+    X, y = data
+    trials = tune_hyperparameters(X, y, "halving", n_trials=9, max_rounds=40, min_rounds=5, n_workers=2)
+    
+    assert trials.groupby("rung").size().to_dict() == {0: 9, 1: 3, 2: 1}
+    assert trials.groupby("rung")["num_rounds"].first().to_dict() == {0: 5, 1: 15, 2: 40}
+    assert trials.iloc[0]["final"]
+    assert (trials["best_iteration"] < trials["num_rounds"]).all()
+
+
+def test_best_params_feed_training(data, tmp_path):
+    """Test that the best trial is written out and merged over the default parameters."""
+    X, y = data
+    trials = tune_hyperparameters(X, y, "random", n_trials=4, max_rounds=30, n_workers=2)
+    path = tmp_path / "best_params.json"
+    
+    params = save_best_params(trials, path)
+    best = trials.iloc[0]
+    
+    assert params["n_estimators"] == best["best_iteration"] + 1
+    assert params["max_depth"] == best["max_depth"]
+    assert json.loads(path.read_text()) == params
+    assert load_training_params(path) == {**XGB_PARAMS, **params}
+    assert load_training_params(tmp_path / "missing.json") == XGB_PARAMS